@@ -0,0 +1,7 @@
+"""
+Offline benchmarks for Smart ATS.
+
+Every remote service is replaced by the fakes in ``smart_ats.fakes``, so
+results depend only on this code and the configured fake latencies. See
+``benchmarks.run`` for usage.
+"""
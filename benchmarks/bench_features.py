@@ -0,0 +1,92 @@
+"""
+End-to-end feature latency through the same pipeline the UI jobs run.
+"""
+from benchmarks.corpus import JOB_DESCRIPTION, LINES_PER_PAGE, make_pdf, resume_lines, resume_pdf
+from benchmarks.stats import summarize, time_call
+from smart_ats.metrics import metrics
+from smart_ats.model_client import GEMINI_MODEL, get_client
+from smart_ats.pdf import extract_text
+from smart_ats.pipeline import run_analysis
+from smart_ats.prompts import feature_prompts
+
+LANGUAGES = ("en", "es")
+
+
+def _errors(results):
+    return sum(1 for result in results.values() if result["error"])
+
+
+def _prompt_tokens():
+    return sum(counter["value"] for counter in metrics.snapshot()["counters"]
+               if counter["name"] == "model_tokens" and counter["labels"].get("kind") == "prompt")
+
+
+def _timed_tokens(*args, **kwargs):
+    before = _prompt_tokens()
+    seconds, _ = time_call(run_analysis, *args, **kwargs)
+    return seconds, _prompt_tokens() - before
+
+
+def _pdf(lines):
+    return make_pdf([lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)])
+
+
+def run_incremental(repeat, lang, features):
+    """
+    Time re-running on a resume with one edited line, with and without the session's previous run.
+
+    Both PDFs are extracted before either sample is timed, so the comparison
+    measures the incremental feature rather than which run paid for
+    extraction. The fake model's latency does not depend on prompt size, so
+    the prompt tokens sent are reported as well.
+    """
+    fresh, incremental = [], []
+    tokens = {"fresh": 0, "incremental": 0}
+    for i in range(repeat):
+        lines = resume_lines(2, seed=100 + i)
+        original = _pdf(lines)
+        # Reword one experience bullet, as a user applying a suggestion would
+        lines[8] += " and cut its costs by 30%"
+        revised = _pdf(lines)
+        jd = f"{JOB_DESCRIPTION}\nPosting incremental-{lang}-{i}"
+        session = f"bench-{lang}-{i}"
+        extract_text(original)
+        extract_text(revised)
+        time_call(run_analysis, original, jd, features, lang, session=session)
+        seconds, sent = _timed_tokens(revised, jd, features, lang, session=session)
+        incremental.append(seconds)
+        tokens["incremental"] += sent
+        seconds, sent = _timed_tokens(revised, f"{jd} (fresh)", features, lang)
+        fresh.append(seconds)
+        tokens["fresh"] += sent
+    return {"fresh": summarize(fresh), "incremental": summarize(incremental),
+            "prompt_tokens": {name: count / repeat for name, count in tokens.items()}}
+
+
+def run(repeat=3, languages=LANGUAGES):
+    """
+    Time each feature and all features together, with cold and warm caches.
+
+    Cold runs use a job description the response cache has not seen; warm
+    runs repeat the previous request. Edited-resume runs compare a fresh
+    analysis of a revised resume with an incremental one.
+    """
+    resume = resume_pdf(2, seed=42)
+    runs = {feature: [feature] for feature in feature_prompts}
+    runs["All Features"] = list(feature_prompts)
+    results = {}
+    for lang in languages:
+        for name, features in runs.items():
+            cold, warm, errors = [], [], 0
+            for i in range(repeat):
+                jd = f"{JOB_DESCRIPTION}\nPosting {lang}-{name}-{i}"
+                seconds, output = time_call(run_analysis, resume, jd, features, lang)
+                cold.append(seconds)
+                errors += _errors(output)
+                seconds, output = time_call(run_analysis, resume, jd, features, lang)
+                warm.append(seconds)
+                errors += _errors(output)
+            results[f"{lang}/{name}"] = {"cold": summarize(cold), "warm": summarize(warm), "errors": errors}
+        results[f"{lang}/edited resume"] = run_incremental(repeat, lang, runs["All Features"])
+    results["model_client"] = get_client(GEMINI_MODEL).stats()
+    return results
@@ -0,0 +1,37 @@
+"""
+PDF extraction over synthetic resumes of varying page counts.
+"""
+from benchmarks.corpus import build_corpus
+from benchmarks.stats import summarize, time_call
+from smart_ats.pdf import PARALLEL_MIN_PAGES, extract_text, guarded_pages, iter_pages, join_pages
+
+PAGE_COUNTS = (1, 2, 5, 20, 50)
+
+
+def run(repeat=3, per_size=3, page_counts=PAGE_COUNTS):
+    """
+    Time cold sequential, cold parallel, cold guarded and cached extraction per page count.
+
+    Guarded extraction stops once it has enough text for the prompts, so
+    on long documents it reads only the first pages.
+    """
+    corpus = build_corpus(page_counts, per_size)
+    results = {}
+    for pages, documents in corpus.items():
+        # Bypass the text cache so every cold sample parses the PDF
+        sequential = [time_call(lambda: join_pages(iter_pages(data, parallel=False)))[0]
+                      for _ in range(repeat) for data in documents]
+        parallel = [time_call(lambda: join_pages(iter_pages(data, parallel=True)))[0]
+                    for _ in range(repeat) for data in documents]
+        guarded = [time_call(guarded_pages, data)[0] for _ in range(repeat) for data in documents]
+        for data in documents:
+            extract_text(data)
+        cached = [time_call(extract_text, data)[0] for _ in range(repeat) for data in documents]
+        results[str(pages)] = {
+            "sequential": summarize(sequential),
+            "parallel": summarize(parallel),
+            "guarded": summarize(guarded),
+            "cached": summarize(cached),
+            "uses_process_pool": pages >= PARALLEL_MIN_PAGES,
+        }
+    return results
@@ -0,0 +1,69 @@
+"""
+Cold-start cost of the UI: imports and the first full render.
+
+Each sample runs in a fresh interpreter, so nothing is already imported
+or cached in memory.
+"""
+import ast
+import json
+import subprocess
+import sys
+
+from benchmarks.bench_ui import MAIN_SCRIPT
+from benchmarks.stats import summarize
+
+# Dependencies that should only load once a feature actually needs them
+HEAVY_MODULES = ("google.generativeai", "googletrans", "httpx", "PyPDF2", "streamlit_lottie", "requests", "numpy")
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+RENDER_PROBE = """
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({script!r}, default_timeout=120)
+app.run()
+print(json.dumps({{"seconds": time.perf_counter() - start, "exceptions": len(app.exception)}}))
+"""
+
+
+def ui_imports():
+    """
+    Return the modules main.py imports at the top level.
+    """
+    with open(MAIN_SCRIPT, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return modules
+
+
+def _probe(code):
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(repeat=3):
+    """
+    Time importing main.py's dependencies and rendering the first page.
+    """
+    modules = ui_imports()
+    imports = [_probe(IMPORT_PROBE.format(modules=modules, heavy=HEAVY_MODULES)) for _ in range(repeat)]
+    renders = [_probe(RENDER_PROBE.format(script=MAIN_SCRIPT)) for _ in range(repeat)]
+    return {
+        "import": summarize([sample["seconds"] for sample in imports]),
+        "heavy_modules_at_import": imports[0]["loaded"],
+        "first_render": summarize([sample["seconds"] for sample in renders]),
+        "render_exceptions": sum(sample["exceptions"] for sample in renders),
+    }
@@ -0,0 +1,28 @@
+"""
+Cost of a full Streamlit script rerun per UI language.
+"""
+import os
+
+from benchmarks.stats import summarize, time_call
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+LANGUAGES = ("en", "es", "fr", "de", "zh-cn", "hi")
+
+
+def run(repeat=5, languages=LANGUAGES):
+    """
+    Time the first render in each language (catalog misses) and warm reruns.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(MAIN_SCRIPT, default_timeout=120)
+    startup, _ = time_call(app.run)
+    results = {"first_run": startup}
+    for lang in languages:
+        language_select = app.sidebar.selectbox[0]
+        first, _ = time_call(language_select.select(lang).run)
+        reruns = [time_call(app.run)[0] for _ in range(repeat)]
+        if app.exception:
+            raise RuntimeError(f"UI raised in {lang}: {app.exception[0].value}")
+        results[lang] = {"first": first, "rerun": summarize(reruns)}
+    return results
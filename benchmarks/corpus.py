@@ -0,0 +1,108 @@
+"""
+Synthetic resume PDFs for the benchmarks.
+
+Resumes are generated from a seed, so the same corpus is rebuilt on every
+run without storing PDFs in the repository.
+"""
+import random
+
+FIRST_NAMES = ["Alex", "Priya", "Chen", "Maria", "Omar", "Lena", "Kwame", "Sofia", "Ravi", "Hannah"]
+LAST_NAMES = ["Smith", "Sharma", "Wang", "Garcia", "Haddad", "Muller", "Mensah", "Rossi", "Iyer", "Cohen"]
+SKILLS = ["Python", "SQL", "Java", "JavaScript", "React", "Node.js", "AWS", "Docker", "Kubernetes",
+          "TensorFlow", "Pandas", "Spark", "Airflow", "Git", "Linux", "C++", "Go", "Tableau", "Excel", "Agile"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Analytics",
+             "Hooli", "Vandelay Imports"]
+TITLES = ["Software Engineer", "Data Analyst", "Data Scientist", "Backend Developer", "DevOps Engineer",
+          "Machine Learning Engineer", "Product Analyst"]
+VERBS = ["Built", "Designed", "Led", "Automated", "Optimised", "Migrated", "Maintained", "Launched"]
+OBJECTS = ["a reporting pipeline", "the billing service", "customer dashboards", "a recommendation model",
+           "CI/CD workflows", "the data warehouse", "internal APIs", "a monitoring stack"]
+
+JOB_DESCRIPTION = """Senior Data Engineer
+
+We are looking for an engineer to build and maintain our data platform.
+
+Requirements:
+- 5+ years of experience with Python and SQL
+- Experience with Spark, Airflow and cloud platforms such as AWS
+- Familiarity with Docker and Kubernetes
+- Strong communication skills and experience working in Agile teams
+"""
+
+LINES_PER_PAGE = 45
+
+
+def resume_lines(pages, seed):
+    """
+    Return the text lines of a synthetic resume filling about `pages` pages.
+    """
+    rng = random.Random(seed)
+    lines = [
+        f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        f"{rng.choice(TITLES)} | example{seed}@example.com | +1 555 {seed % 10000:04d}",
+        "Summary",
+        f"{rng.choice(TITLES)} with {rng.randint(1, 15)} years of experience in "
+        f"{', '.join(rng.sample(SKILLS, 3))}.",
+        "Skills",
+        ", ".join(rng.sample(SKILLS, 8)),
+        "Experience",
+    ]
+    target = pages * LINES_PER_PAGE - 6
+    while len(lines) < target:
+        lines.append(f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)} ({rng.randint(2005, 2023)})")
+        for _ in range(rng.randint(2, 5)):
+            lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)}")
+    lines += ["Education", f"B.Sc. Computer Science, University {seed % 50}", "Certifications",
+              "AWS Certified Developer"]
+    return lines
+
+
+def make_pdf(pages):
+    """
+    Build a minimal PDF with one page per list of text lines.
+    """
+    objects = {
+        1: "<< /Type /Catalog /Pages 2 0 R >>",
+        3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    kids = []
+    for i, lines in enumerate(pages):
+        page_id, content_id = 4 + 2 * i, 5 + 2 * i
+        kids.append(f"{page_id} 0 R")
+        escaped = (line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in lines)
+        ops = "BT /F1 10 Tf 50 760 Td 16 TL " + " ".join(f"({line}) '" for line in escaped) + " ET"
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>")
+        data = ops.encode("latin-1", "replace")
+        objects[content_id] = f"<< /Length {len(data)} >>\nstream\n{ops}\nendstream"
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = len(out)
+        out += f"{number} 0 obj\n{objects[number]}\nendobj\n".encode("latin-1", "replace")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for number in sorted(objects):
+        out += f"{offsets[number]:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def resume_pdf(pages, seed):
+    """
+    Return a synthetic resume PDF with the given number of pages.
+    """
+    lines = resume_lines(pages, seed)
+    return make_pdf([lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)])
+
+
+def build_corpus(page_counts, per_size, seed=0):
+    """
+    Return {page_count: [pdf bytes, ...]} with per_size resumes of each size.
+    """
+    return {
+        pages: [resume_pdf(pages, seed + 1000 * pages + i) for i in range(per_size)]
+        for pages in page_counts
+    }
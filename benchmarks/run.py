@@ -0,0 +1,142 @@
+"""
+Run the offline benchmarks and write the results as JSON.
+
+Gemini, Google Translate and LottieFiles are replaced by the fakes in
+``smart_ats.fakes`` with the latencies and error rates given on the
+command line, and every cache and database points at a temporary
+directory, so runs are repeatable and never touch the network.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --suites pdf features --model-latency 1.5
+    python -m benchmarks.run --compare benchmarks/results/previous.json
+
+Results are written to benchmarks/results/ unless --out is given.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+SUITES = ("startup", "pdf", "ui", "features")
+
+
+def configure_environment(args, work_dir):
+    """
+    Point every service at its fake and every cache at work_dir.
+
+    Must run before smart_ats is imported, since modules read their
+    settings at import time.
+    """
+    os.environ.update({
+        "SMART_ATS_FAKE_MODEL": "1",
+        "SMART_ATS_FAKE_LATENCY": str(args.model_latency),
+        "SMART_ATS_FAKE_ERROR_RATE": str(args.error_rate),
+        "SMART_ATS_FAKE_TRANSLATOR": "1",
+        "SMART_ATS_FAKE_TRANSLATE_LATENCY": str(args.translate_latency),
+        "SMART_ATS_FAKE_TRANSLATE_ERROR_RATE": str(args.error_rate),
+        "SMART_ATS_FAKE_ASSETS": "1",
+        "SMART_ATS_FAKE_ASSET_LATENCY": str(args.asset_latency),
+        "SMART_ATS_FAKE_ASSET_ERROR_RATE": str(args.error_rate),
+        "SMART_ATS_RESPONSE_DB": "",
+        "SMART_ATS_JOB_DB": ":memory:",
+        "SMART_ATS_RESULT_DB": ":memory:",
+        "SMART_ATS_CATALOG_DIR": os.path.join(work_dir, "locales"),
+        "SMART_ATS_ASSET_CACHE_DIR": os.path.join(work_dir, "lottie"),
+        "SMART_ATS_RATE_LIMITS": json.dumps({"gemini-pro": [1000, 1000]}),
+    })
+    if args.responses:
+        os.environ["SMART_ATS_FAKE_RESPONSES"] = args.responses
+    os.environ.pop("SMART_ATS_PDF_CACHE_DIR", None)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten(data, prefix=""):
+    """
+    Flatten nested results into {"suite/case/stat": value} for comparison.
+    """
+    flat = {}
+    for key, value in data.items():
+        path = f"{prefix}/{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def compare(current, baseline, threshold):
+    """
+    Print timings that changed by more than threshold relative to baseline.
+    """
+    before = flatten(baseline["results"])
+    after = flatten(current["results"])
+    for path in sorted(before.keys() & after.keys()):
+        if not path.endswith(("/p50", "/p95", "/mean", "/first", "/first_run")) or before[path] <= 0:
+            continue
+        change = after[path] / before[path] - 1
+        if abs(change) >= threshold:
+            label = "slower" if change > 0 else "faster"
+            print(f"{path}: {before[path]:.4f}s -> {after[path]:.4f}s ({change:+.0%} {label})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline Smart ATS benchmarks.")
+    parser.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES))
+    parser.add_argument("--repeat", type=int, default=3, help="Samples per case")
+    parser.add_argument("--model-latency", type=float, default=0.5, help="Fake Gemini latency in seconds")
+    parser.add_argument("--translate-latency", type=float, default=0.05,
+                        help="Fake Google Translate latency in seconds")
+    parser.add_argument("--asset-latency", type=float, default=0.1, help="Fake LottieFiles latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of fake calls that fail")
+    parser.add_argument("--responses", help="Recorded model responses to replay (see RecordingModel)")
+    parser.add_argument("--out", help="Output JSON file")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative change reported by --compare")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="smart-ats-bench-")
+    configure_environment(args, work_dir)
+    from smart_ats.metrics import metrics
+
+    suites = {}
+    for name in args.suites:
+        module = __import__(f"benchmarks.bench_{name}", fromlist=["run"])
+        print(f"Running {name} benchmarks...", file=sys.stderr)
+        suites[name] = module.run(repeat=args.repeat)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("out", "compare")},
+        "results": suites,
+        "metrics": metrics.snapshot(),
+    }
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{report['commit'] or 'local'}.json"
+    out = args.out or os.path.join(RESULTS_DIR, name)
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {out}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f), args.threshold)
+
+
+if __name__ == "__main__":
+    main()
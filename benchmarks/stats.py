@@ -0,0 +1,30 @@
+"""
+Timing helpers shared by the benchmark suites.
+"""
+import statistics
+import time
+
+from smart_ats.metrics import percentile
+
+
+def summarize(samples):
+    """
+    Return count, mean, p50, p95, min and max of a list of seconds.
+    """
+    return {
+        "n": len(samples),
+        "mean": statistics.fmean(samples),
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "min": min(samples),
+        "max": max(samples),
+    }
+
+
+def time_call(function, *args, **kwargs):
+    """
+    Call function and return (seconds taken, result).
+    """
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
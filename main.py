@@ -1,16 +1,22 @@
+import uuid
+
 import streamlit as st
-import os
-import requests
-import PyPDF2
-import google.generativeai as genai
-from googletrans import Translator
-from streamlit_lottie import st_lottie
 from dotenv import load_dotenv
-import json  # Ensure json is imported
 
 # Load environment variables
 load_dotenv()
 
+# Service modules read their SMART_ATS_* settings at import time
+from smart_ats.assets import load_lottieurl
+from smart_ats.jobs import DONE, FAILED, get_job_queue
+from smart_ats.metrics import METRICS_PORT, serve_metrics
+from smart_ats.pipeline import STAGE_LABELS, STAGES, subheader_for
+from smart_ats.prompts import feature_prompts, prompt_version
+from smart_ats.response_cache import get_response_cache
+from smart_ats.pdf import MAX_BYTES
+from smart_ats.translation import translate
+from smart_ats.translation_catalog import TranslationCatalog
+
 # Set page configuration with a custom theme
 st.set_page_config(
     page_title="Smart ATS",
@@ -19,53 +25,152 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# Configure the Google Gemini model with your API key
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+ALL_FEATURES = "All Features"
+
+# UI strings are served from the on-disk catalog; keep one per process
+@st.cache_resource
+def get_ui_catalog():
+    return TranslationCatalog(translate=translate)
+
+ui_catalog = get_ui_catalog()
+
+# Long analyses run on a worker pool shared by every session
+@st.cache_resource
+def get_shared_job_queue():
+    return get_job_queue()
+
+job_queue = get_shared_job_queue()
 
-# Initialize the translator
-translator = Translator()
+# Expose /metrics for scraping when SMART_ATS_METRICS_PORT is set
+@st.cache_resource
+def start_metrics_server():
+    if METRICS_PORT:
+        return serve_metrics(METRICS_PORT)
 
-def load_lottieurl(url: str):
+start_metrics_server()
+
+# The job posting library is shared by sessions and reloads when the CLI changes it
+@st.cache_resource
+def get_shared_jd_index():
+    from smart_ats.jd_index import get_jd_index
+    return get_jd_index()
+
+# Model responses are cached across sessions; drop rows from edited prompts once
+@st.cache_resource
+def prune_cached_responses():
+    get_response_cache().prune_versions({feature: prompt_version(feature) for feature in feature_prompts})
+
+prune_cached_responses()
+
+def ui_text(text, dest_language):
     """
-    Load a Lottie animation from a URL.
+    Translate a fixed UI string using the cached translation catalog.
     """
-    r = requests.get(url)
-    if r.status_code != 200:
-        return None
-    return r.json()
+    return ui_catalog.get(text, dest_language)
 
-def gemini_response(input_text):
+def render_job(job, dest_language):
     """
-    Generate a response from the Google Gemini model based on the input prompt.
+    Render a job's current stage and whatever results it has so far.
     """
-    model = genai.GenerativeModel("gemini-pro")
-    response = model.generate_content(input_text)
-    return response.text
-
-def input_pdf_text(uploaded_file):
+    if job["status"] == FAILED:
+        st.error(f"{ui_text('Processing failed', dest_language)}: {job['error']}")
+        return
+    features = job["params"]["features"]
+    if job["status"] != DONE:
+        # Completed stages fill the bar; finished features fill the model stage
+        stage = job["stage"] or STAGES[0]
+        completed = STAGES.index(stage)
+        if stage == "model":
+            finished = sum(1 for result in job["results"].values() if not result.get("partial"))
+            completed += finished / len(features)
+        st.progress(completed / len(STAGES), text=ui_text(STAGE_LABELS[stage], dest_language))
+
+    for feature in features:
+        st.subheader(ui_text(subheader_for(feature), dest_language))
+        result = job["results"].get(feature)
+        if result is None:
+            st.info(ui_text("Processing...", dest_language))
+            continue
+        if result["error"]:
+            st.error(result["error"])
+        if result["display"]:
+            st.write(result["display"])
+
+    if job["status"] == DONE:
+        responses = {feature: job["results"][feature]["response"] for feature in features
+                     if job["results"].get(feature, {}).get("response")}
+        if len(features) == 1:
+            # Provide download option for the response
+            st.download_button(
+                label=ui_text("Download Result", dest_language),
+                data="".join(responses.values()).encode('utf-8'),
+                file_name='result.txt',
+                mime='text/plain',
+            )
+        else:
+            # Provide a single download with every completed feature
+            combined_response = "\n\n".join(
+                f"## {subheader_for(feature)}\n\n{response}" for feature, response in responses.items()
+            )
+            st.download_button(
+                label=ui_text("Download All Results", dest_language),
+                data=combined_response.encode('utf-8'),
+                file_name='results.txt',
+                mime='text/plain',
+            )
+
+def render_matches(job, dest_language):
     """
-    Extract text from an uploaded PDF file.
+    Render a posting match job's ranked postings and any finished analyses.
     """
-    reader = PyPDF2.PdfReader(uploaded_file)
-    text = ""
-    for page in reader.pages:
-        extracted_text = page.extract_text()
-        if extracted_text:
-            text += extracted_text + "\n"
-    return text
-
-def translate_text(text, dest_language):
+    if job["status"] == FAILED:
+        st.error(f"{ui_text('Could not read the resume', dest_language)}: {job['error']}")
+        return
+    if job["status"] != DONE:
+        st.info(ui_text(STAGE_LABELS[job["stage"] or STAGES[0]], dest_language))
+    for rank, match in enumerate(job["results"], start=1):
+        keyword_label = ui_text("Keyword match", dest_language)
+        line = f"**{rank}. {match['title']}** — {keyword_label}: {match['keyword_score']:.0f}/100"
+        if match["match_percentage"] is not None:
+            overall_label = ui_text("Overall match", dest_language)
+            line += f" · {overall_label}: {match['match_percentage']:.0f}%"
+        st.markdown(line)
+        if match["error"]:
+            st.error(match["error"])
+        if match["display"]:
+            with st.expander(ui_text("Detailed Match Analysis Report", dest_language)):
+                st.write(match["display"])
+
+def show_lottie(url, height, key):
     """
-    Translate text to the specified language using Google Translate.
+    Render a Lottie animation once its JSON is available.
     """
-    if dest_language == 'en':
-        return text
-    try:
-        translation = translator.translate(text, dest=dest_language)
-        return translation.text
-    except Exception as e:
-        st.error(f"Translation failed: {e}")
-        return text
+    animation = load_lottieurl(url)
+    if animation:
+        # The Lottie component is only imported by pages that show one
+        from streamlit_lottie import st_lottie
+        st_lottie(animation, height=height, key=key)
+
+@st.fragment(run_every=1)
+def poll_job(job_id, dest_language):
+    """
+    Refresh a running job's progress every second until it finishes.
+    """
+    job = job_queue.get(job_id)
+    if job["status"] in (DONE, FAILED):
+        # A full rerun renders the finished job outside the polling fragment
+        st.rerun()
+    render_job(job, dest_language)
+
+@st.fragment(run_every=1)
+def poll_matches(job_id, dest_language):
+    """
+    Refresh a posting match job every second until it finishes.
+    """
+    job = job_queue.get(job_id)
+    if job["status"] in (DONE, FAILED):
+        st.rerun()
+    render_matches(job, dest_language)
 
 # Sidebar with language selection and contact information
 languages = {
@@ -84,6 +189,7 @@ selected_lang_code = st.sidebar.selectbox(
     list(languages.keys()),
     format_func=lambda x: languages[x]
 )
+ui_catalog.preload([selected_lang_code])
 
 st.sidebar.title("Contact Us")
 st.sidebar.info("""
@@ -92,26 +198,29 @@ If you have any questions or feedback, please reach out to us at [ayushjhindal07
 
 # Main Interface with Header Lottie Animation
 lottie_url_header = "https://assets7.lottiefiles.com/packages/lf20_0yfsb3a1.json"  # Replace with your Lottie animation URL
-lottie_header = load_lottieurl(lottie_url_header)
-if lottie_header:
-    st_lottie(lottie_header, height=200, key="header_animation")
-
-st.title(translate_text("Smart ATS", selected_lang_code))
-st.markdown(translate_text("**Optimize Your Resume for Job Applications**", selected_lang_code))
-
-# Tabs for navigation
-tab1, tab2, tab3 = st.tabs([
-    translate_text("Home", selected_lang_code),
-    translate_text("Features", selected_lang_code),
-    translate_text("About", selected_lang_code)
-])
+show_lottie(lottie_url_header, height=200, key="header_animation")
+
+st.title(ui_text("Smart ATS", selected_lang_code))
+st.markdown(ui_text("**Optimize Your Resume for Job Applications**", selected_lang_code))
+
+# Page navigation; unlike tabs, only the selected page runs its translation and animation work
+pages = ["Home", "Features", "About"]
+page = st.radio(
+    "Navigation",
+    pages,
+    # Reopening a job link lands on the page that shows it
+    index=pages.index("Features") if "job" in st.query_params else 0,
+    format_func=lambda name: ui_text(name, selected_lang_code),
+    horizontal=True,
+    label_visibility="collapsed",
+)
 
-with tab1:
-    st.header(translate_text("Welcome to Smart ATS", selected_lang_code))
-    st.write(translate_text("Your one-stop solution for resume optimization.", selected_lang_code))
+if page == "Home":
+    st.header(ui_text("Welcome to Smart ATS", selected_lang_code))
+    st.write(ui_text("Your one-stop solution for resume optimization.", selected_lang_code))
 
     # Expander for additional information
-    with st.expander(translate_text("See how it works", selected_lang_code)):
+    with st.expander(ui_text("See how it works", selected_lang_code)):
         how_it_works_content = f"""
             **Welcome to Smart ATS!**
 
@@ -150,35 +259,33 @@ with tab1:
 
             - **Save Time**: Quickly generate personalized cover letters and receive actionable feedback without spending hours researching.
             """
-        st.markdown(translate_text(how_it_works_content, selected_lang_code))
+        st.markdown(ui_text(how_it_works_content, selected_lang_code))
 
     # Add a Lottie animation in the Home tab
     lottie_url_home = "https://assets2.lottiefiles.com/packages/lf20_jcikwtux.json"  # Replace with your Lottie animation URL
-    lottie_home = load_lottieurl(lottie_url_home)
-    if lottie_home:
-        st_lottie(lottie_home, height=300, key="home_animation")
+    show_lottie(lottie_url_home, height=300, key="home_animation")
 
 
 
-with tab2:
-    st.header(translate_text("Features", selected_lang_code))
+elif page == "Features":
+    st.header(ui_text("Features", selected_lang_code))
 
     # Layout using columns for Job Description and Resume Upload
     col1, col2 = st.columns([2, 1])
 
     with col1:
-        jd_label = translate_text("Paste the Job Description", selected_lang_code)
+        jd_label = ui_text("Paste the Job Description", selected_lang_code)
         jd = st.text_area(jd_label, height=300)
 
     with col2:
-        resume_label = translate_text("Upload Your Resume", selected_lang_code)
+        resume_label = ui_text("Upload Your Resume", selected_lang_code)
         uploaded_file = st.file_uploader(
             resume_label,
             type="pdf",
-            help=translate_text("Please upload your resume in PDF format", selected_lang_code)
+            help=ui_text("Please upload your resume in PDF format", selected_lang_code)
         )
         if uploaded_file is not None:
-            st.success(translate_text("Resume Uploaded Successfully", selected_lang_code))
+            st.success(ui_text("Resume Uploaded Successfully", selected_lang_code))
             # Optionally, display a preview or first page of the resume
             # with open("temp_resume.pdf", "wb") as f:
             #     f.write(uploaded_file.getbuffer())
@@ -195,307 +302,85 @@ with tab2:
         "Craft New Resume"
     ]
 
-    feature_options_translated = [translate_text(option, selected_lang_code) for option in feature_options]
+    feature_options_translated = [ui_text(option, selected_lang_code) for option in feature_options]
+
+    all_features_label = ui_text(ALL_FEATURES, selected_lang_code)
 
     selected_feature = st.selectbox(
-        translate_text("Select a Feature to Perform:", selected_lang_code),
-        feature_options_translated
+        ui_text("Select a Feature to Perform:", selected_lang_code),
+        feature_options_translated + [all_features_label]
     )
 
-    execute_button = st.button(translate_text("Run", selected_lang_code))
+    execute_button = st.button(ui_text("Run", selected_lang_code))
 
     if execute_button:
         if uploaded_file is not None and jd.strip() != "":
-            # Initialize progress bar
-            progress_bar = st.progress(0)
-            progress_bar.progress(10)
-
-            resume_text = input_pdf_text(uploaded_file)
-
-            # Translate resume and job description to English if necessary
-            if selected_lang_code != 'en':
-                with st.spinner(translate_text("Translating documents...", selected_lang_code)):
-                    resume_text_translated = translate_text(resume_text, 'en')
-                    jd_translated = translate_text(jd, 'en')
-            else:
-                resume_text_translated = resume_text
-                jd_translated = jd
-
-            progress_bar.progress(30)
-
-            # Feature 1: Skill Gap Analysis
-            input_prompt1 = f"""
-            You are an expert career consultant specializing in skill gap analysis.
-
-            **Instructions:**
-
-            1. **Extract key skills and qualifications from the job description.**
-            2. **Extract skills and qualifications from the resume.**
-            3. **Compare the two lists, considering synonyms, related terms, and different expressions of the same skills or qualifications.**
-            4. **Identify and list only those skills and qualifications that are truly missing from the resume and are not present in any form.**
-            5. **Identify if any skill and qualifications are related in any other form as well like may be the skill is mentioned in Plural form in resume but singular in Job Description.**
-            6. **Check their project as well how they worked on that and with which skills and stacks and consider those skills as well while comparing it with Job Description.**
-
-            **Important Notes:**
-
-            - **When comparing, consider that the same skill may be described differently.**
-            - **Do not list a skill as missing if it is present in the resume, even if phrased differently.**
-            - **Focus on the meaning and context of the skills, not just the exact wording.**
-            - **Do not add any fake information or experiences.**
-
-            **Example:**
-
-            *Job Description Skills:*
-            - Machine Learning
-            - Data Visualization (e.g., Tableau)
-            - Project Management
-            - LLM
-
-            *Resume Skills:*
-            - Proficient in machine learning algorithms
-            - Experienced with Tableau for data visualization
-            - Managed multiple data science projects
-            - LLMs
-
-            *Missing Skills:*
-            - None
-
-            **Resume:**
-            {resume_text_translated}
-
-            **Job Description:**
-            {jd_translated}
-
-            **Provide the missing skills and qualifications in a bullet-point list, ensuring that any skill listed is genuinely absent from the resume.**
-            """
-
-            # Feature 2: Actionable Recommendations
-            input_prompt2 = f"""
-            You are a professional career advisor.
-
-            **Instructions:**
-
-            - Review the resume and job description thoroughly.
-            - Provide actionable recommendations on how the candidate can improve their resume to better match the job description.
-            - **For each recommendation, specify the section or bullet point in the resume where the change should be made.**
-            - Focus on:
-
-              - Enhancing existing content.
-              - Rephrasing statements to include relevant keywords from the job description.
-              - Highlighting relevant experiences and achievements already present in the resume.
-              - Addressing any weaknesses or gaps by suggesting how to better present existing information.
-
-            - Do not suggest adding any fake experiences or qualifications.
-            - Do not recommend removing any relevant content.
-
-            **Resume:**
-            {resume_text_translated}
-
-            **Job Description:**
-            {jd_translated}
-
-            **Provide your recommendations in a numbered list, clearly indicating where changes should be made.**
-            """
-
-            # Feature 3: Keyword Optimization
-            input_prompt3 = f"""
-            You are an expert in resume optimization for ATS systems.
-
-            **Instructions:**
-
-            1. **Extract important keywords and phrases from the job description, including synonyms and related terms.**
-            2. **Analyze the resume to identify which of these keywords are missing or not prominently featured, considering different expressions of the same concepts.**
-            3. **Suggest where and how the candidate can naturally incorporate the missing or underrepresented keywords into their existing resume content.**
-            4. **For each suggestion, specify the exact section or bullet point in the resume for incorporation.**
-
-            **Important Notes:**
-
-            - **Do not suggest adding any fake experiences or skills.**
-            - **Focus on rephrasing or enhancing current content.**
-            - **Ensure the suggestions are integrated seamlessly and naturally.**
-
-            **Resume:**
-            {resume_text_translated}
-
-            **Job Description:**
-            {jd_translated}
-
-            **Provide your suggestions in detail, indicating the resume sections where keywords can be added or emphasized.**
-            """
-
-            # Feature 4: ATS Compliance Checker
-            input_prompt4 = f"""
-            You are an expert in Applicant Tracking Systems (ATS) compliance.
-
-            **Instructions:**
-
-            - Analyze the resume's formatting and structure to ensure it is ATS-friendly.
-            - Check for:
-
-              - Use of complex layouts, graphics, or images.
-              - Use of tables, columns, headers, footers, or text boxes.
-              - Inappropriate fonts, font sizes, or styles.
-              - Use of special characters or symbols.
-              - Missing or mislabeled section headings.
-              - Incorrect file format (ensure it's in a standard format like .docx or .pdf).
-              - Consistency in formatting throughout the document.
-              - Any embedded objects or links.
-
-            - **For each issue identified, provide a clear recommendation on how to fix it.**
-
-            **Resume:**
-            {resume_text_translated}
-
-            **Provide your analysis and recommendations in a clear, concise manner, organized by issue.**
-            """
-
-            # Feature 5: Cover Letter Generator
-            input_prompt5 = f"""
-            You are a professional cover letter writer.
-
-            **Instructions:**
-
-            - Based solely on the information provided in the resume, write a personalized cover letter tailored to the job description.
-            - **Do not introduce any new skills, experiences, or qualifications not present in the resume.**
-            - Highlight the candidate's relevant skills and experiences that align with the job requirements.
-            - Explain why the candidate is a good fit for the position.
-            - Ensure the tone is professional and engaging.
-
-            **Important Notes:**
-
-            - **Avoid generic statements; make the cover letter specific to the job description and the candidate's background.**
-            - **Do not include any fake or exaggerated information.**
-
-            **Resume:**
-            {resume_text_translated}
-
-            **Job Description:**
-            {jd_translated}
-
-            **Provide the cover letter below.**
-            """
-
-            # Feature 7: Detailed Match Analysis Report
-            input_prompt7 = f"""
-            You are an expert in resume analysis.
-
-            **Instructions:**
-
-            - Analyze the candidate's resume against the job description.
-            - **When comparing, consider synonyms, related terms, and different expressions of the same skills or experiences.**
-            - **Ensure that skills or experiences present in the resume but phrased differently are correctly identified as matches.**
-            - The report should include:
-
-              - **Overall percentage match**, justified by your analysis.
-              - **Scores for the following sections** (out of 100), with brief justifications:
-                - Skills.
-                - Experience.
-                - Education.
-                - Keywords.
-              - **Strengths**: Highlight areas where the candidate strongly aligns with the job requirements.
-              - **Weaknesses**: Identify any genuine gaps or areas lacking in the resume.
-              - **Recommendations for improvement**: Suggest how the candidate can enhance their resume, focusing on rephrasing or emphasizing existing content.
-
-            - Do not include any fake information.
-
-            **Resume:**
-            {resume_text_translated}
-
-            **Job Description:**
-            {jd_translated}
-
-            **Provide the report in a structured format, using headings and bullet points for clarity.**
-            """
-
-            # Feature 8: Craft New Resume (New Feature)
-            input_prompt8 = f"""
-                        You are an expert resume writer.
-
-                        **Instructions:**
-
-                        - Review the candidate's resume and the provided job description.
-                        - **Enhance the resume by incorporating relevant keywords and improving grammatical structure to better align with the job description.**
-                        - **Do not add any new skills, experiences, or qualifications not present in the original resume.**
-                        - **Do not remove any existing content.**
-                        - Ensure that the resume remains truthful and accurately represents the candidate's qualifications.
-                        - **Focus on rephrasing sentences to include important keywords from the job description and improving overall readability**
-
-                        **Resume:**
-                        {resume_text_translated}
-
-                        **Job Description:**
-                        {jd_translated}
-
-                        **Provide the updated resume below with improved keyword integration and grammar.**
-                        """
-
-            # Map the selected feature to the corresponding prompt and subheader
-            feature_prompt_mapping = {
-                "Skill Gap Analysis": (input_prompt1, "Skill Gap Analysis"),
-                "Actionable Recommendations": (input_prompt2, "Actionable Recommendations"),
-                "Keyword Optimization": (input_prompt3, "Keyword Optimization Suggestions"),
-                "ATS Compliance Check": (input_prompt4, "ATS Compliance Report"),
-                "Cover Letter Generator": (input_prompt5, "Generated Cover Letter"),
-                "Detailed Match Analysis": (input_prompt7, "Detailed Match Analysis Report"),
-                "Craft New Resume": (input_prompt8, "Crafted Resume")
-            }
-
             # Get the original feature name based on the selected translated feature
-            try:
-                selected_feature_original = feature_options[feature_options_translated.index(selected_feature)]
-            except ValueError:
-                st.error(translate_text("Selected feature is not recognized.", selected_lang_code))
-                selected_feature_original = None
-
-            if selected_feature_original:
-                prompt, subheader = feature_prompt_mapping.get(selected_feature_original, ("", ""))
-
-                if prompt and subheader:
-                    with st.spinner(translate_text("Processing...", selected_lang_code)):
-                        # Update progress bar
-                        progress_bar.progress(80)
-                        response = gemini_response(prompt)
-                        # Update progress bar
-                        progress_bar.progress(100)
-
-                    # Clear progress bar
-                    progress_bar.empty()
-
-                    # Translate the response back to the selected language if necessary
-                    if selected_lang_code != 'en':
-                        try:
-                            response_translated = translate_text(response, selected_lang_code)
-                        except Exception as e:
-                            st.error(f"Translation failed: {e}")
-                            response_translated = response
-                        subheader_translated = translate_text(subheader, selected_lang_code)
-                        st.subheader(subheader_translated)
-                        st.write(response_translated)
-                    else:
-                        st.subheader(subheader)
-                        st.write(response)
-
-                    # Provide download option for the response
-                    st.download_button(
-                        label=translate_text("Download Result", selected_lang_code),
-                        data=response.encode('utf-8'),
-                        file_name='result.txt',
-                        mime='text/plain',
-                    )
-
-                else:
-                    st.error(translate_text("Selected feature is not supported.", selected_lang_code))
+            if selected_feature == all_features_label:
+                selected_features = feature_options
+            else:
+                try:
+                    selected_features = [feature_options[feature_options_translated.index(selected_feature)]]
+                except ValueError:
+                    selected_features = None
+
+            if uploaded_file.size > MAX_BYTES:
+                # Rejected before it reaches the job queue or a parser
+                too_large = ui_text("The resume is too large. The maximum size is", selected_lang_code)
+                st.error(f"{too_large} {MAX_BYTES / 1e6:.0f} MB.")
+            elif selected_features:
+                # Hand the analysis to the background workers and return immediately
+                # Re-running on a revised resume only re-analyses what changed
+                session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+                job_id = job_queue.submit(uploaded_file.getvalue(), jd, selected_features, selected_lang_code,
+                                          session=session_id, candidate=uploaded_file.name)
+                st.session_state["job_id"] = job_id
+                st.query_params["job"] = job_id
             else:
-                st.error(translate_text("Selected feature is not recognized.", selected_lang_code))
+                st.error(ui_text("Selected feature is not recognized.", selected_lang_code))
+        else:
+            st.warning(ui_text("Please upload both the resume and job description.", selected_lang_code))
+
+    # Show this session's latest job; the query parameter keeps it across reloads
+    job_id = st.session_state.get("job_id") or st.query_params.get("job")
+    job = job_queue.get(job_id) if job_id else None
+    if job is not None:
+        if job["status"] in (DONE, FAILED):
+            render_job(job, selected_lang_code)
         else:
-            st.warning(translate_text("Please upload both the resume and job description.", selected_lang_code))
+            poll_job(job_id, selected_lang_code)
+
+    # Match the resume against the saved job posting library
+    jd_library = get_shared_jd_index()
+    if len(jd_library):
+        with st.expander(ui_text("Find matching job postings", selected_lang_code)):
+            top_n = st.number_input(ui_text("Postings to show", selected_lang_code), 1, 50, 10)
+            analyse_n = st.number_input(ui_text("Postings to analyse in detail", selected_lang_code), 0, 10, 3)
+            if st.button(ui_text("Find Matches", selected_lang_code)):
+                if uploaded_file is None:
+                    st.warning(ui_text("Please upload your resume first.", selected_lang_code))
+                elif uploaded_file.size > MAX_BYTES:
+                    too_large = ui_text("The resume is too large. The maximum size is", selected_lang_code)
+                    st.error(f"{too_large} {MAX_BYTES / 1e6:.0f} MB.")
+                else:
+                    # Detailed analyses run on the background workers, like the Run button's
+                    session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+                    st.session_state["match_job_id"] = job_queue.submit_matches(
+                        uploaded_file.getvalue(), top_n, analyse_n, selected_lang_code, session=session_id)
+            match_job_id = st.session_state.get("match_job_id")
+            match_job = job_queue.get(match_job_id) if match_job_id else None
+            if match_job is not None:
+                if match_job["status"] in (DONE, FAILED):
+                    render_matches(match_job, selected_lang_code)
+                else:
+                    poll_matches(match_job_id, selected_lang_code)
 
-with tab3:
-    st.header(translate_text("About", selected_lang_code))
-    st.write(translate_text("Learn more about Smart ATS and how it can help you.", selected_lang_code))
+elif page == "About":
+    st.header(ui_text("About", selected_lang_code))
+    st.write(ui_text("Learn more about Smart ATS and how it can help you.", selected_lang_code))
 
     # Expander for FAQs
-    with st.expander(translate_text("Frequently Asked Questions", selected_lang_code)):
+    with st.expander(ui_text("Frequently Asked Questions", selected_lang_code)):
         faq_content = f"""
             **Q1: How does the Smart ATS work?**
 
@@ -503,7 +388,7 @@ with tab3:
 
             **Q2: Is my data secure?**
 
-            **A2:** Yes, your data is secure. Smart ATS does not store or share your resume, job description, or any personal information. The documents you upload are used only temporarily for analysis during your session and are not saved on any servers. We prioritize your privacy and ensure that all data processing complies with applicable data protection regulations.
+            **A2:** Smart ATS does not share your resume, job description, or any personal information. Your uploaded resume is kept only until its analysis has finished. The analysis results, together with your resume's file name, are kept on the server so that repeated requests can be answered without running again: results of recent analyses for up to 7 days, and the results archive for up to 30 days, after which they are deleted automatically. You can ask the operator of this service to delete your results at any time. We prioritize your privacy and ensure that all data processing complies with applicable data protection regulations.
 
             **Q3: What file formats are supported for resume upload?**
 
@@ -537,13 +422,11 @@ with tab3:
 
             **A10:** Absolutely! The Cover Letter Generator provides a personalized draft based on your resume and the job description. You can further customize this cover letter to better reflect your unique voice and any additional details you'd like to include.
             """
-        st.markdown(translate_text(faq_content, selected_lang_code))
+        st.markdown(ui_text(faq_content, selected_lang_code))
 
     # Add a Lottie animation in the About tab
     lottie_url_about = "https://assets5.lottiefiles.com/packages/lf20_jtbfg2nb.json"  # Replace with your Lottie animation URL
-    lottie_about = load_lottieurl(lottie_url_about)
-    if lottie_about:
-        st_lottie(lottie_about, height=200, key="about_animation")
+    show_lottie(lottie_url_about, height=200, key="about_animation")
 
 
 
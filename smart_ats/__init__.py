@@ -0,0 +1,3 @@
+"""
+Service modules shared by the Smart ATS Streamlit app.
+"""
@@ -0,0 +1,73 @@
+"""
+Model calls for the Smart ATS features, shared by the UI and headless tools.
+"""
+import re
+import time
+
+from smart_ats.metrics import approx_tokens, metrics
+from smart_ats.model_client import GEMINI_MODEL, get_client
+from smart_ats.prompts import prompt_version
+from smart_ats.response_cache import get_response_cache
+
+MATCH_PATTERN = re.compile(r"overall[^\n%]*?(\d{1,3}(?:\.\d+)?)\s*%", re.IGNORECASE)
+
+
+def gemini_response(input_text):
+    """
+    Generate a response from the Google Gemini model based on the input prompt.
+    """
+    with metrics.span("model", model=GEMINI_MODEL, mode="generate") as span:
+        response = get_client(GEMINI_MODEL).generate(input_text)
+        _record_usage(span, input_text, response)
+    return response
+
+
+def stream_gemini_response(input_text):
+    """
+    Yield the Google Gemini response text chunk by chunk as it is generated.
+    """
+    with metrics.span("model", model=GEMINI_MODEL, mode="stream") as span:
+        start = time.perf_counter()
+        chunks = []
+        for chunk in get_client(GEMINI_MODEL).stream(input_text):
+            if not chunks:
+                span["first_chunk_seconds"] = round(time.perf_counter() - start, 6)
+            chunks.append(chunk)
+            yield chunk
+        _record_usage(span, input_text, "".join(chunks))
+
+
+def _record_usage(span, prompt, response):
+    prompt_tokens, response_tokens = approx_tokens(prompt), approx_tokens(response)
+    span.update(prompt_chars=len(prompt), response_chars=len(response or ""),
+                prompt_tokens=prompt_tokens, response_tokens=response_tokens)
+    metrics.increment("model_tokens", prompt_tokens, model=GEMINI_MODEL, kind="prompt")
+    metrics.increment("model_tokens", response_tokens, model=GEMINI_MODEL, kind="response")
+
+
+def cached_gemini_response(feature, prompt, resume_text, jd_text, furniture=frozenset()):
+    """
+    Return the cached response for a feature run, calling Gemini on a miss.
+    """
+    cache = get_response_cache()
+    version = prompt_version(feature)
+    key = cache.key(feature, resume_text, jd_text, GEMINI_MODEL, version, furniture)
+    return cache.get_or_compute(key, lambda: gemini_response(prompt), feature, version)
+
+
+def cached_gemini_stream(feature, prompt, resume_text, jd_text, furniture=frozenset()):
+    """
+    Stream the response for a feature run, replaying it at once on a cache hit.
+    """
+    cache = get_response_cache()
+    version = prompt_version(feature)
+    key = cache.key(feature, resume_text, jd_text, GEMINI_MODEL, version, furniture)
+    return cache.stream_or_compute(key, lambda: stream_gemini_response(prompt), feature, version)
+
+
+def match_percentage(response):
+    """
+    Parse the overall match percentage from a Detailed Match Analysis report.
+    """
+    match = MATCH_PATTERN.search(response or "")
+    return float(match.group(1)) if match else None
@@ -0,0 +1,247 @@
+"""
+JSON HTTP API for the analysis features.
+
+Every feature is exposed as its own endpoint, so integrations can call the
+same pipeline as the UI without going through Streamlit:
+
+    GET  /health                 server status and in-flight requests
+    GET  /features               available features and their endpoints
+    GET  /metrics                Prometheus metrics
+    POST /features/<slug>        run one feature
+    POST /analyze                run several features (default: all)
+
+POST bodies are JSON with ``job_description`` and either ``resume_text`` or
+``resume_pdf`` (base64-encoded PDF), plus an optional ``lang`` for the
+response language. Requests are served on threads; at most MAX_IN_FLIGHT
+run at once, PDF extraction included, and the rest wait up to
+QUEUE_TIMEOUT seconds before being turned away with 503, so a burst
+cannot pile up unbounded work.
+
+    python -m smart_ats.api --port 8000
+    python -m smart_ats.api --fake-model    # local stub instead of Gemini
+"""
+import argparse
+import base64
+import binascii
+import json
+import logging
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from smart_ats.metrics import metrics
+from smart_ats.pdf import extract_document
+from smart_ats.pipeline import analyse_text
+from smart_ats.prompts import feature_prompts
+
+logger = logging.getLogger(__name__)
+
+MAX_IN_FLIGHT = int(os.getenv("SMART_ATS_API_MAX_IN_FLIGHT", "16"))
+QUEUE_TIMEOUT = float(os.getenv("SMART_ATS_API_QUEUE_TIMEOUT", "5"))
+MAX_BODY_BYTES = int(os.getenv("SMART_ATS_API_MAX_BODY", str(10 * 1024 * 1024)))
+
+
+def feature_slug(feature):
+    """
+    Return the URL path segment for a feature name.
+    """
+    return feature.lower().replace(" ", "-")
+
+
+FEATURES_BY_SLUG = {feature_slug(feature): feature for feature in feature_prompts}
+
+
+class ApiError(Exception):
+    """
+    An error reported to the client with an HTTP status code.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_request(body):
+    """
+    Validate a request body and return (resume, jd, lang, payload).
+
+    resume is the resume text, or the decoded PDF bytes for resume_pdf,
+    which are only extracted once the request has a slot.
+    """
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise ApiError(400, "Request body must be JSON")
+    if not isinstance(payload, dict):
+        raise ApiError(400, "Request body must be a JSON object")
+
+    jd = payload.get("job_description")
+    if not isinstance(jd, str) or not jd.strip():
+        raise ApiError(400, "job_description is required")
+
+    if isinstance(payload.get("resume_text"), str) and payload["resume_text"].strip():
+        resume = payload["resume_text"]
+    elif isinstance(payload.get("resume_pdf"), str):
+        try:
+            resume = base64.b64decode(payload["resume_pdf"], validate=True)
+        except (binascii.Error, ValueError):
+            raise ApiError(400, "resume_pdf must be base64-encoded")
+    else:
+        raise ApiError(400, "resume_text or resume_pdf is required")
+
+    lang = payload.get("lang") or "en"
+    if not isinstance(lang, str):
+        raise ApiError(400, "lang must be a language code")
+    return resume, jd, lang, payload
+
+
+def parse_features(payload):
+    """
+    Return the features requested for /analyze, defaulting to all of them.
+    """
+    features = payload.get("features") or list(feature_prompts)
+    if not isinstance(features, list) or not all(isinstance(feature, str) for feature in features):
+        raise ApiError(400, "features must be a list of feature names")
+    unknown = [feature for feature in features if feature not in feature_prompts]
+    if unknown:
+        raise ApiError(400, f"Unknown features: {', '.join(unknown)}")
+    return features
+
+
+class AnalysisServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server that bounds how many analyses run at once.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, max_in_flight=MAX_IN_FLIGHT, queue_timeout=QUEUE_TIMEOUT):
+        super().__init__(address, AnalysisHandler)
+        self.queue_timeout = queue_timeout
+        self.max_in_flight = max_in_flight
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+
+    def analyse(self, resume, jd, features, lang):
+        """
+        Run the pipeline if a slot frees up in time, else raise a 503.
+
+        resume is text or PDF bytes; see parse_request.
+        """
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            metrics.increment("api_rejected")
+            raise ApiError(503, "Server is busy, retry later")
+        with self._lock:
+            self.in_flight += 1
+        try:
+            furniture = frozenset()
+            if isinstance(resume, bytes):
+                try:
+                    resume, furniture = extract_document(resume)
+                except Exception as e:
+                    raise ApiError(400, f"Could not read resume_pdf: {e}")
+            return analyse_text(resume, jd, features, lang, furniture=furniture)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+
+class AnalysisHandler(BaseHTTPRequestHandler):
+    server_version = "SmartATS"
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status, data, headers=None):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = self.headers.get("Content-Length")
+        if length is None:
+            raise ApiError(411, "Content-Length is required")
+        length = length.strip()
+        # int() would also accept signs, underscores and non-ASCII digits
+        if not (length.isascii() and length.isdigit()):
+            raise ApiError(400, "Content-Length must be a non-negative integer")
+        length = int(length)
+        if length > MAX_BODY_BYTES:
+            raise ApiError(413, f"Request body exceeds {MAX_BODY_BYTES} bytes")
+        return self.rfile.read(length)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "in_flight": self.server.in_flight,
+                                  "max_in_flight": self.server.max_in_flight})
+        elif self.path == "/metrics":
+            body = metrics.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == "/features":
+            self._send_json(200, [{"name": feature, "endpoint": f"/features/{slug}"}
+                                  for slug, feature in FEATURES_BY_SLUG.items()])
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        try:
+            if self.path.startswith("/features/"):
+                feature = FEATURES_BY_SLUG.get(self.path[len("/features/"):])
+                if feature is None:
+                    raise ApiError(404, "Unknown feature")
+                resume, jd, lang, _ = parse_request(self._read_body())
+                result = self.server.analyse(resume, jd, [feature], lang)[feature]
+                status = 200 if result["response"] is not None else 502
+                self._send_json(status, {"feature": feature, **result})
+            elif self.path == "/analyze":
+                resume, jd, lang, payload = parse_request(self._read_body())
+                features = parse_features(payload)
+                self._send_json(200, {"results": self.server.analyse(resume, jd, features, lang)})
+            else:
+                raise ApiError(404, "Not found")
+        except ApiError as e:
+            headers = {"Retry-After": "1"} if e.status == 503 else None
+            self._send_json(e.status, {"error": str(e)}, headers)
+        except Exception as e:
+            logger.exception("Request failed")
+            self._send_json(500, {"error": f"Processing failed: {e}"})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the analysis features over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-in-flight", type=int, default=MAX_IN_FLIGHT,
+                        help="Analyses run at once; further requests wait, then get 503")
+    parser.add_argument("--queue-timeout", type=float, default=QUEUE_TIMEOUT,
+                        help="Seconds a request may wait for a free slot")
+    parser.add_argument("--fake-model", action="store_true",
+                        help="Answer with the local stub model instead of Gemini")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    if args.fake_model:
+        os.environ["SMART_ATS_FAKE_MODEL"] = "1"
+
+    server = AnalysisServer((args.host, args.port), args.max_in_flight, args.queue_timeout)
+    logger.info("Serving on http://%s:%s", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
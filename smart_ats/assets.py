@@ -0,0 +1,191 @@
+"""
+Cached Lottie animation assets.
+
+Animations are served from a process-wide memory cache, backed by a local
+cache directory. Network fetches happen on a background thread with a
+timeout and are revalidated with ETag/Last-Modified headers, so rendering a
+page never waits on them; an animation that is not available yet is simply
+skipped for that render.
+
+Prefetch the app's animations into the cache directory, e.g. while building
+a deployment image, with:
+
+    python -m smart_ats.assets URL [URL ...]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from smart_ats.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.getenv("SMART_ATS_ASSET_CACHE_DIR", os.path.join(ROOT_DIR, ".cache", "lottie"))
+FETCH_TIMEOUT = float(os.getenv("SMART_ATS_ASSET_TIMEOUT", "5"))
+REVALIDATE_SECONDS = float(os.getenv("SMART_ATS_ASSET_REVALIDATE", str(24 * 3600)))
+RETRY_SECONDS = 60.0
+
+# url -> (data, when it was last checked against its URL)
+_memory = {}
+_in_flight = set()
+_failed_at = {}
+_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="assets")
+
+
+def asset_name(url):
+    """
+    Return the file name an asset URL is stored under.
+    """
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:16] + ".json"
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _meta_path(name, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, name + ".meta")
+
+
+def _http_get(url, headers, timeout):
+    if os.getenv("SMART_ATS_FAKE_ASSETS"):
+        from smart_ats.fakes import FakeAssetHost
+        return FakeAssetHost.from_env().get(url, headers=headers, timeout=timeout)
+    import requests
+    return requests.get(url, headers=headers, timeout=timeout)
+
+
+def fetch(url, cache_dir=CACHE_DIR, timeout=FETCH_TIMEOUT):
+    """
+    Download or revalidate an asset into the cache directory.
+
+    Returns the animation data, or None if the fetch failed.
+    """
+    import requests
+    name = asset_name(url)
+    path = os.path.join(cache_dir, name)
+    meta = _read_json(_meta_path(name, cache_dir)) or {}
+    headers = {}
+    if os.path.exists(path):
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    try:
+        response = _http_get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304:
+            data = _read_json(path)
+        elif response.status_code == 200:
+            data = response.json()
+            _write_json(path, data)
+            meta = {"etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified")}
+        else:
+            logger.warning("Fetching %s returned HTTP %s", url, response.status_code)
+            return None
+    except (requests.RequestException, ValueError, OSError) as e:
+        logger.warning("Fetching %s failed: %s", url, e)
+        return None
+    meta["checked_at"] = time.time()
+    try:
+        _write_json(_meta_path(name, cache_dir), meta)
+    except OSError:
+        pass
+    return data
+
+
+def _refresh(url):
+    try:
+        with metrics.span("lottie_fetch") as span:
+            data = fetch(url)
+            span["ok"] = data is not None
+        with _lock:
+            if data is not None:
+                _memory[url] = (data, time.time())
+                _failed_at.pop(url, None)
+            else:
+                _failed_at[url] = time.time()
+    finally:
+        with _lock:
+            _in_flight.discard(url)
+
+
+def _schedule_refresh(url):
+    with _lock:
+        # Back off after a failure instead of retrying on every rerun
+        if url in _in_flight or time.time() - _failed_at.get(url, 0) < RETRY_SECONDS:
+            return
+        _in_flight.add(url)
+    _executor.submit(_refresh, url)
+
+
+def _checked_at(url):
+    meta = _read_json(_meta_path(asset_name(url), CACHE_DIR)) or {}
+    return meta.get("checked_at", 0)
+
+
+def _is_stale(checked_at):
+    return time.time() - checked_at > REVALIDATE_SECONDS
+
+
+def load_lottieurl(url: str):
+    """
+    Load a Lottie animation without blocking on the network.
+
+    Returns None while the asset is still being fetched.
+    """
+    with _lock:
+        entry = _memory.get(url)
+    metrics.cache_result("lottie", entry is not None)
+    if entry is not None:
+        data, checked_at = entry
+        # Long-running servers revalidate in the background, like a fresh start would
+        if _is_stale(checked_at):
+            _schedule_refresh(url)
+        return data
+
+    data = _read_json(os.path.join(CACHE_DIR, asset_name(url)))
+    if data is None:
+        _schedule_refresh(url)
+        return None
+    checked_at = _checked_at(url)
+    if _is_stale(checked_at):
+        _schedule_refresh(url)
+    with _lock:
+        _memory.setdefault(url, (data, checked_at))
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download Lottie animations into the asset cache.")
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--dest", default=CACHE_DIR)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    for url in args.urls:
+        data = fetch(url, cache_dir=args.dest)
+        print(f"{'ok' if data is not None else 'failed'}: {url} -> {os.path.join(args.dest, asset_name(url))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""
+Rank a batch of resumes against one job description without the UI.
+
+Resumes are read from a directory or ZIP of PDFs and extracted in worker
+processes; each one is then scored with the Detailed Match Analysis prompt
+through a bounded pool of model calls. Every finished resume is appended
+to a checkpoint file, so an interrupted run picks up where it stopped.
+With --top-k, resumes are first pre-screened locally and only the best K
+are sent to the model. Every record lists the job description keywords
+the resume matches and misses. Near-duplicate resumes (the same resume resubmitted
+with trivial edits) are detected with MinHash and reuse the score of the
+first copy instead of calling the model again, or are flagged for review.
+Scored resumes are also appended to the result store for later queries
+and exports.
+
+    python -m smart_ats.batch_rank resumes/ job.txt --out ranked.csv --top-k 50
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import zipfile
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+
+from smart_ats.analysis import cached_gemini_response, match_percentage
+from smart_ats.pdf import document_hash, extract_document, input_pdf_text
+from smart_ats import dedup as dedup_index
+from smart_ats import prescreen
+from smart_ats.metrics import metrics
+from smart_ats.model_client import GEMINI_MODEL
+from smart_ats.prompts import build_prompt, prompt_version
+from smart_ats.response_cache import text_hash
+from smart_ats.result_store import get_result_store, posting_label
+
+FEATURE = "Detailed Match Analysis"
+CSV_FIELDS = ["rank", "name", "score", "prescreen_score", "matched_keywords", "missing_keywords", "duplicate_of",
+              "similarity", "review", "sha256", "error"]
+KEYWORD_FIELDS = ("matched_keywords", "missing_keywords")
+DEDUP_MODES = ("reuse", "flag", "off")
+
+
+def iter_resume_sources(path):
+    """
+    Yield (name, source) pairs for every PDF in a directory or ZIP file.
+
+    A source is either a file path or a (zip_path, member) tuple, both of
+    which are cheap to send to a worker process.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for member in sorted(archive.namelist()):
+                if member.lower().endswith(".pdf") and not member.endswith("/"):
+                    yield member, (path, member)
+        return
+    for root, _, files in sorted(os.walk(path)):
+        for filename in sorted(files):
+            if filename.lower().endswith(".pdf"):
+                file_path = os.path.join(root, filename)
+                yield os.path.relpath(file_path, path), file_path
+
+
+def read_source(source):
+    """
+    Return the bytes of a resume source.
+    """
+    if isinstance(source, tuple):
+        zip_path, member = source
+        with zipfile.ZipFile(zip_path) as archive:
+            return archive.read(member)
+    with open(source, "rb") as f:
+        return f.read()
+
+
+def extract_resume(name, source):
+    """
+    Extract one resume in a worker process.
+    """
+    record = {"name": name, "sha256": None, "score": None, "error": None}
+    try:
+        data = read_source(source)
+        record["sha256"] = document_hash(data)
+        # Page-level parallelism would nest pools; each worker handles one file
+        document = extract_document(data, parallel=False)
+        # Headers and footers are found here, where the page boundaries are known
+        record["text"], record["furniture"] = document
+    except Exception as e:
+        record["error"] = f"extraction failed: {e}"
+    return record
+
+
+def score_resume(record, jd_text):
+    """
+    Run the Detailed Match Analysis prompt for an extracted resume.
+    """
+    text, furniture = record.pop("text"), record.pop("furniture")
+    try:
+        prompt = build_prompt(FEATURE, text, jd_text, furniture=furniture)
+        record["response"] = cached_gemini_response(FEATURE, prompt, text, jd_text, furniture)
+        record["score"] = match_percentage(record["response"])
+    except Exception as e:
+        record["error"] = f"model call failed: {e}"
+    return record
+
+
+def read_job_description(path):
+    """
+    Read a job description from a text or PDF file.
+    """
+    if path.lower().endswith(".pdf"):
+        return input_pdf_text(path)
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def load_checkpoint(path):
+    """
+    Return the records already completed by a previous run.
+    """
+    records = {}
+    if not os.path.exists(path):
+        return records
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A run killed mid-write can leave a truncated last line
+                continue
+            records[record["name"]] = record
+    return records
+
+
+def shortlist(records, jd_text, k):
+    """
+    Pre-screen extracted resumes locally and return the k most promising.
+
+    Every record gets a preliminary ``prescreen_score`` out of 100.
+    """
+    if not records:
+        return []
+    scores = prescreen.score_batch([record["text"] for record in records], jd_text).score
+    for record, score in zip(records, scores):
+        record["prescreen_score"] = round(float(score), 1)
+    return [records[i] for i in prescreen.top_k(scores, max(k, 0))]
+
+
+def add_keyword_overlap(record, jd_text):
+    """
+    Record which job description keywords an extracted resume has and lacks.
+    """
+    matched, missing = prescreen.keyword_overlap(record["text"], jd_text)
+    record["matched_keywords"] = matched
+    record["missing_keywords"] = missing
+    return record
+
+
+def copy_result(record, original, mode):
+    """
+    Fill a near-duplicate's record from the resume it duplicates.
+    """
+    if mode == "reuse":
+        for field in ("score", "response", "error"):
+            record[field] = original.get(field)
+    else:
+        record["review"] = True
+    return record
+
+
+def rank(resumes_path, jd_text, checkpoint_path, workers=None, concurrency=4, top_k=None,
+         log=sys.stderr, dedup="reuse", dedup_threshold=dedup_index.THRESHOLD, dedup_path=None):
+    """
+    Score every resume not yet in the checkpoint and return all records.
+
+    With top_k set, only the best top_k resumes by local pre-screening are
+    sent to the model; the rest keep their preliminary score. Unless dedup
+    is "off", a resume within dedup_threshold of one already sent to the
+    model is not sent again: "reuse" copies the earlier result and "flag"
+    marks the record for review. dedup_path keeps signatures across runs.
+    """
+    records = load_checkpoint(checkpoint_path)
+    sources = [(name, source) for name, source in iter_resume_sources(resumes_path) if name not in records]
+    if records:
+        print(f"Resuming: {len(records)} done, {len(sources)} remaining", file=log)
+
+    index = None
+    if dedup != "off":
+        if dedup_path and os.path.exists(dedup_path):
+            index = dedup_index.MinHashIndex.load(dedup_path, dedup_threshold)
+        else:
+            index = dedup_index.MinHashIndex(dedup_threshold)
+    store = get_result_store()
+    jd_hash, posting, versions = text_hash(jd_text), posting_label(jd_text), {FEATURE: prompt_version(FEATURE)}
+    # Near-duplicates waiting for the resume they duplicate to be scored
+    followers = defaultdict(list)
+    in_flight = set()
+
+    start = time.monotonic()
+    completed = 0
+    with ProcessPoolExecutor(max_workers=workers) as extractors, \
+            ThreadPoolExecutor(max_workers=concurrency) as callers, \
+            open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+
+        def finish(record):
+            nonlocal completed
+            record.pop("text", None)
+            record.pop("furniture", None)
+            records[record["name"]] = record
+            checkpoint.write(json.dumps(record) + "\n")
+            checkpoint.flush()
+            if record.get("sha256") and (record.get("response") or record["error"]):
+                response = record.get("response")
+                result = {"response": response, "display": response, "error": record["error"]}
+                store.append(record["sha256"], jd_hash, "en", {FEATURE: result}, record["name"], posting,
+                             GEMINI_MODEL, versions)
+            completed += 1
+            if completed % 10 == 0 or completed == len(sources):
+                print(f"{completed}/{len(sources)} resumes scored", file=log)
+            for follower in followers.pop(record["name"], []):
+                finish(copy_result(follower, record, dedup))
+
+        def submit(record):
+            """
+            Send a resume to the model pool, unless it duplicates an earlier one.
+            """
+            add_keyword_overlap(record, jd_text)
+            if index is not None:
+                duplicate = index.find_or_add(record["text"], record["name"])
+                if duplicate is not None:
+                    original, similarity = duplicate
+                    record["duplicate_of"] = original
+                    record["similarity"] = round(similarity, 3)
+                    metrics.increment("resume_duplicates", mode=dedup)
+                    if original in records:
+                        finish(copy_result(record, records[original], dedup))
+                        return None
+                    if original in in_flight:
+                        followers[original].append(record)
+                        return None
+                    # Signature kept from a run whose results are not in this checkpoint
+            in_flight.add(record["name"])
+            return callers.submit(score_resume, record, jd_text)
+
+        pending = {extractors.submit(extract_resume, name, source) for name, source in sources}
+        scoring = set()
+        try:
+            if top_k is not None:
+                # Pre-screening ranks the whole batch, so wait for every extraction
+                extracted = []
+                for future in as_completed(pending):
+                    record = future.result()
+                    if record["error"] is None:
+                        extracted.append(record)
+                    else:
+                        finish(record)
+                already_scored = sum(1 for record in records.values() if record.get("response"))
+                chosen = shortlist(extracted, jd_text, top_k - already_scored)
+                chosen_names = {record["name"] for record in chosen}
+                print(f"Pre-screened {len(extracted)} resumes; sending {len(chosen)} to the model", file=log)
+                pending = set()
+                for record in extracted:
+                    if record["name"] in chosen_names:
+                        scored = submit(record)
+                        if scored is not None:
+                            scoring.add(scored)
+                            pending.add(scored)
+                    else:
+                        # Screened-out resumes are cheap to redo, so they are not checkpointed
+                        add_keyword_overlap(record, jd_text)
+                        record.pop("text")
+                        record.pop("furniture")
+                        records[record["name"]] = record
+                        completed += 1
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record = future.result()
+                    if future not in scoring and record["error"] is None:
+                        # Extraction finished; hand the text to the model pool
+                        scored = submit(record)
+                        if scored is not None:
+                            scoring.add(scored)
+                            pending.add(scored)
+                        continue
+                    finish(record)
+        except KeyboardInterrupt:
+            for future in pending:
+                future.cancel()
+            print(f"Interrupted after {completed} resumes; rerun to resume", file=log)
+            raise
+        finally:
+            if index is not None and dedup_path:
+                index.save(dedup_path)
+
+    elapsed = time.monotonic() - start
+    if completed:
+        print(f"Processed {completed} resumes in {elapsed:.1f}s "
+              f"({completed / elapsed * 60:.1f} resumes/minute)", file=log)
+    return list(records.values())
+
+
+def ranked(records):
+    """
+    Sort records by model score, then by pre-screen score, best first.
+    """
+    ordered = sorted(records, key=lambda r: (
+        r["score"] is None, -(r["score"] or 0), -(r.get("prescreen_score") or 0), r["name"]
+    ))
+    return [dict(record, rank=position) for position, record in enumerate(ordered, start=1)]
+
+
+def write_results(records, out_path):
+    """
+    Write ranked records as CSV, or as JSONL when the path ends in .jsonl.
+    """
+    with open(out_path, "w", encoding="utf-8", newline="") as f:
+        if out_path.endswith(".jsonl"):
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+            return
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for record in records:
+            keywords = {field: "; ".join(record[field]) for field in KEYWORD_FIELDS if record.get(field)}
+            writer.writerow(dict(record, **keywords))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank resumes against a job description.")
+    parser.add_argument("resumes", help="Directory or ZIP file of PDF resumes")
+    parser.add_argument("job_description", help="Job description as a .txt or .pdf file")
+    parser.add_argument("--out", default="ranked.csv", help="Output file (.csv or .jsonl)")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <out>.checkpoint.jsonl)")
+    parser.add_argument("--workers", type=int, default=None, help="PDF extraction processes")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent model calls")
+    parser.add_argument("--top-k", type=int, default=None,
+                        help="Only send the K best resumes by local pre-screening to the model")
+    parser.add_argument("--dedup", choices=DEDUP_MODES, default="reuse",
+                        help="For near-duplicate resumes, reuse the earlier result, flag them for review, "
+                             "or score them anyway")
+    parser.add_argument("--dedup-threshold", type=float, default=dedup_index.THRESHOLD,
+                        help="Estimated Jaccard similarity that counts as a duplicate")
+    parser.add_argument("--dedup-index", help="File keeping resume signatures across runs (default: <out>.minhash.npz)")
+    args = parser.parse_args()
+
+    jd_text = read_job_description(args.job_description)
+    checkpoint_path = args.checkpoint or f"{args.out}.checkpoint.jsonl"
+    try:
+        records = rank(args.resumes, jd_text, checkpoint_path, args.workers, args.concurrency, args.top_k,
+                       dedup=args.dedup, dedup_threshold=args.dedup_threshold,
+                       dedup_path=args.dedup_index or f"{args.out}.minhash.npz")
+    except KeyboardInterrupt:
+        sys.exit(130)
+    write_results(ranked(records), args.out)
+    print(f"Wrote {len(records)} results to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
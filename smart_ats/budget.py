@@ -0,0 +1,235 @@
+"""
+Token budgets for the resume and job description in each prompt.
+
+Extracted text is cleaned first: page numbers, headers and footers that
+PDF extraction repeats at the top or bottom of every page, and runs of
+whitespace are removed. Headers and footers can only be found while page
+boundaries are known, so ``smart_ats.pdf`` returns their line numbers with
+the extracted text and callers pass them in; other text keeps its repeated
+lines. The ATS Compliance Check judges headers and footers itself, so its
+resume text keeps them.
+If a feature's resume sections still exceed its budget, the lowest-priority
+sections are shortened line by line until they fit. Token counts are
+estimated locally, and the tokens saved are recorded in ``metrics``.
+
+Measure the effect on a folder of resumes with:
+
+    python -m smart_ats.budget resumes/ job.txt
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+from collections import Counter
+
+from smart_ats.metrics import approx_tokens, metrics
+from smart_ats.sections import FEATURE_SECTIONS, get_sections, render_sections
+
+DEFAULT_BUDGET = 3000
+FEATURE_BUDGETS = {
+    "Skill Gap Analysis": 2500,
+    "Actionable Recommendations": 3000,
+    "Keyword Optimization": 3000,
+    "ATS Compliance Check": 4000,
+    "Cover Letter Generator": 2000,
+    "Detailed Match Analysis": 3000,
+    "Craft New Resume": 4000,
+}
+# Budgets can be overridden per feature, e.g. {"Craft New Resume": 6000, "job_description": 2000}
+_overrides = json.loads(os.getenv("SMART_ATS_PROMPT_BUDGETS", "{}"))
+JD_BUDGET = int(_overrides.pop("job_description", 1500))
+FEATURE_BUDGETS.update(_overrides)
+
+# Sections are shortened in this order when a resume is over budget
+TRIM_ORDER = ("other", "education", "projects", "summary", "experience", "skills", "contact")
+# A section cut below this many tokens is dropped rather than left as a stub
+MIN_SECTION_TOKENS = 40
+TRUNCATION_MARK = "[...]"
+
+# Short lines at the edge of this many pages are running headers or footers;
+# documents with fewer pages need the line on every page
+REPEATED_LINE_MIN = 3
+REPEATED_LINE_MAX_CHARS = 60
+# Non-empty lines at the top and at the bottom of a page checked for headers and footers
+PAGE_EDGE_LINES = 2
+# Features whose prompts assess headers, footers and page numbers themselves
+KEEP_PAGE_FURNITURE = ("ATS Compliance Check",)
+PAGE_NUMBER = re.compile(r"^\s*(?:page\s+)?-?\s*\d{1,3}\s*-?(?:\s*(?:/|of)\s*\d{1,3})?\s*$", re.IGNORECASE)
+SPACES = re.compile(r"[ \t\u00a0]+")
+
+
+def _normalize(line):
+    return SPACES.sub(" ", line).strip()
+
+
+def page_furniture(pages):
+    """
+    Return the indices of repeated header and footer lines in the joined page texts.
+
+    Indices count lines of ``pdf.join_pages(pages)``. Only lines near the
+    top or bottom of a page count, and the first copy of each is kept, so
+    a name printed at the top of every page still appears once while a
+    job title repeated in the body is never touched.
+    """
+    edges = []
+    offset = 0
+    for text in pages:
+        if not text:
+            continue
+        lines = (text + "\n").splitlines()
+        filled = [i for i, line in enumerate(lines) if line.strip()]
+        # Headers are only matched against headers and footers against footers
+        page = {offset + i: ("top", _normalize(lines[i])) for i in filled[:PAGE_EDGE_LINES]}
+        page.update({offset + i: ("bottom", _normalize(lines[i])) for i in filled[-PAGE_EDGE_LINES:]})
+        edges.append(page)
+        offset += len(lines)
+    if len(edges) < 2:
+        return frozenset()
+    counts = Counter(edge for page in edges for edge in set(page.values()))
+    needed = min(REPEATED_LINE_MIN, len(edges))
+    repeated = {edge for edge, count in counts.items()
+                if count >= needed and len(edge[1]) <= REPEATED_LINE_MAX_CHARS}
+    seen = set()
+    furniture = set()
+    for page in edges:
+        for index in sorted(page):
+            edge = page[index]
+            if edge in repeated:
+                if edge in seen:
+                    furniture.add(index)
+                seen.add(edge)
+    return frozenset(furniture)
+
+
+def clean_text(text, furniture=frozenset(), keep_pages=False):
+    """
+    Remove page numbers, repeated headers and footers and extra whitespace.
+
+    furniture holds the line numbers of headers and footers to drop, as
+    returned by page_furniture. Pass keep_pages=True to keep them and page
+    numbers.
+    """
+    cleaned = []
+    for index, line in enumerate(text.splitlines()):
+        line = _normalize(line)
+        if not keep_pages and (index in furniture or PAGE_NUMBER.match(line)):
+            continue
+        # Collapse runs of blank lines into one
+        if not line and (not cleaned or not cleaned[-1]):
+            continue
+        cleaned.append(line)
+    return "\n".join(cleaned).strip()
+
+
+def truncate_lines(text, max_tokens):
+    """
+    Keep whole lines of text up to max_tokens, marking where it was cut.
+    """
+    if approx_tokens(text) <= max_tokens:
+        return text
+    budget = max(0, max_tokens * 4 - len(TRUNCATION_MARK) - 1)
+    kept = []
+    used = 0
+    for line in text.splitlines():
+        if used + len(line) + 1 > budget:
+            if not kept:
+                # A single overlong line is cut at a word boundary instead
+                kept.append(line[:budget].rsplit(" ", 1)[0])
+            break
+        kept.append(line)
+        used += len(line) + 1
+    kept.append(TRUNCATION_MARK)
+    return "\n".join(kept)
+
+
+def trim_sections(parts, budget):
+    """
+    Shorten sections in TRIM_ORDER until their total fits the budget.
+    """
+    excess = sum(approx_tokens(text) for text in parts.values()) - budget
+    for name in TRIM_ORDER:
+        if excess <= 0:
+            break
+        if not parts.get(name):
+            continue
+        tokens = approx_tokens(parts[name])
+        keep = tokens - excess
+        parts[name] = truncate_lines(parts[name], keep) if keep >= MIN_SECTION_TOKENS else ""
+        excess -= tokens - approx_tokens(parts[name])
+    return parts
+
+
+def fit_resume(feature, text, budget=None, furniture=frozenset()):
+    """
+    Return the cleaned resume sections a feature needs, within its budget.
+
+    furniture holds the line numbers of the text's repeated headers and
+    footers. Features that read the whole resume, and resumes without
+    recognisable headings, are cleaned and truncated as plain text instead.
+    """
+    budget = budget or FEATURE_BUDGETS.get(feature, DEFAULT_BUDGET)
+    text = clean_text(text, furniture, keep_pages=feature in KEEP_PAGE_FURNITURE)
+    names = FEATURE_SECTIONS.get(feature)
+    if names is None:
+        return truncate_lines(text, budget)
+    sections = get_sections(text)
+    if not sections.found:
+        return truncate_lines(text, budget)
+    parts = trim_sections({name: getattr(sections, name) for name in names}, budget)
+    return render_sections(sections._replace(**parts), names)
+
+
+def fit_job_description(text, budget=JD_BUDGET):
+    """
+    Return the cleaned job description, truncated to its budget.
+    """
+    return truncate_lines(clean_text(text), budget)
+
+
+def record_savings(feature, raw_prompt, prompt):
+    """
+    Count the estimated tokens of a prompt before and after fitting.
+    """
+    raw_tokens, sent_tokens = approx_tokens(raw_prompt), approx_tokens(prompt)
+    metrics.increment("prompt_tokens", raw_tokens, feature=feature, kind="raw")
+    metrics.increment("prompt_tokens", sent_tokens, feature=feature, kind="sent")
+    if sent_tokens < raw_tokens:
+        metrics.increment("prompt_tokens_saved", raw_tokens - sent_tokens, feature=feature)
+    return raw_tokens, sent_tokens
+
+
+def fingerprint(feature):
+    """
+    Return the settings that change a feature's fitted prompt, for versioning.
+    """
+    return (f"{FEATURE_BUDGETS.get(feature, DEFAULT_BUDGET)}:{JD_BUDGET}:{TRIM_ORDER}:{MIN_SECTION_TOKENS}:"
+            f"{REPEATED_LINE_MIN}:{REPEATED_LINE_MAX_CHARS}:{PAGE_EDGE_LINES}:{feature in KEEP_PAGE_FURNITURE}")
+
+
+def main():
+    from smart_ats.batch_rank import extract_resume, iter_resume_sources, read_job_description
+    from smart_ats.prompts import build_prompt, feature_prompts, raw_prompt
+
+    parser = argparse.ArgumentParser(description="Report prompt token savings over a folder of resumes.")
+    parser.add_argument("resumes", help="Directory or ZIP file of PDF resumes")
+    parser.add_argument("job_description", help="Job description as a .txt or .pdf file")
+    args = parser.parse_args()
+
+    jd_text = read_job_description(args.job_description)
+    records = [record for record in (extract_resume(name, source)
+                                     for name, source in iter_resume_sources(args.resumes))
+               if record.get("text")]
+    if not records:
+        parser.error("no readable resumes found")
+    print(f"{'feature':<28} {'median raw':>11} {'median sent':>12} {'saved':>7}")
+    for feature in feature_prompts:
+        raw = [approx_tokens(raw_prompt(feature, record["text"], jd_text)) for record in records]
+        sent = [approx_tokens(build_prompt(feature, record["text"], jd_text, furniture=record["furniture"]))
+                for record in records]
+        raw_median, sent_median = statistics.median(raw), statistics.median(sent)
+        print(f"{feature:<28} {raw_median:>11.0f} {sent_median:>12.0f} {1 - sent_median / raw_median:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
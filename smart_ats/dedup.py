@@ -0,0 +1,198 @@
+"""
+Near-duplicate detection for resumes with MinHash and LSH banding.
+
+Each resume is reduced to its set of word shingles and summarised by a
+MinHash signature whose agreement with another signature estimates their
+Jaccard similarity. Signatures are split into bands; two resumes become
+candidates when any band matches exactly, and candidates are confirmed
+against the similarity threshold.
+
+Signatures and band keys live in preallocated NumPy arrays that grow by
+doubling. Each band also keeps its keys sorted with the rows they came
+from, so a lookup is a binary search per band rather than a scan of every
+stored key; resumes added since the last merge into the sorted keys are
+compared directly. Each resume costs NUM_PERM * 4 + BANDS * 20 bytes
+(832 bytes with the defaults), so millions fit in memory.
+"""
+import re
+import threading
+import zlib
+
+import numpy as np
+
+NUM_PERM = 128
+BANDS = 16
+SHINGLE_SIZE = 5
+# Estimated Jaccard similarity at or above which two resumes count as duplicates
+THRESHOLD = 0.9
+SEED = 1
+# Resumes added since the last merge are scanned; beyond this many they are merged into the sorted keys
+TAIL_SIZE = 4096
+
+# Smallest prime above 2**32, so (a * x + b) of 32-bit values fits in uint64
+_PRIME = np.uint64((1 << 32) + 15)
+_MASK = np.uint64(0xFFFFFFFF)
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    """
+    Return the 32-bit hashes of a text's distinct word shingles.
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    shingles = {" ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+    return np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+                       dtype=np.uint64, count=len(shingles))
+
+
+class MinHashIndex:
+    """
+    Thread-safe LSH index of MinHash signatures with array-backed storage.
+    """
+
+    def __init__(self, threshold=THRESHOLD, num_perm=NUM_PERM, bands=BANDS, capacity=1024, seed=SEED):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        # Odd multipliers that fold each band's rows into one 64-bit key
+        self._band_mix = rng.integers(1, 1 << 63, size=num_perm // bands, dtype=np.uint64) | np.uint64(1)
+        self._signatures = np.empty((capacity, num_perm), dtype=np.uint32)
+        self._band_keys = np.empty((capacity, bands), dtype=np.uint64)
+        # Per band, the keys of the first _sorted_count rows in order, and those rows
+        self._sorted_keys = np.empty((bands, 0), dtype=np.uint64)
+        self._sorted_rows = np.empty((bands, 0), dtype=np.uint32)
+        self._sorted_count = 0
+        self._refs = []
+        self._lock = threading.Lock()
+        # Held across the query and add in find_or_add, so concurrent near-duplicates cannot both be stored
+        self._find_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._refs)
+
+    def signature(self, text):
+        """
+        Return the MinHash signature of a text, or None if it has no words.
+        """
+        hashes = shingle_hashes(text)
+        if hashes.size == 0:
+            return None
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME
+        return (permuted.min(axis=1) & _MASK).astype(np.uint32)
+
+    def _keys(self, signatures):
+        # Works on one signature or a stack of them
+        rows = signatures.reshape(*signatures.shape[:-1], self.bands, -1).astype(np.uint64)
+        with np.errstate(over="ignore"):
+            return (rows * self._band_mix).sum(axis=-1, dtype=np.uint64)
+
+    def query(self, signature):
+        """
+        Return (ref, similarity) for stored signatures at or above the threshold, best first.
+        """
+        if signature is None:
+            return []
+        keys = self._keys(signature)
+        with self._lock:
+            count, merged = len(self._refs), self._sorted_count
+            rows = [merged + np.flatnonzero((self._band_keys[merged:count] == keys).any(axis=1))]
+            for band, key in enumerate(keys):
+                band_keys = self._sorted_keys[band]
+                start, stop = np.searchsorted(band_keys, key, "left"), np.searchsorted(band_keys, key, "right")
+                rows.append(self._sorted_rows[band, start:stop])
+            candidates = np.unique(np.concatenate(rows))
+            similarity = (self._signatures[candidates] == signature).mean(axis=1)
+            refs = [self._refs[i] for i in candidates]
+        matches = [(ref, float(value)) for ref, value in zip(refs, similarity) if value >= self.threshold]
+        return sorted(matches, key=lambda match: match[1], reverse=True)
+
+    def add(self, signature, ref):
+        """
+        Store a signature under a caller-chosen reference, such as a file name.
+        """
+        if signature is None:
+            return
+        keys = self._keys(signature)
+        with self._lock:
+            count = len(self._refs)
+            if count == len(self._signatures):
+                self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+                self._band_keys = np.concatenate([self._band_keys, np.empty_like(self._band_keys)])
+            self._signatures[count] = signature
+            self._band_keys[count] = keys
+            self._refs.append(ref)
+            if count + 1 - self._sorted_count >= TAIL_SIZE:
+                self._merge()
+
+    def _merge(self):
+        """
+        Insert the band keys of rows added since the last merge into the sorted keys.
+        """
+        start, count = self._sorted_count, len(self._refs)
+        tail_keys = self._band_keys[start:count].T
+        tail_rows = np.arange(start, count, dtype=np.uint32)
+        sorted_keys = np.empty((self.bands, count), dtype=np.uint64)
+        sorted_rows = np.empty((self.bands, count), dtype=np.uint32)
+        for band in range(self.bands):
+            order = np.argsort(tail_keys[band], kind="stable")
+            positions = np.searchsorted(self._sorted_keys[band], tail_keys[band][order], "right")
+            sorted_keys[band] = np.insert(self._sorted_keys[band], positions, tail_keys[band][order])
+            sorted_rows[band] = np.insert(self._sorted_rows[band], positions, tail_rows[order])
+        self._sorted_keys, self._sorted_rows, self._sorted_count = sorted_keys, sorted_rows, count
+
+    def find_or_add(self, text, ref):
+        """
+        Return the closest earlier (ref, similarity) for a text, or store it and return None.
+
+        A text never duplicates itself: matches stored under the same ref,
+        as when a resume is submitted again after load(), are ignored, and
+        the text is not stored a second time.
+        """
+        signature = self.signature(text)
+        with self._find_lock:
+            matches = self.query(signature)
+            others = [match for match in matches if match[0] != ref]
+            if others:
+                return others[0]
+            if not matches:
+                self.add(signature, ref)
+        return None
+
+    def save(self, path):
+        """
+        Write the index to a .npz file.
+        """
+        with self._lock:
+            count = len(self._refs)
+            np.savez_compressed(
+                path,
+                signatures=self._signatures[:count],
+                refs=np.array(self._refs, dtype=str),
+                params=np.array([self.num_perm, self.bands, self.seed]),
+                threshold=np.array(self.threshold),
+            )
+
+    @classmethod
+    def load(cls, path, threshold=None):
+        """
+        Read an index written by save().
+        """
+        with np.load(path) as data:
+            num_perm, bands, seed = (int(value) for value in data["params"])
+            signatures = data["signatures"]
+            index = cls(float(data["threshold"]) if threshold is None else threshold,
+                        num_perm, bands, max(1024, len(signatures)), seed)
+            count = len(signatures)
+            index._signatures[:count] = signatures
+            index._band_keys[:count] = index._keys(signatures)
+            index._refs = [str(ref) for ref in data["refs"]]
+            index._merge()
+        return index
@@ -0,0 +1,27 @@
+"""
+Bounded concurrent dispatch of independent model calls.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+MAX_CONCURRENCY = int(os.getenv("SMART_ATS_MAX_CONCURRENCY", "8"))
+
+
+def run_concurrently(tasks, max_workers=MAX_CONCURRENCY):
+    """
+    Run named callables in a bounded thread pool.
+
+    Yields (name, result, error) tuples in completion order, so callers can
+    render each result as soon as it is ready. Exactly one of result and
+    error is set.
+    """
+    if not tasks:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+        futures = {executor.submit(task): name for name, task in tasks.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                yield name, future.result(), None
+            except Exception as e:
+                yield name, None, e
@@ -0,0 +1,208 @@
+"""
+Local stand-ins for remote services, for tests and offline runs.
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+
+
+class FakeResponse:
+    """
+    Minimal object with the ``text`` attribute of a Gemini response.
+    """
+
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """
+    Drop-in replacement for ``genai.GenerativeModel`` with configurable
+    latency and error rate.
+    """
+
+    def __init__(self, model_name="fake", latency=0.0, error_rate=0.0, error=TimeoutError,
+                 responses=None, chunk_size=40, seed=None):
+        self.model_name = model_name
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error = error
+        self.responses = responses or {}
+        self.chunk_size = chunk_size
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    @classmethod
+    def from_env(cls, model_name):
+        """
+        Build a fake model configured from SMART_ATS_FAKE_* variables.
+        """
+        recording = os.getenv("SMART_ATS_FAKE_RESPONSES")
+        return cls(
+            model_name,
+            latency=float(os.getenv("SMART_ATS_FAKE_LATENCY", "0")),
+            error_rate=float(os.getenv("SMART_ATS_FAKE_ERROR_RATE", "0")),
+            responses=load_recording(recording) if recording else None,
+        )
+
+    def reply(self, prompt):
+        """
+        Return the canned reply for a prompt, or a deterministic placeholder.
+        """
+        if prompt in self.responses:
+            return self.responses[prompt]
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+        return f"Overall percentage match: {int(digest, 16) % 101}%\n\nFake analysis {digest}."
+
+    def generate_content(self, prompt, stream=False, request_options=None):
+        self.calls += 1
+        time.sleep(self.latency)
+        if self._random.random() < self.error_rate:
+            raise self.error("fake model error")
+        text = self.reply(prompt)
+        if not stream:
+            return FakeResponse(text)
+        return (FakeResponse(text[i:i + self.chunk_size]) for i in range(0, len(text), self.chunk_size))
+
+
+def load_recording(path):
+    """
+    Return the prompt-to-response mapping saved by RecordingModel.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+class RecordingModel:
+    """
+    Wrap a real model and save every prompt and response to a JSON file,
+    so later runs can replay them with SMART_ATS_FAKE_RESPONSES.
+    """
+
+    def __init__(self, model, path):
+        self.model = model
+        self.path = path
+        self.responses = load_recording(path)
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, stream=False, request_options=None):
+        response = self.model.generate_content(prompt, stream=stream, request_options=request_options)
+        if not stream:
+            self._save(prompt, response.text)
+            return response
+        return self._record_stream(prompt, response)
+
+    def _record_stream(self, prompt, response):
+        chunks = []
+        for chunk in response:
+            chunks.append(chunk.text)
+            yield chunk
+        self._save(prompt, "".join(chunks))
+
+    def _save(self, prompt, text):
+        with self._lock:
+            self.responses[prompt] = text
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.responses, f)
+
+
+class FakeTranslation:
+    """
+    Minimal object with the attributes of a googletrans result.
+    """
+
+    def __init__(self, text, src, dest):
+        self.text = text
+        self.src = src
+        self.dest = dest
+
+
+class FakeTranslator:
+    """
+    Drop-in replacement for ``googletrans.Translator``; translations are
+    deterministic and marked with the destination language.
+    """
+
+    def __init__(self, latency=0.0, error_rate=0.0, error=ConnectionError, seed=None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error = error
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    @classmethod
+    def from_env(cls):
+        """
+        Build a fake translator configured from SMART_ATS_FAKE_TRANSLATE_* variables.
+        """
+        return cls(
+            latency=float(os.getenv("SMART_ATS_FAKE_TRANSLATE_LATENCY", "0")),
+            error_rate=float(os.getenv("SMART_ATS_FAKE_TRANSLATE_ERROR_RATE", "0")),
+        )
+
+    def translate(self, text, dest="en", src="auto"):
+        self.calls += 1
+        time.sleep(self.latency)
+        if self._random.random() < self.error_rate:
+            raise self.error("fake translator error")
+        return FakeTranslation(f"[{dest}] {text}", src, dest)
+
+
+# Smallest animation the Lottie player accepts
+FAKE_ANIMATION = {"v": "5.5.2", "fr": 30, "ip": 0, "op": 60, "w": 200, "h": 200, "layers": []}
+
+
+class FakeHttpResponse:
+    """
+    Minimal object with the parts of ``requests.Response`` used for assets.
+    """
+
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class FakeAssetHost:
+    """
+    Stand-in for the LottieFiles CDN with a ``get`` like ``requests.get``.
+
+    Every URL serves FAKE_ANIMATION with a stable ETag, and conditional
+    requests that send it back get 304 Not Modified.
+    """
+
+    def __init__(self, latency=0.0, error_rate=0.0, error=ConnectionError, seed=None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error = error
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    @classmethod
+    def from_env(cls):
+        """
+        Build a fake asset host configured from SMART_ATS_FAKE_ASSET_* variables.
+        """
+        return cls(
+            latency=float(os.getenv("SMART_ATS_FAKE_ASSET_LATENCY", "0")),
+            error_rate=float(os.getenv("SMART_ATS_FAKE_ASSET_ERROR_RATE", "0")),
+        )
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls += 1
+        time.sleep(self.latency)
+        if self._random.random() < self.error_rate:
+            raise self.error("fake asset host error")
+        etag = '"' + hashlib.sha256(url.encode("utf-8")).hexdigest()[:16] + '"'
+        if (headers or {}).get("If-None-Match") == etag:
+            return FakeHttpResponse(304, headers={"ETag": etag})
+        return FakeHttpResponse(200, FAKE_ANIMATION, {"ETag": etag})
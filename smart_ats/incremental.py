@@ -0,0 +1,229 @@
+"""
+Incremental re-analysis of a revised resume.
+
+A session that uploads an edited version of a resume it has already
+analysed is compared with its previous version section by section, or
+line by line when no section headings are recognised. Features whose
+sections did not change keep their previous report; the others get a
+delta prompt with the previous report and just the changed lines, and the
+model returns the whole revised report. Translated chunks of the previous
+version are kept with it, so only edited chunks are translated again.
+
+Previous versions are held in memory per session. After a restart, or
+when a resume or job description changed too much, the next run is a full
+analysis again.
+"""
+import os
+import threading
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from itertools import groupby
+from typing import NamedTuple
+
+from smart_ats.metrics import approx_tokens, metrics, session_memory
+from smart_ats.prompts import build_delta_prompt, build_prompt
+from smart_ats.sections import ALL_SECTIONS, FEATURE_SECTIONS, TITLES, get_sections
+from smart_ats.translation import cached_chunks, chunk_cache
+
+HISTORY_SIZE = int(os.getenv("SMART_ATS_HISTORY_SIZE", "256"))
+# Above this share of changed resume tokens, a full analysis is cheaper and more reliable
+MAX_CHANGED_FRACTION = float(os.getenv("SMART_ATS_MAX_CHANGED_FRACTION", "0.5"))
+# Delta reports drift from a fresh analysis, so every few runs start over
+MAX_DELTA_RUNS = int(os.getenv("SMART_ATS_MAX_DELTA_RUNS", "3"))
+
+
+class Change(NamedTuple):
+    """
+    One run of changed lines; section is None when the resume has no headings.
+    """
+    section: str
+    removed: tuple
+    added: tuple
+
+
+class Plan(NamedTuple):
+    """
+    How one feature is produced: a reused report, a delta prompt or a full prompt.
+    """
+    prompt: str = None
+    delta: bool = False
+    response: str = None
+    # Delta runs since the feature's last full analysis
+    runs: int = 0
+
+
+class Version(NamedTuple):
+    """
+    A session's last analysed resume and the English reports produced from it.
+    """
+    resume_text: str
+    resume_translated: str
+    jd_translated: str
+    # feature -> (response, delta runs since the last full analysis)
+    responses: dict
+    # Translated chunks of resume_text, keyed like translation.chunk_cache
+    chunks: dict
+
+    @property
+    def size(self):
+        """
+        Approximate bytes held by this version's text.
+        """
+        texts = [self.resume_text, self.resume_translated, self.jd_translated]
+        texts += [response for response, _ in self.responses.values()]
+        texts += list(self.chunks.values())
+        return sum(len(text.encode("utf-8")) for text in texts)
+
+
+def _lines(text):
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def diff_resumes(old_text, new_text):
+    """
+    Return the changed lines between two versions of a resume, grouped by section.
+    """
+    old_sections, new_sections = get_sections(old_text), get_sections(new_text)
+    if old_sections.found and new_sections.found:
+        pairs = [(name, getattr(old_sections, name), getattr(new_sections, name)) for name in ALL_SECTIONS]
+    else:
+        pairs = [(None, old_text, new_text)]
+    changes = []
+    for name, before, after in pairs:
+        if before == after:
+            continue
+        old_lines, new_lines = _lines(before), _lines(after)
+        matcher = SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag != "equal":
+                changes.append(Change(name, tuple(old_lines[i1:i2]), tuple(new_lines[j1:j2])))
+    return changes
+
+
+def changed_fraction(changes, new_text):
+    """
+    Return the share of the new resume's tokens covered by changed lines.
+    """
+    changed = sum(approx_tokens(line) for change in changes for line in change.removed + change.added)
+    return changed / max(1, approx_tokens(new_text))
+
+
+def render_changes(changes):
+    """
+    Render changes as a diff under section titles, for the delta prompt.
+    """
+    blocks = []
+    for section, group in groupby(changes, key=lambda change: change.section):
+        lines = [f"{TITLES[section] if section else 'Resume'}:"]
+        for change in group:
+            lines += [f"- {line}" for line in change.removed]
+            lines += [f"+ {line}" for line in change.added]
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+def relevant_changes(feature, changes):
+    """
+    Return the changes to sections a feature's prompt includes.
+    """
+    names = FEATURE_SECTIONS.get(feature)
+    if names is None:
+        return changes
+    return [change for change in changes if change.section is None or change.section in names]
+
+
+def plan_features(previous, resume_translated, jd_translated, features, furniture=frozenset()):
+    """
+    Decide for each feature whether to reuse, revise or redo its report.
+
+    furniture holds the line numbers of the resume's page headers and footers.
+    """
+    changes = None
+    if previous is not None and previous.jd_translated == jd_translated:
+        changes = diff_resumes(previous.resume_translated, resume_translated)
+        if changed_fraction(changes, resume_translated) > MAX_CHANGED_FRACTION:
+            changes = None
+    plans = {}
+    for feature in features:
+        plans[feature] = _plan_feature(feature, previous, changes, resume_translated, jd_translated, furniture)
+        mode = "delta" if plans[feature].delta else "reused" if plans[feature].response else "full"
+        metrics.increment("incremental_features", feature=feature, mode=mode)
+    return plans
+
+
+def _plan_feature(feature, previous, changes, resume_translated, jd_translated, furniture):
+    earlier = previous.responses.get(feature) if changes is not None else None
+    if earlier is None or earlier[1] >= MAX_DELTA_RUNS:
+        return Plan(build_prompt(feature, resume_translated, jd_translated, furniture=furniture))
+    response, runs = earlier
+    feature_changes = relevant_changes(feature, changes)
+    if not feature_changes:
+        return Plan(response=response, runs=runs)
+    delta_prompt = build_delta_prompt(feature, response, render_changes(feature_changes), jd_translated)
+    full_tokens = approx_tokens(build_prompt(feature, resume_translated, jd_translated, record=False,
+                                             furniture=furniture))
+    if approx_tokens(delta_prompt) >= full_tokens:
+        return Plan(build_prompt(feature, resume_translated, jd_translated, furniture=furniture))
+    metrics.increment("incremental_tokens_saved", full_tokens - approx_tokens(delta_prompt), feature=feature)
+    return Plan(delta_prompt, delta=True, runs=runs + 1)
+
+
+def restore_chunks(previous):
+    """
+    Put the previous version's translated chunks back in the chunk cache.
+    """
+    if previous is not None:
+        for key, translated in previous.chunks.items():
+            chunk_cache.put(key, translated)
+
+
+def next_version(previous, resume_text, resume_translated, jd_translated, plans, results, furniture=frozenset()):
+    """
+    Build the version to remember after a run.
+
+    Reports of features not run this time are carried over only while
+    the resume and job description are unchanged. furniture holds the
+    header and footer lines of resume_text it was translated with.
+    """
+    responses = {}
+    if (previous is not None and previous.resume_translated == resume_translated
+            and previous.jd_translated == jd_translated):
+        responses.update(previous.responses)
+    for feature, plan in plans.items():
+        response = results.get(feature, {}).get("response")
+        if response:
+            responses[feature] = (response, plan.runs)
+    chunks = cached_chunks(resume_text, "en", furniture) if resume_translated != resume_text else {}
+    return Version(resume_text, resume_translated, jd_translated, responses, chunks)
+
+
+class History:
+    """
+    Thread-safe LRU of each session's last analysed version.
+    """
+
+    def __init__(self, max_entries=HISTORY_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session):
+        with self._lock:
+            version = self._entries.get(session)
+            if version is not None:
+                self._entries.move_to_end(session)
+            return version
+
+    def put(self, session, version):
+        with self._lock:
+            self._entries[session] = version
+            self._entries.move_to_end(session)
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+        session_memory.set(session, "history", version.size)
+        for old_session in evicted:
+            session_memory.set(old_session, "history", 0)
+
+
+history = History()
@@ -0,0 +1,365 @@
+"""
+Persistent library of job descriptions with an inverted keyword index.
+
+Postings are stored in SQLite together with their term vectors, and the
+inverted index (term -> postings containing it) is kept in memory, so a
+resume is matched against thousands of postings in milliseconds. Scores
+use the lnc.ltc cosine scheme: posting vectors are log-tf and normalised
+on their own, and IDF is applied to the query side only, so adding or
+removing a posting never requires recomputing the others.
+
+Only the best matches are then sent to the Detailed Match Analysis prompt.
+
+    python -m smart_ats.jd_index add postings/*.txt
+    python -m smart_ats.jd_index remove posting-id
+    python -m smart_ats.jd_index search resume.pdf -n 10 --analyse 3
+"""
+import argparse
+import heapq
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import partial
+from typing import NamedTuple
+
+from smart_ats.metrics import metrics
+from smart_ats.prescreen import TOKENIZER_VERSION, tokenize
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.getenv("SMART_ATS_JD_INDEX_DB", os.path.join(ROOT_DIR, ".cache", "jd_index.sqlite3"))
+FEATURE = "Detailed Match Analysis"
+
+
+class Match(NamedTuple):
+    """
+    One posting retrieved for a resume; scores are in [0, 1].
+    """
+    posting_id: str
+    title: str
+    similarity: float
+    coverage: float
+
+    @property
+    def score(self):
+        """
+        Keyword match score out of 100, on the same scale as pre-screening.
+        """
+        return 50.0 * (self.similarity + self.coverage)
+
+
+def term_vector(text):
+    """
+    Return a text's log-tf term weights and their Euclidean norm.
+    """
+    counts = Counter(tokenize(text))
+    weights = {term: 1.0 + math.log(count) for term, count in counts.items()}
+    return weights, math.sqrt(sum(weight * weight for weight in weights.values()))
+
+
+class JDIndex:
+    """
+    SQLite-backed posting store with an in-memory inverted index.
+    """
+
+    def __init__(self, db_path=DB_PATH):
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        # term -> {posting_id: weight}
+        self._index = defaultdict(dict)
+        # posting_id -> (title, norm, unique term count)
+        self._postings = {}
+        # Library generation the in-memory index was loaded at
+        self._generation = None
+        with self._lock:
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS postings (
+                    id TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    norm REAL NOT NULL,
+                    terms INTEGER NOT NULL,
+                    added_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS posting_terms (
+                    posting_id TEXT NOT NULL,
+                    term TEXT NOT NULL,
+                    weight REAL NOT NULL,
+                    PRIMARY KEY (posting_id, term)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                """
+            )
+            self._db.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', '0')")
+            self._db.commit()
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'tokenizer_version'").fetchone()
+            if row is None or int(row[0]) != TOKENIZER_VERSION:
+                self._reindex()
+            self._refresh()
+
+    def _reindex(self):
+        """
+        Rebuild every posting's term vector from its text with the current tokenizer.
+        """
+        self._db.execute("DELETE FROM posting_terms")
+        for posting_id, text in self._db.execute("SELECT id, text FROM postings").fetchall():
+            weights, norm = term_vector(text)
+            self._db.execute("UPDATE postings SET norm = ?, terms = ? WHERE id = ?", (norm, len(weights), posting_id))
+            self._db.executemany(
+                "INSERT INTO posting_terms (posting_id, term, weight) VALUES (?, ?, ?)",
+                [(posting_id, term, weight) for term, weight in weights.items()],
+            )
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('tokenizer_version', ?)",
+                         (str(TOKENIZER_VERSION),))
+        self._bump()
+        self._db.commit()
+
+    def _load(self):
+        self._postings.clear()
+        self._index.clear()
+        for posting_id, title, norm, terms in self._db.execute("SELECT id, title, norm, terms FROM postings"):
+            self._postings[posting_id] = (title, norm, terms)
+        for posting_id, term, weight in self._db.execute("SELECT posting_id, term, weight FROM posting_terms"):
+            self._index[term][posting_id] = weight
+
+    def _refresh(self):
+        """
+        Reload the in-memory index if another process has changed the library.
+
+        Every add and remove bumps the stored generation, so a running app
+        picks up postings added with the CLI on its next lookup.
+        """
+        generation = int(self._db.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0])
+        if generation != self._generation:
+            self._load()
+            self._generation = generation
+            metrics.increment("jd_index_reloads")
+
+    def _bump(self):
+        # Incrementing in SQL takes the write lock, so concurrent writers never share a generation
+        self._db.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'generation'")
+        generation = int(self._db.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0])
+        # Another writer got in since the last refresh, so reload on the next lookup
+        loaded = self._generation is not None and generation == self._generation + 1
+        self._generation = generation if loaded else None
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._postings)
+
+    def __contains__(self, posting_id):
+        with self._lock:
+            self._refresh()
+            return posting_id in self._postings
+
+    def add(self, posting_id, text, title=None):
+        """
+        Add a posting, replacing any existing posting with the same ID.
+        """
+        weights, norm = term_vector(text)
+        title = title or next((line.strip() for line in text.splitlines() if line.strip()), posting_id)
+        with self._lock:
+            self._refresh()
+            self._remove(posting_id)
+            self._db.execute(
+                "INSERT INTO postings (id, title, text, norm, terms, added_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (posting_id, title, text, norm, len(weights), time.time()),
+            )
+            self._db.executemany(
+                "INSERT INTO posting_terms (posting_id, term, weight) VALUES (?, ?, ?)",
+                [(posting_id, term, weight) for term, weight in weights.items()],
+            )
+            self._bump()
+            self._db.commit()
+            for term, weight in weights.items():
+                self._index[term][posting_id] = weight
+            self._postings[posting_id] = (title, norm, len(weights))
+
+    def remove(self, posting_id):
+        """
+        Remove a posting; returns whether it existed.
+        """
+        with self._lock:
+            self._refresh()
+            removed = self._remove(posting_id)
+            if removed:
+                self._bump()
+            self._db.commit()
+        return removed
+
+    def _remove(self, posting_id):
+        if posting_id not in self._postings:
+            return False
+        terms = [term for (term,) in self._db.execute(
+            "SELECT term FROM posting_terms WHERE posting_id = ?", (posting_id,))]
+        for term in terms:
+            postings = self._index.get(term)
+            if postings is not None:
+                postings.pop(posting_id, None)
+                if not postings:
+                    del self._index[term]
+        self._db.execute("DELETE FROM posting_terms WHERE posting_id = ?", (posting_id,))
+        self._db.execute("DELETE FROM postings WHERE id = ?", (posting_id,))
+        del self._postings[posting_id]
+        return True
+
+    def get(self, posting_id):
+        """
+        Return a stored posting as a dict, or None.
+        """
+        with self._lock:
+            row = self._db.execute("SELECT title, text, added_at FROM postings WHERE id = ?",
+                                   (posting_id,)).fetchone()
+        if row is None:
+            return None
+        return {"id": posting_id, "title": row[0], "text": row[1], "added_at": row[2]}
+
+    def search(self, resume_text, n=10):
+        """
+        Return the n postings that best match a resume, best first.
+        """
+        with metrics.span("jd_search") as span:
+            query = Counter(tokenize(resume_text))
+            with self._lock:
+                self._refresh()
+                total = len(self._postings)
+                dot = defaultdict(float)
+                matched = defaultdict(int)
+                query_norm = 0.0
+                for term, count in query.items():
+                    postings = self._index.get(term)
+                    if not postings:
+                        continue
+                    idf = math.log((1.0 + total) / (1.0 + len(postings))) + 1.0
+                    weight = (1.0 + math.log(count)) * idf
+                    query_norm += weight * weight
+                    for posting_id, posting_weight in postings.items():
+                        dot[posting_id] += weight * posting_weight
+                        matched[posting_id] += 1
+                info = {posting_id: self._postings[posting_id] for posting_id in dot}
+            query_norm = math.sqrt(query_norm)
+            matches = []
+            for posting_id, value in dot.items():
+                title, norm, terms = info[posting_id]
+                similarity = value / (norm * query_norm) if norm and query_norm else 0.0
+                matches.append(Match(posting_id, title, similarity, matched[posting_id] / terms if terms else 0.0))
+            span.update(postings=total, candidates=len(matches))
+            return heapq.nlargest(n, matches, key=lambda match: match.score)
+
+
+def match_postings(index, resume_text, n=10, analyse=3, dest_language="en", report=None, furniture=frozenset()):
+    """
+    Retrieve the top n postings, then run Detailed Match Analysis on the best few.
+
+    Returns a list of dicts with the keyword match and, for analysed
+    postings, the model's response and match percentage. report(stage,
+    results) is called with the keyword matches and after each analysis.
+    furniture holds the line numbers of the resume's page headers and footers.
+    """
+    from smart_ats.analysis import match_percentage
+    from smart_ats.dispatch import run_concurrently
+    from smart_ats.pipeline import analyse_text
+
+    report = report or (lambda stage, results: None)
+    matches = index.search(resume_text, n)
+    results = [{"id": match.posting_id, "title": match.title, "keyword_score": match.score,
+                "response": None, "display": None, "match_percentage": None, "error": None}
+               for match in matches]
+    report("model", results)
+    tasks = {}
+    for result in results[:analyse]:
+        posting = index.get(result["id"])
+        if posting is not None:
+            tasks[result["id"]] = partial(analyse_text, resume_text, posting["text"], [FEATURE], dest_language,
+                                          furniture=furniture)
+    by_id = {result["id"]: result for result in results}
+    for posting_id, output, error in run_concurrently(tasks):
+        result = by_id[posting_id]
+        if error is not None:
+            result["error"] = f"Processing failed: {error}"
+        else:
+            entry = output[FEATURE]
+            result.update(response=entry["response"], display=entry["display"], error=entry["error"],
+                          match_percentage=match_percentage(entry["response"]))
+        report("model", results)
+    return results
+
+
+def run_matches(resume_bytes, n, analyse, dest_language, report=None, session=None):
+    """
+    Match a resume PDF against the posting library; see match_postings.
+
+    Runs as a background job, so it takes the same report callback as
+    ``pipeline.run_analysis``.
+    """
+    from smart_ats.pdf import extract_document
+    from smart_ats.pipeline import translate_resume
+
+    report = report or (lambda stage, results: None)
+    report("extract", [])
+    resume_text, furniture = extract_document(resume_bytes, session=session)
+    if dest_language != "en":
+        # The library is indexed in English, so search with the English resume
+        report("translate", [])
+        resume_text, furniture, _ = translate_resume(resume_text, furniture)
+    return match_postings(get_jd_index(), resume_text, n, analyse, dest_language, report, furniture)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_jd_index():
+    """
+    Return the process-wide job description index.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = JDIndex()
+        return _index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage and search the job description library.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="Add or replace postings from .txt or .pdf files")
+    add.add_argument("files", nargs="+")
+    remove = commands.add_parser("remove", help="Remove postings by ID")
+    remove.add_argument("ids", nargs="+")
+    search = commands.add_parser("search", help="Find the best postings for a resume")
+    search.add_argument("resume", help="Resume as a .pdf or .txt file")
+    search.add_argument("-n", type=int, default=10, help="Postings to retrieve")
+    search.add_argument("--analyse", type=int, default=0, help="Run Detailed Match Analysis on the best N")
+    args = parser.parse_args()
+
+    from smart_ats.batch_rank import read_job_description
+    index = get_jd_index()
+    if args.command == "add":
+        for path in args.files:
+            posting_id = os.path.splitext(os.path.basename(path))[0]
+            index.add(posting_id, read_job_description(path))
+        print(f"{len(index)} postings indexed")
+    elif args.command == "remove":
+        for posting_id in args.ids:
+            print(f"{'removed' if index.remove(posting_id) else 'not found'}: {posting_id}")
+    else:
+        resume_text = read_job_description(args.resume)
+        for rank, result in enumerate(match_postings(index, resume_text, args.n, args.analyse), start=1):
+            model = f"{result['match_percentage']:.0f}%" if result["match_percentage"] is not None else "-"
+            print(f"{rank:>3}. {result['keyword_score']:5.1f}  {model:>5}  {result['id']}  {result['title']}")
+            if result["error"]:
+                print(f"     {result['error']}")
+
+
+if __name__ == "__main__":
+    main()
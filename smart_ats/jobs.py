@@ -0,0 +1,247 @@
+"""
+Background analysis jobs backed by SQLite.
+
+The UI submits a job and returns immediately; a bounded worker pool shared
+by every session runs the pipeline and records the current stage and any
+partial results. Jobs are stored on disk, so finished results survive page
+reloads, and jobs interrupted by a restart are picked up again. Finished
+results are also appended to the result store; a job whose inputs already
+have complete stored results finishes at once without running. Matching
+a resume against the job posting library runs as a job of its own kind.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from smart_ats.metrics import metrics
+from smart_ats.model_client import GEMINI_MODEL
+from smart_ats.pdf import document_hash
+from smart_ats.pipeline import STAGES, run_analysis
+from smart_ats.prompts import prompt_version
+from smart_ats.response_cache import text_hash
+from smart_ats.result_store import get_result_store, posting_label
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.getenv("SMART_ATS_JOB_DB", os.path.join(ROOT_DIR, ".cache", "jobs.sqlite3"))
+MAX_WORKERS = int(os.getenv("SMART_ATS_JOB_WORKERS", "4"))
+JOB_TTL_SECONDS = float(os.getenv("SMART_ATS_JOB_TTL", str(7 * 24 * 3600)))
+# Minimum seconds between progress writes for the same job
+WRITE_INTERVAL = 0.5
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+ANALYSIS, MATCHES = "analysis", "matches"
+
+
+def run_matches(*args, **kwargs):
+    # The posting library pulls in NumPy, so it is only imported by match jobs
+    from smart_ats.jd_index import run_matches
+    return run_matches(*args, **kwargs)
+
+
+class JobQueue:
+    """
+    SQLite-backed job table drained by a thread pool.
+    """
+
+    def __init__(self, db_path=DB_PATH, max_workers=MAX_WORKERS, runner=run_analysis, store=None,
+                 match_runner=run_matches):
+        self.runner = runner
+        self.match_runner = match_runner
+        self.store = store
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="jobs")
+        with self._lock:
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    stage TEXT,
+                    params TEXT NOT NULL,
+                    resume BLOB,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            self._db.execute("DELETE FROM jobs WHERE updated_at < ?", (time.time() - JOB_TTL_SECONDS,))
+            self._db.commit()
+        self._recover()
+
+    def submit(self, resume_bytes, jd, features, dest_language, session=None, candidate=None):
+        """
+        Queue an analysis and return its job ID.
+
+        Jobs from the same session are analysed incrementally against the
+        session's previous resume. If the store already holds results for
+        the same resume, job description, features and language from the
+        current prompts, the job is recorded as done with those results.
+        """
+        job_id = uuid.uuid4().hex
+        params = {"jd": jd, "features": list(features), "lang": dest_language, "session": session,
+                  "candidate": candidate, "resume_hash": document_hash(resume_bytes), "jd_hash": text_hash(jd)}
+        stored = None
+        if self.store is not None:
+            versions = {feature: prompt_version(feature) for feature in features}
+            stored = self.store.latest(params["resume_hash"], params["jd_hash"], features, dest_language,
+                                       versions, GEMINI_MODEL)
+        now = time.time()
+        with self._lock:
+            if stored is None:
+                self._db.execute(
+                    "INSERT INTO jobs (id, status, params, resume, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, QUEUED, json.dumps(params), resume_bytes, now, now),
+                )
+            else:
+                self._db.execute(
+                    "INSERT INTO jobs (id, status, stage, params, result, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, DONE, STAGES[-1], json.dumps(params), json.dumps(stored), now, now),
+                )
+            self._db.commit()
+        if stored is None:
+            self._executor.submit(self._run, job_id)
+        else:
+            metrics.increment("jobs_from_store")
+        return job_id
+
+    def submit_matches(self, resume_bytes, n, analyse, dest_language, session=None):
+        """
+        Queue a search of the job posting library for a resume and return its job ID.
+
+        The job's results are the list of matches from
+        ``jd_index.match_postings``, growing as analyses finish.
+        """
+        job_id = uuid.uuid4().hex
+        params = {"kind": MATCHES, "n": n, "analyse": analyse, "lang": dest_language, "session": session}
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, status, params, resume, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(params), resume_bytes, now, now),
+            )
+            self._db.commit()
+        self._executor.submit(self._run, job_id)
+        return job_id
+
+    def get(self, job_id):
+        """
+        Return a job's status, stage, parameters and results, or None.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, stage, params, result, error, created_at, updated_at FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        status, stage, params, result, error, created_at, updated_at = row
+        params = json.loads(params)
+        if result:
+            results = json.loads(result)
+        else:
+            # Match jobs report a list of postings; analyses map features to results
+            results = [] if params.get("kind") == MATCHES else {}
+        return {
+            "id": job_id,
+            "status": status,
+            "stage": stage,
+            "params": params,
+            "results": results,
+            "error": error,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+    def pending_count(self):
+        """
+        Return how many jobs are queued or running.
+        """
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+            ).fetchone()[0]
+
+    def _update(self, job_id, **fields):
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._db.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+            self._db.commit()
+
+    def _recover(self):
+        """
+        Requeue jobs that were queued or running when the process stopped.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+            ).fetchall()
+        for (job_id,) in rows:
+            self._executor.submit(self._run, job_id)
+
+    def _run(self, job_id):
+        with self._lock:
+            row = self._db.execute("SELECT params, resume, created_at FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return
+        params = json.loads(row[0])
+        metrics.observe("job_queue_wait", time.time() - row[2])
+        self._update(job_id, status=RUNNING)
+        last_stage = None
+        last_write = 0.0
+
+        def report(stage, results):
+            nonlocal last_stage, last_write
+            # Stage changes are always written; partial results are throttled
+            now = time.monotonic()
+            if stage == last_stage and now - last_write < WRITE_INTERVAL:
+                return
+            last_stage, last_write = stage, now
+            self._update(job_id, stage=stage, result=json.dumps(results))
+
+        kind = params.get("kind", ANALYSIS)
+        try:
+            if kind == MATCHES:
+                with metrics.span("job", kind=kind, lang=params["lang"]):
+                    results = self.match_runner(row[1], params["n"], params["analyse"], params["lang"], report,
+                                                session=params.get("session"))
+            else:
+                with metrics.span("job", features=len(params["features"]), lang=params["lang"]):
+                    results = self.runner(row[1], params["jd"], params["features"], params["lang"], report,
+                                          session=params.get("session"))
+        except Exception as e:
+            self._update(job_id, status=FAILED, error=str(e), resume=None)
+            return
+        # The uploaded resume is only kept until the job has finished
+        self._update(job_id, status=DONE, result=json.dumps(results), resume=None)
+        if self.store is not None and kind == ANALYSIS:
+            # Jobs queued before hashes were recorded are hashed here
+            resume_hash = params.get("resume_hash") or document_hash(row[1])
+            versions = {feature: prompt_version(feature) for feature in params["features"]}
+            self.store.append(resume_hash, params.get("jd_hash") or text_hash(params["jd"]), params["lang"], results,
+                              params.get("candidate"), posting_label(params["jd"]), GEMINI_MODEL, versions)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """
+    Return the process-wide job queue.
+    """
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue(store=get_result_store())
+        return _queue
@@ -0,0 +1,349 @@
+"""
+Process-wide timing spans and counters.
+
+Code under measurement wraps work in ``metrics.span(name, **labels)``,
+bumps counters with ``metrics.increment`` and sets gauges with
+``metrics.set_gauge``. Span durations feed histograms
+that are rendered in the Prometheus text format by ``prometheus_text``;
+every finished span is also passed to the registered exporters, such as
+``JsonlExporter``, together with any extra fields the caller recorded.
+``session_memory`` tracks the bytes held for each UI session and publishes
+gauges aggregated over sessions.
+
+Set SMART_ATS_METRICS_LOG to append spans to a JSONL file, and
+SMART_ATS_METRICS_PORT to serve ``/metrics`` from the Streamlit process,
+on SMART_ATS_METRICS_HOST (default 127.0.0.1).
+Summarise a log with:
+
+    python -m smart_ats.metrics metrics.jsonl
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "smart_ats_"
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LOG_PATH = os.getenv("SMART_ATS_METRICS_LOG")
+METRICS_PORT = int(os.getenv("SMART_ATS_METRICS_PORT", "0"))
+# /metrics has no authentication, so it only listens locally unless configured
+METRICS_HOST = os.getenv("SMART_ATS_METRICS_HOST", "127.0.0.1")
+
+
+def approx_tokens(text):
+    """
+    Estimate the model token count of a text at four characters per token.
+    """
+    return math.ceil(len(text or "") / 4)
+
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = [(name, value.replace("\\", "\\\\").replace('"', '\\"')) for name, value in pairs]
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class Metrics:
+    """
+    Thread-safe registry of counters and span-duration histograms.
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._counters = defaultdict(float)
+        self._gauges = {}
+        self._histograms = {}
+        self._exporters = []
+        self._lock = threading.Lock()
+
+    def add_exporter(self, exporter):
+        """
+        Register a callable that receives every finished span as a dict.
+        """
+        with self._lock:
+            self._exporters.append(exporter)
+
+    def increment(self, name, value=1, **labels):
+        with self._lock:
+            self._counters[(name, _label_key(labels))] += value
+
+    def set_gauge(self, name, value, **labels):
+        """
+        Set a gauge to its current value; None removes it.
+        """
+        key = (name, _label_key(labels))
+        with self._lock:
+            if value is None:
+                self._gauges.pop(key, None)
+            else:
+                self._gauges[key] = value
+
+    def observe(self, name, seconds, **labels):
+        """
+        Record one duration in the histogram for name and labels.
+        """
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram[0][i] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+
+    @contextmanager
+    def span(self, name, **labels):
+        """
+        Time the enclosed block; yields a dict for extra fields to export.
+        """
+        fields = {}
+        start = time.perf_counter()
+        error = None
+        try:
+            yield fields
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            self.observe(name, seconds, **labels)
+            if error is not None:
+                self.increment(f"{name}_errors", **labels)
+            record = {"span": name, "ts": time.time(), "seconds": round(seconds, 6), "labels": labels, **fields}
+            if error is not None:
+                record["error"] = repr(error)
+            self._export(record)
+
+    def cache_result(self, cache, hit):
+        """
+        Count one cache lookup as a hit or a miss.
+        """
+        self.increment("cache_requests", cache=cache, result="hit" if hit else "miss")
+
+    def snapshot(self):
+        """
+        Return counters and histogram totals as plain data.
+        """
+        with self._lock:
+            counters = [{"name": name, "labels": dict(labels), "value": value}
+                        for (name, labels), value in self._counters.items()]
+            gauges = [{"name": name, "labels": dict(labels), "value": value}
+                      for (name, labels), value in self._gauges.items()]
+            spans = [{"name": name, "labels": dict(labels), "count": count, "sum": total}
+                     for (name, labels), (_, total, count) in self._histograms.items()]
+        return {"counters": counters, "gauges": gauges, "spans": spans}
+
+    def prometheus_text(self):
+        """
+        Render all metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            histograms = sorted((key, (list(b), s, c)) for key, (b, s, c) in self._histograms.items())
+        lines = []
+        declared = set()
+        for (name, labels), value in counters:
+            metric = f"{PREFIX}{name}_total"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} counter")
+                declared.add(metric)
+            lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+        for (name, labels), value in gauges:
+            metric = f"{PREFIX}{name}"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} gauge")
+                declared.add(metric)
+            lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+        for (name, labels), (bucket_counts, total, count) in histograms:
+            metric = f"{PREFIX}{name}_seconds"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} histogram")
+                declared.add(metric)
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                lines.append(f"{metric}_bucket{_format_labels(labels, [('le', f'{bound:g}')])} {bucket_count}")
+            lines.append(f"{metric}_bucket{_format_labels(labels, [('le', '+Inf')])} {count}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {total:.6f}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def _export(self, record):
+        with self._lock:
+            exporters = list(self._exporters)
+        for exporter in exporters:
+            try:
+                exporter(record)
+            except Exception as e:
+                # Instrumentation must never break the work it measures
+                logger.warning("Metrics exporter failed: %s", e)
+
+
+class JsonlExporter:
+    """
+    Append each span record as one JSON line.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def __call__(self, record):
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+class SessionMemory:
+    """
+    Bytes held on behalf of each session, by kind.
+
+    Kinds are things like the uploaded PDF while it is processed or the
+    previous version kept for incremental runs. Session IDs are not used
+    as labels, since every visitor would add series for the life of the
+    process; the gauges give the bytes held per kind, the number of
+    sessions holding any, and the largest session's total. Per-session
+    figures are available from snapshot().
+    """
+
+    def __init__(self, registry):
+        self.registry = registry
+        self._bytes = defaultdict(int)
+        self._kind_totals = defaultdict(int)
+        self._session_totals = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add(self, session, kind, nbytes):
+        self._publish(session, kind, lambda held: held + nbytes)
+
+    def set(self, session, kind, nbytes):
+        self._publish(session, kind, lambda held: nbytes)
+
+    @contextmanager
+    def hold(self, session, kind, nbytes):
+        """
+        Count nbytes against a session for the duration of the block.
+        """
+        self.add(session, kind, nbytes)
+        try:
+            yield
+        finally:
+            self.add(session, kind, -nbytes)
+
+    def _publish(self, session, kind, update):
+        session = session or "none"
+        with self._lock:
+            before = self._bytes.pop((session, kind), 0)
+            held = max(0, update(before))
+            if held:
+                self._bytes[(session, kind)] = held
+            self._kind_totals[kind] += held - before
+            self._session_totals[session] += held - before
+            if not self._session_totals[session]:
+                del self._session_totals[session]
+            # Published under the lock so concurrent updates cannot land out of order
+            self.registry.set_gauge("session_memory_bytes", self._kind_totals[kind], kind=kind)
+            self.registry.set_gauge("session_memory_sessions", len(self._session_totals))
+            self.registry.set_gauge("session_memory_max_session_bytes",
+                                    max(self._session_totals.values(), default=0))
+
+    def snapshot(self):
+        """
+        Return {session: {kind: bytes}}.
+        """
+        sessions = defaultdict(dict)
+        with self._lock:
+            for (session, kind), held in self._bytes.items():
+                sessions[session][kind] = held
+        return dict(sessions)
+
+
+metrics = Metrics()
+session_memory = SessionMemory(metrics)
+if LOG_PATH:
+    metrics.add_exporter(JsonlExporter(LOG_PATH))
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics.prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve_metrics(port=METRICS_PORT, host=METRICS_HOST):
+    """
+    Serve /metrics on a daemon thread and return the server.
+    """
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
+
+
+def percentile(values, q):
+    """
+    Return the q-th percentile (0-100) of values by nearest rank.
+    """
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def summarize(path):
+    """
+    Group a JSONL span log by span and labels into count, p50, p95 and max.
+    """
+    durations = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            durations[(record["span"], _label_key(record.get("labels", {})))].append(record["seconds"])
+    return [
+        {"span": name, "labels": dict(labels), "count": len(values), "p50": percentile(values, 50),
+         "p95": percentile(values, 95), "max": max(values)}
+        for (name, labels), values in sorted(durations.items())
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise span latencies from a metrics JSONL log.")
+    parser.add_argument("log", nargs="?", default=LOG_PATH)
+    args = parser.parse_args()
+    if not args.log:
+        parser.error("no log file given and SMART_ATS_METRICS_LOG is not set")
+    rows = summarize(args.log)
+    print(f"{'span':<48} {'count':>7} {'p50 s':>9} {'p95 s':>9} {'max s':>9}")
+    for row in sorted(rows, key=lambda row: row["p95"], reverse=True):
+        label = row["span"] + _format_labels(sorted(row["labels"].items()))
+        print(f"{label:<48} {row['count']:>7} {row['p50']:>9.3f} {row['p95']:>9.3f} {row['max']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
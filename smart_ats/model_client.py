@@ -0,0 +1,244 @@
+"""
+Shared, rate-limited client for the Gemini model.
+
+One ``ModelClient`` per model name is created per process and shared by
+every session. Calls pass through a token-bucket limiter, carry a per-call
+timeout, and transient failures are retried with jittered exponential
+backoff. Queue depth, calls in flight, limiter waits, retries and
+failures are published to ``metrics`` for the /metrics exporter, and
+``stats()`` returns the same figures for one client.
+"""
+import itertools
+import json
+import os
+import random
+import threading
+import time
+
+from smart_ats.metrics import metrics
+
+GEMINI_MODEL = "gemini-pro"
+
+# Requests per second and burst size per model; override with
+# SMART_ATS_RATE_LIMITS='{"gemini-pro": [1.0, 5]}'
+RATE_LIMITS = {GEMINI_MODEL: (1.0, 5)}
+RATE_LIMITS.update({
+    model: tuple(limit) for model, limit in json.loads(os.getenv("SMART_ATS_RATE_LIMITS", "{}")).items()
+})
+TIMEOUT_SECONDS = float(os.getenv("SMART_ATS_MODEL_TIMEOUT", "120"))
+MAX_RETRIES = int(os.getenv("SMART_ATS_MODEL_RETRIES", "4"))
+BACKOFF_BASE = float(os.getenv("SMART_ATS_BACKOFF_BASE", "1.0"))
+BACKOFF_MAX = float(os.getenv("SMART_ATS_BACKOFF_MAX", "30.0"))
+
+
+def _retryable_errors():
+    """
+    Return the exception types that indicate a transient failure.
+    """
+    errors = [TimeoutError, ConnectionError]
+    try:
+        from google.api_core import exceptions
+    except ImportError:
+        return tuple(errors)
+    errors += [
+        exceptions.ResourceExhausted,
+        exceptions.TooManyRequests,
+        exceptions.ServiceUnavailable,
+        exceptions.DeadlineExceeded,
+        exceptions.InternalServerError,
+    ]
+    return tuple(errors)
+
+
+class TokenBucket:
+    """
+    Blocking token-bucket limiter that tracks how many callers are waiting.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.waiting = 0
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """
+        Take one token, blocking until available. Returns the seconds waited.
+        """
+        if self.rate <= 0:
+            return 0.0
+        start = time.monotonic()
+        with self._condition:
+            self.waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    self._condition.wait((1 - self._tokens) / self.rate)
+            finally:
+                self.waiting -= 1
+        return time.monotonic() - start
+
+
+def gemini_model_factory(model_name):
+    """
+    Create a Gemini model configured with the API key from the environment.
+    """
+    import google.generativeai as genai
+
+    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+    return genai.GenerativeModel(model_name)
+
+
+class ModelClient:
+    """
+    Wraps one model instance with rate limiting, timeouts and retries.
+    """
+
+    def __init__(self, model_name=GEMINI_MODEL, model_factory=gemini_model_factory, rate=None,
+                 burst=None, timeout=TIMEOUT_SECONDS, max_retries=MAX_RETRIES,
+                 backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX, retryable=None):
+        default_rate, default_burst = RATE_LIMITS.get(model_name, (0, 1))
+        self.model_name = model_name
+        self.model = model_factory(model_name)
+        self.limiter = TokenBucket(default_rate if rate is None else rate,
+                                   default_burst if burst is None else burst)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retryable = _retryable_errors() if retryable is None else retryable
+        self._stats_lock = threading.Lock()
+        self._stats = {"calls": 0, "retries": 0, "failures": 0, "in_flight": 0, "queued": 0,
+                       "wait_seconds_total": 0.0, "wait_seconds_max": 0.0}
+
+    def generate(self, prompt):
+        """
+        Return the full response text for a prompt.
+        """
+        response = self._call(lambda: self.model.generate_content(
+            prompt, request_options={"timeout": self.timeout}
+        ))
+        return response.text
+
+    def stream(self, prompt):
+        """
+        Yield response text chunks for a prompt.
+
+        Failures are only retried before the first chunk has been yielded.
+        The call counts as in flight until the stream is exhausted or closed.
+        """
+        chunks = self._call(lambda: self._start_stream(prompt), release=False)
+        try:
+            for chunk in chunks:
+                if chunk.text:
+                    yield chunk.text
+        finally:
+            self._record(in_flight=-1)
+
+    def _start_stream(self, prompt):
+        # Pull the first chunk eagerly so connection errors surface inside _call
+        response = iter(self.model.generate_content(
+            prompt, stream=True, request_options={"timeout": self.timeout}
+        ))
+        first = next(response, None)
+        return itertools.chain([] if first is None else [first], response)
+
+    def stats(self):
+        """
+        Return counters for capacity planning.
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = stats.pop("queued")
+        stats["wait_seconds_avg"] = stats["wait_seconds_total"] / stats["calls"] if stats["calls"] else 0.0
+        return stats
+
+    def _call(self, request, release=True):
+        # With release=False a successful call stays in flight until the caller records its end
+        attempt = 0
+        while True:
+            self._record(queued=1)
+            try:
+                waited = self.limiter.acquire()
+            finally:
+                self._record(queued=-1)
+            self._record(calls=1, wait=waited, in_flight=1)
+            succeeded = False
+            try:
+                result = request()
+                succeeded = True
+                return result
+            except self.retryable:
+                if attempt >= self.max_retries:
+                    self._record(failures=1)
+                    raise
+                # Full jitter keeps retrying sessions from synchronising
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                attempt += 1
+                self._record(retries=1)
+                time.sleep(delay)
+            except Exception:
+                self._record(failures=1)
+                raise
+            finally:
+                if release or not succeeded:
+                    self._record(in_flight=-1)
+
+    def _record(self, calls=0, retries=0, failures=0, in_flight=0, queued=0, wait=None):
+        with self._stats_lock:
+            self._stats["calls"] += calls
+            self._stats["retries"] += retries
+            self._stats["failures"] += failures
+            self._stats["in_flight"] += in_flight
+            self._stats["queued"] += queued
+            if wait is not None:
+                self._stats["wait_seconds_total"] += wait
+                self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], wait)
+            # Gauges are set under the same lock, so they never go back in time
+            if in_flight:
+                metrics.set_gauge("model_in_flight", self._stats["in_flight"], model=self.model_name)
+            if queued:
+                metrics.set_gauge("model_queue_depth", self._stats["queued"], model=self.model_name)
+        for name, value in (("model_calls", calls), ("model_retries", retries), ("model_failures", failures)):
+            if value:
+                metrics.increment(name, value, model=self.model_name)
+        if wait is not None:
+            metrics.observe("model_limiter_wait", wait, model=self.model_name)
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(model_name=GEMINI_MODEL, model_factory=None):
+    """
+    Return the process-wide client for a model, creating it on first use.
+
+    Set SMART_ATS_FAKE_MODEL=1 to use the local fake model instead of Gemini,
+    and SMART_ATS_RECORD_RESPONSES=<path> to save responses for it to replay
+    via SMART_ATS_FAKE_RESPONSES.
+    """
+    with _clients_lock:
+        client = _clients.get(model_name)
+        if client is None:
+            if model_factory is None:
+                if os.getenv("SMART_ATS_FAKE_MODEL"):
+                    from smart_ats.fakes import FakeModel
+                    model_factory = FakeModel.from_env
+                else:
+                    model_factory = gemini_model_factory
+                recording = os.getenv("SMART_ATS_RECORD_RESPONSES")
+                if recording:
+                    from smart_ats.fakes import RecordingModel
+                    real_factory = model_factory
+                    model_factory = lambda name: RecordingModel(real_factory(name), recording)
+            client = ModelClient(model_name, model_factory)
+            _clients[model_name] = client
+        return client
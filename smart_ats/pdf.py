@@ -0,0 +1,324 @@
+"""
+PDF text extraction with a content-addressed cache.
+
+Extracted text is keyed by the SHA-256 of the PDF bytes, so re-running a
+feature on the same resume skips parsing entirely. Page boundaries are lost
+once pages are joined, so the line numbers of repeated page headers and
+footers are found at extraction and cached with the text. Large documents
+are split into page ranges and extracted in a pool of worker processes.
+
+Uploads are untrusted, so by default extraction is guarded: each document
+is parsed in its own short-lived subprocess with a memory cap, within
+byte, page and time budgets, and parsing stops early once there is more
+text than any prompt can use. A huge or malformed PDF then costs one
+killed subprocess instead of memory and a worker thread shared by every
+session. Set SMART_ATS_PDF_GUARD=0 to parse in-process.
+"""
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+from smart_ats.budget import DEFAULT_BUDGET, FEATURE_BUDGETS, page_furniture
+from smart_ats.metrics import metrics, session_memory
+
+CACHE_SIZE = int(os.getenv("SMART_ATS_PDF_CACHE_SIZE", "64"))
+# The disk tier is only enabled when a directory is configured
+CACHE_DIR = os.getenv("SMART_ATS_PDF_CACHE_DIR")
+PARALLEL_MIN_PAGES = int(os.getenv("SMART_ATS_PDF_PARALLEL_PAGES", "16"))
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAX_WORKERS = int(os.getenv("SMART_ATS_PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+GUARD = os.getenv("SMART_ATS_PDF_GUARD", "1") != "0"
+MAX_BYTES = int(os.getenv("SMART_ATS_PDF_MAX_BYTES", str(10 * 1024 * 1024)))
+MAX_PAGES = int(os.getenv("SMART_ATS_PDF_MAX_PAGES", "50"))
+TIMEOUT_SECONDS = float(os.getenv("SMART_ATS_PDF_TIMEOUT", "30"))
+MEMORY_BYTES = int(os.getenv("SMART_ATS_PDF_MEMORY_MB", "512")) * 1024 * 1024
+# Twice the largest resume budget at four characters per token leaves room for
+# the cleaning and section trimming that happen before a prompt is built
+MAX_CHARS = int(os.getenv("SMART_ATS_PDF_MAX_CHARS",
+                          str(2 * 4 * max(DEFAULT_BUDGET, *FEATURE_BUDGETS.values()))))
+
+
+class PdfLimitError(ValueError):
+    """
+    A PDF was rejected or could not be read within the extraction budgets.
+    """
+
+
+class PdfLimits(NamedTuple):
+    """
+    Budgets for one guarded extraction.
+    """
+    max_bytes: int = MAX_BYTES
+    max_pages: int = MAX_PAGES
+    max_chars: int = MAX_CHARS
+    timeout: float = TIMEOUT_SECONDS
+    memory_bytes: int = MEMORY_BYTES
+
+
+DEFAULT_LIMITS = PdfLimits()
+
+
+class ExtractedText(NamedTuple):
+    """
+    A document's joined page text and the header and footer lines to clean from it.
+    """
+    text: str
+    # Line numbers of repeated page headers and footers; see budget.page_furniture
+    furniture: frozenset = frozenset()
+
+
+def document_hash(data):
+    """
+    Return the content hash used as the cache key for a document.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+class TextCache:
+    """
+    Bounded LRU of ExtractedText entries with an optional on-disk tier.
+    """
+
+    def __init__(self, max_entries=CACHE_SIZE, cache_dir=CACHE_DIR):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                stored = json.load(f)
+            entry = ExtractedText(stored["text"], frozenset(stored["furniture"]))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def put(self, key, entry):
+        self._remember(key, entry)
+        if not self.cache_dir:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"text": entry.text, "furniture": sorted(entry.furniture)}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            # The disk tier is best effort; the memory tier already has the text
+            pass
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+text_cache = TextCache()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """
+    Return the process pool used for page-parallel extraction.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Spawned workers are started once and reused for every document
+            _executor = ProcessPoolExecutor(
+                max_workers=MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def open_reader(data):
+    """
+    Open a PDF given as bytes; PyPDF2 is only imported on first use.
+    """
+    import PyPDF2
+    return PyPDF2.PdfReader(io.BytesIO(data))
+
+
+def _extract_pages(data, start, stop):
+    """
+    Extract the text of pages [start, stop) from a PDF given as bytes.
+    """
+    reader = open_reader(data)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def iter_pages(data, parallel=True):
+    """
+    Yield the text of each page, in order, as soon as it is available.
+    """
+    reader = open_reader(data)
+    page_count = len(reader.pages)
+    if not parallel or page_count < PARALLEL_MIN_PAGES or MAX_WORKERS < 2:
+        for page in reader.pages:
+            yield page.extract_text() or ""
+        return
+
+    # Two ranges per worker keeps the pool busy when pages differ in cost
+    step = max(1, -(-page_count // (MAX_WORKERS * 2)))
+    executor = _get_executor()
+    futures = [
+        executor.submit(_extract_pages, data, start, min(start + step, page_count))
+        for start in range(0, page_count, step)
+    ]
+    for future in futures:
+        yield from future.result()
+
+
+def guarded_pages(data, limits=DEFAULT_LIMITS):
+    """
+    Extract page texts in a memory-capped subprocess within the given budgets.
+
+    Returns (pages, info), where info has the document's page count, why
+    extraction stopped early if it did, and the subprocess's peak memory.
+    Raises PdfLimitError if the PDF is too large or no text could be read
+    within the budgets.
+    """
+    if len(data) > limits.max_bytes:
+        metrics.increment("pdf_rejected", reason="bytes")
+        raise PdfLimitError(f"PDF is {len(data):,} bytes; the limit is {limits.max_bytes:,} bytes")
+    # A fresh interpreter rather than multiprocessing, which would re-import
+    # the parent's __main__ (Streamlit) in the worker
+    command = [sys.executable, "-m", "smart_ats.pdf_worker", "--max-pages", str(limits.max_pages),
+               "--max-chars", str(limits.max_chars), "--memory-bytes", str(limits.memory_bytes)]
+    process = subprocess.Popen(command, cwd=ROOT_DIR, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL)
+    info = {"pages": None, "truncated": None, "peak_bytes": None}
+    error = None
+    try:
+        output, _ = process.communicate(data, timeout=limits.timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        # Pages written before the deadline are still in the pipe
+        output, _ = process.communicate()
+        info["truncated"] = "time"
+        error = f"PDF extraction took longer than {limits.timeout:g}s"
+    pages = []
+    for line in output.splitlines():
+        try:
+            event = json.loads(line)
+        except ValueError:
+            # A killed worker can leave half a line
+            continue
+        if "page" in event:
+            pages.append(event["page"])
+        elif "pages" in event:
+            info["pages"] = event["pages"]
+        elif "truncated" in event:
+            info["truncated"] = event["truncated"]
+        elif "error" in event:
+            error = event["error"]
+        elif "done" in event:
+            info["peak_bytes"] = event["done"]
+    if error is None and process.returncode != 0:
+        # The memory cap can kill the worker before it reports anything
+        error = f"PDF extraction worker exited with code {process.returncode}"
+    if error is not None:
+        metrics.increment("pdf_guard_errors", reason=info["truncated"] or "error")
+        if not any(pages):
+            raise PdfLimitError(error)
+        # Text read before the failure is still worth analysing
+        info["truncated"] = info["truncated"] or "error"
+    if info["truncated"]:
+        metrics.increment("pdf_truncated", reason=info["truncated"])
+    return pages, info
+
+
+def join_pages(pages):
+    """
+    Join page texts the way the app has always formatted extracted text.
+    """
+    return "".join(text + "\n" for text in pages if text)
+
+
+def read_pdf_bytes(uploaded_file):
+    """
+    Return the raw bytes of an uploaded file, path or bytes object.
+    """
+    if isinstance(uploaded_file, (bytes, bytearray)):
+        return bytes(uploaded_file)
+    if isinstance(uploaded_file, (str, os.PathLike)):
+        with open(uploaded_file, "rb") as f:
+            return f.read()
+    if hasattr(uploaded_file, "getvalue"):
+        return uploaded_file.getvalue()
+    uploaded_file.seek(0)
+    return uploaded_file.read()
+
+
+def _cache_key(data, guarded, limits):
+    key = document_hash(data)
+    # Guarded text may be cut short, so it is cached per page and text budget
+    return f"{key}-{limits.max_pages}-{limits.max_chars}" if guarded else key
+
+
+def extract_document(data, parallel=True, limits=DEFAULT_LIMITS, session=None, guarded=GUARD):
+    """
+    Return the ExtractedText of a PDF given as bytes, using the cache when possible.
+
+    Guarded extraction ignores parallel and may raise PdfLimitError. The
+    PDF and its text are counted against session's memory while it runs.
+    """
+    key = _cache_key(data, guarded, limits)
+    entry = text_cache.get(key)
+    metrics.cache_result("pdf_text", entry is not None)
+    if entry is None:
+        with session_memory.hold(session, "pdf_upload", len(data)), \
+                metrics.span("pdf_extract", guarded=guarded) as span:
+            if guarded:
+                pages, info = guarded_pages(data, limits)
+                span.update(info, session=session)
+            else:
+                pages = list(iter_pages(data, parallel))
+            entry = ExtractedText(join_pages(pages), page_furniture(pages))
+            span.update(bytes=len(data), chars=len(entry.text))
+        metrics.increment("pdf_chars", len(entry.text))
+        text_cache.put(key, entry)
+    return entry
+
+
+def extract_text(data, parallel=True, limits=DEFAULT_LIMITS, session=None, guarded=GUARD):
+    """
+    Return the text of a PDF given as bytes; see extract_document.
+    """
+    return extract_document(data, parallel, limits, session, guarded).text
+
+
+def input_pdf_text(uploaded_file, session=None):
+    """
+    Extract text from an uploaded PDF file.
+    """
+    return extract_text(read_pdf_bytes(uploaded_file), session=session)
+
@@ -0,0 +1,75 @@
+"""
+Subprocess side of guarded PDF extraction; see ``smart_ats.pdf.guarded_pages``.
+
+Reads a PDF on stdin and writes one JSON line per event to stdout, under
+a memory cap and page and text budgets given on the command line. Only
+the standard library and PyPDF2 are imported, to keep start-up short.
+
+    python -m smart_ats.pdf_worker --max-pages 50 --max-chars 32000 < resume.pdf
+"""
+import argparse
+import io
+import json
+import sys
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, where the memory cap is skipped
+    resource = None
+
+
+def extract(data, max_pages, max_chars, memory_bytes, out):
+    """
+    Extract pages, writing one JSON line per event to out.
+
+    Events are {"pages": total}, {"page": text}, {"truncated": reason},
+    {"error": message} and finally {"done": peak resident bytes}.
+    """
+    def emit(**event):
+        out.write(json.dumps(event) + "\n")
+        out.flush()
+
+    try:
+        if resource is not None and memory_bytes:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+        import PyPDF2
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+        total = len(reader.pages)
+        emit(pages=total)
+        chars = 0
+        for i in range(min(total, max_pages)):
+            page_text = reader.pages[i].extract_text() or ""
+            # A single page can hold more text than every prompt together
+            text = page_text[:max_chars - chars]
+            emit(page=text)
+            chars += len(text)
+            if len(text) < len(page_text) or (chars >= max_chars and i + 1 < total):
+                emit(truncated="chars")
+                break
+        else:
+            if total > max_pages:
+                emit(truncated="pages")
+        peak = None
+        if resource is not None:
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # ru_maxrss is in kilobytes except on macOS
+            peak *= 1 if sys.platform == "darwin" else 1024
+        emit(done=peak)
+    except MemoryError:
+        emit(error="PDF needs more memory than the extraction limit allows")
+    except Exception as e:
+        emit(error=str(e))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract a PDF from stdin as JSON lines, within budgets.")
+    parser.add_argument("--max-pages", type=int, required=True)
+    parser.add_argument("--max-chars", type=int, required=True)
+    parser.add_argument("--memory-bytes", type=int, default=0, help="Address space cap; 0 for none")
+    args = parser.parse_args()
+    extract(sys.stdin.buffer.read(), args.max_pages, args.max_chars, args.memory_bytes, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
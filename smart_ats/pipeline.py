@@ -0,0 +1,228 @@
+"""
+The end-to-end analysis pipeline, independent of Streamlit.
+
+Runs extraction, translation, the model calls and back-translation for one
+resume and job description, reporting each stage through a callback so
+callers such as the job queue can publish progress. Runs tagged with a
+session are incremental: a revised resume is diffed against the session's
+previous one and only the affected reports are revised (see
+``smart_ats.incremental``).
+"""
+import time
+from functools import partial
+
+from smart_ats import incremental
+from smart_ats.analysis import cached_gemini_response, cached_gemini_stream, gemini_response, stream_gemini_response
+from smart_ats.dispatch import run_concurrently
+from smart_ats.metrics import metrics, session_memory
+from smart_ats.pdf import extract_document
+from smart_ats.prompts import feature_prompts
+from smart_ats.translation import translate_document, translate_keeping_lines
+
+STAGES = ("extract", "translate", "model", "translate_back")
+STAGE_LABELS = {
+    "extract": "Extracting resume text...",
+    "translate": "Translating documents...",
+    "model": "Processing...",
+    "translate_back": "Translating results...",
+}
+# Minimum seconds between partial-result reports while a response streams
+PARTIAL_INTERVAL = 0.5
+
+
+def translate_response(response, dest_language):
+    """
+    Translate a response for display, returning (display_text, error).
+    """
+    if dest_language == 'en':
+        return response, None
+    try:
+        return translate_document(response, dest_language), None
+    except Exception as e:
+        return response, f"Translation failed: {e}"
+
+
+def translate_input(text):
+    """
+    Translate a document to English for the prompts, returning (text, error).
+
+    On failure the original text is analysed instead.
+    """
+    try:
+        return translate_document(text, 'en'), None
+    except Exception as e:
+        return text, f"Translation failed: {e}"
+
+
+def translate_resume(text, furniture=frozenset()):
+    """
+    Translate a resume to English for the prompts, returning (text, furniture, error).
+
+    furniture, the line numbers of the resume's page headers and footers,
+    is mapped onto the translation. On failure the original text is
+    analysed instead.
+    """
+    try:
+        translated, moved = translate_keeping_lines(text, 'en', furniture)
+        return translated, moved, None
+    except Exception as e:
+        return text, furniture, f"Translation failed: {e}"
+
+
+def feature_response(feature, plan, resume_text, jd_text, furniture=frozenset()):
+    """
+    Return the model response for a planned feature run.
+
+    Delta prompts depend on the session's previous report, so they bypass
+    the response cache, which is keyed by resume and job description.
+    """
+    if plan.delta:
+        return gemini_response(plan.prompt)
+    return cached_gemini_response(feature, plan.prompt, resume_text, jd_text, furniture)
+
+
+def feature_stream(feature, plan, resume_text, jd_text, furniture=frozenset()):
+    """
+    Stream the model response for a planned feature run; see feature_response.
+    """
+    if plan.delta:
+        return stream_gemini_response(plan.prompt)
+    return cached_gemini_stream(feature, plan.prompt, resume_text, jd_text, furniture)
+
+
+def run_feature(feature, plan, resume_text, jd_text, dest_language, furniture=frozenset()):
+    """
+    Run one feature and return its result entry, including display text.
+
+    Safe to call from worker threads: it does not touch Streamlit elements.
+    """
+    response = feature_response(feature, plan, resume_text, jd_text, furniture)
+    display, error = translate_response(response, dest_language)
+    return {"response": response, "display": display, "error": error}
+
+
+def run_analysis(resume_bytes, jd, features, dest_language, report=None, session=None):
+    """
+    Analyse a resume PDF against a job description for the given features.
+
+    report(stage, results) is called when each stage starts and whenever
+    partial results are available. Returns {feature: result entry}.
+    """
+    report = report or (lambda stage, results: None)
+    report("extract", {})
+    with metrics.span("stage", stage="extract"):
+        document = extract_document(resume_bytes, session=session)
+    with session_memory.hold(session, "resume_text", len(document.text.encode("utf-8"))):
+        return analyse_text(document.text, jd, features, dest_language, report, session, document.furniture)
+
+
+def analyse_text(resume_text, jd, features, dest_language, report=None, session=None, furniture=frozenset()):
+    """
+    Analyse already-extracted resume text; see run_analysis.
+
+    furniture holds the line numbers of the resume's repeated page headers
+    and footers, as returned with the text by ``pdf.extract_document``.
+    """
+    report = report or (lambda stage, results: None)
+    results = {}
+    previous = incremental.history.get(session) if session else None
+
+    # Translate resume and job description to English if necessary
+    report("translate", results)
+    input_errors = []
+    with metrics.span("stage", stage="translate"):
+        if dest_language != 'en':
+            # Unchanged chunks of the previous version are not translated again
+            incremental.restore_chunks(previous)
+            resume_text_translated, furniture_translated, resume_error = translate_resume(resume_text, furniture)
+            jd_translated, jd_error = translate_input(jd)
+            input_errors = [error for error in (resume_error, jd_error) if error]
+        else:
+            resume_text_translated, furniture_translated = resume_text, furniture
+            jd_translated = jd
+    if input_errors:
+        # Untranslated text is not a version later edits should be diffed against
+        session = None
+
+    report("model", results)
+    plans = incremental.plan_features(previous, resume_text_translated, jd_translated, features,
+                                      furniture_translated)
+    for feature, plan in plans.items():
+        if plan.response is not None:
+            # The edits do not touch this feature's sections, so its report stands
+            display, error = translate_response(plan.response, dest_language)
+            results[feature] = {"response": plan.response, "display": display, "error": error}
+    pending = [feature for feature in features if feature not in results]
+    if results:
+        report("model", results)
+
+    if len(pending) == 1:
+        # A single feature streams, publishing the text as it grows
+        feature = pending[0]
+        chunks = []
+        last_report = 0.0
+        try:
+            with metrics.span("stage", stage="model"):
+                for chunk in feature_stream(feature, plans[feature], resume_text_translated, jd_translated,
+                                            furniture_translated):
+                    chunks.append(chunk)
+                    if time.monotonic() - last_report >= PARTIAL_INTERVAL:
+                        text = "".join(chunks)
+                        results[feature] = {"response": text, "display": text, "error": None, "partial": True}
+                        report("model", results)
+                        last_report = time.monotonic()
+        except Exception as e:
+            # Fail only this feature, as the concurrent path below does
+            results[feature] = {"response": None, "display": None, "error": f"Processing failed: {e}"}
+            report("model", results)
+        else:
+            response = "".join(chunks)
+            results[feature] = {"response": response, "display": response, "error": None}
+            report("translate_back", results)
+            with metrics.span("stage", stage="translate_back"):
+                display, error = translate_response(response, dest_language)
+            results[feature] = {"response": response, "display": display, "error": error}
+        _report_errors(results, input_errors)
+        return _remember(session, previous, resume_text, resume_text_translated, jd_translated, plans, results,
+                         furniture)
+
+    # Each task translates its own response back, so the model stage covers both
+    tasks = {
+        feature: partial(run_feature, feature, plans[feature], resume_text_translated,
+                         jd_translated, dest_language, furniture_translated)
+        for feature in pending
+    }
+    with metrics.span("stage", stage="model"):
+        for feature, result, error in run_concurrently(tasks):
+            if error is not None:
+                result = {"response": None, "display": None, "error": f"Processing failed: {error}"}
+            results[feature] = result
+            report("model", results)
+    report("translate_back", results)
+    _report_errors(results, input_errors)
+    return _remember(session, previous, resume_text, resume_text_translated, jd_translated, plans, results,
+                     furniture)
+
+
+def _report_errors(results, errors):
+    # Input translation failures are shown with every result they affected
+    if not errors:
+        return
+    for result in results.values():
+        messages = errors + ([result["error"]] if result["error"] else [])
+        result["error"] = "; ".join(dict.fromkeys(messages))
+
+
+def _remember(session, previous, resume_text, resume_translated, jd_translated, plans, results, furniture):
+    if session:
+        version = incremental.next_version(previous, resume_text, resume_translated, jd_translated, plans, results,
+                                           furniture)
+        incremental.history.put(session, version)
+    return results
+
+
+def subheader_for(feature):
+    """
+    Return the result subheader shown for a feature.
+    """
+    return feature_prompts[feature][1]
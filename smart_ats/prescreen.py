@@ -0,0 +1,196 @@
+"""
+Local keyword pre-screening of resumes against a job description.
+
+Scores a whole batch with TF-IDF cosine similarity and JD keyword coverage
+using vectorized NumPy operations over a sparse (document, term) layout,
+so thousands of resumes can be ranked in seconds before any of them is
+sent to the model.
+"""
+import string
+from typing import NamedTuple
+
+import numpy as np
+
+# Punctuation other than the characters used in names like C++, C# and
+# Node.js becomes whitespace, so tokenizing is a C-level split
+SEPARATORS = str.maketrans({
+    char: " " for char in string.punctuation.replace("+", "").replace("#", "").replace(".", "") + "•●▪■◦–—·“”‘’"
+})
+SHORT_TOKENS = frozenset({"c", "r"})
+
+# Multi-word skills collapse to one token so they match their abbreviations
+PHRASES = {
+    "machine learning": "ml",
+    "deep learning": "dl",
+    "artificial intelligence": "ai",
+    "natural language processing": "nlp",
+    "computer vision": "cv",
+    "large language model": "llm",
+    "continuous integration": "ci",
+    "continuous delivery": "cd",
+    "user experience": "ux",
+    "user interface": "ui",
+    "amazon web services": "aws",
+    "google cloud platform": "gcp",
+    "project management": "project_management",
+    "data visualization": "data_visualization",
+}
+
+SYNONYMS = {
+    "js": "javascript",
+    "ts": "typescript",
+    "golang": "go",
+    "postgres": "postgresql",
+    "k8s": "kubernetes",
+    "reactjs": "react",
+    "react.js": "react",
+    "nodejs": "node.js",
+    "node": "node.js",
+    "py": "python",
+    "sklearn": "scikit-learn",
+    "tf": "tensorflow",
+    "llms": "llm",
+}
+
+# Canonical names that end in "s" without being plurals
+UNFOLDED = frozenset(SYNONYMS.values()) | {"pandas", "jenkins", "devops", "windows"}
+# Bump when normalization changes, so stored term vectors are rebuilt
+TOKENIZER_VERSION = 2
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by can for from has have in into is it its of on or our
+that the their this to was we were will with you your they them who which what when where
+how all any also more most other such than then there these those each per via using use
+used able ability work working experience experienced year years strong good excellent
+""".split())
+
+
+def normalize_token(token):
+    """
+    Map a raw token to its canonical form, or None if it carries no signal.
+    """
+    token = token.strip(".")
+    if token in STOPWORDS or token.isdigit() or (len(token) < 2 and token not in SHORT_TOKENS):
+        return None
+    token = SYNONYMS.get(token, token)
+    # Only fold plurals of plain words; names like node.js, c++ or kubernetes stay intact
+    if token.isalpha() and token not in UNFOLDED:
+        if len(token) > 4 and token.endswith("ies"):
+            token = token[:-3] + "y"
+        elif len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+            token = token[:-1]
+    return SYNONYMS.get(token, token)
+
+
+def raw_tokens(text):
+    """
+    Lowercase and split text, collapsing known multi-word skills to one token.
+    """
+    text = " ".join(text.lower().translate(SEPARATORS).split())
+    for phrase, token in PHRASES.items():
+        if phrase in text:
+            text = text.replace(phrase, token)
+    return text.split()
+
+
+def tokenize(text):
+    """
+    Split text into normalized keyword tokens.
+    """
+    tokens = (normalize_token(token) for token in raw_tokens(text))
+    return [token for token in tokens if token is not None]
+
+
+def _term_ids(text, vocabulary, memo):
+    """
+    Return the vocabulary ids of a text's tokens, memoizing normalization.
+    """
+    tokens = raw_tokens(text)
+    # Normalize each distinct token once; the per-token lookup stays in C
+    for token in set(tokens).difference(memo):
+        canonical = normalize_token(token)
+        memo[token] = -1 if canonical is None else vocabulary.setdefault(canonical, len(vocabulary))
+    ids = np.array(list(map(memo.__getitem__, tokens)), dtype=np.int64)
+    return ids[ids >= 0]
+
+
+class BatchScores(NamedTuple):
+    """
+    Per-resume cosine similarity and JD keyword coverage, both in [0, 1].
+    """
+    similarity: np.ndarray
+    coverage: np.ndarray
+
+    @property
+    def score(self):
+        """
+        Preliminary match score out of 100.
+        """
+        return 50.0 * (self.similarity + self.coverage)
+
+
+def score_batch(resume_texts, jd_text):
+    """
+    Score every resume against the job description in one vectorized pass.
+    """
+    vocabulary = {}
+    memo = {}
+    term_ids = []
+    doc_ids = []
+    for doc, text in enumerate(resume_texts):
+        ids = _term_ids(text, vocabulary, memo)
+        term_ids.append(ids)
+        doc_ids.append(np.full(ids.size, doc, dtype=np.int64))
+    jd_terms = _term_ids(jd_text, vocabulary, memo)
+
+    doc_count = len(resume_texts)
+    vocab_size = len(vocabulary)
+    if doc_count == 0 or jd_terms.size == 0:
+        zeros = np.zeros(doc_count)
+        return BatchScores(zeros, zeros.copy())
+
+    # Collapse the token stream to unique (document, term) pairs with counts
+    terms = np.concatenate(term_ids) if term_ids else np.empty(0, dtype=np.int64)
+    docs = np.concatenate(doc_ids) if doc_ids else np.empty(0, dtype=np.int64)
+    pairs, counts = np.unique(docs * vocab_size + terms, return_counts=True)
+    docs, terms = np.divmod(pairs, vocab_size)
+
+    document_frequency = np.bincount(terms, minlength=vocab_size)
+    idf = np.log((1.0 + doc_count) / (1.0 + document_frequency)) + 1.0
+    weights = (1.0 + np.log(counts)) * idf[terms]
+    norms = np.sqrt(np.bincount(docs, weights=weights ** 2, minlength=doc_count))
+
+    jd_unique, jd_counts = np.unique(jd_terms, return_counts=True)
+    jd_vector = np.zeros(vocab_size)
+    jd_vector[jd_unique] = (1.0 + np.log(jd_counts)) * idf[jd_unique]
+    jd_norm = np.sqrt(np.sum(jd_vector ** 2))
+
+    dot = np.bincount(docs, weights=weights * jd_vector[terms], minlength=doc_count)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        similarity = np.where(norms > 0, dot / (norms * jd_norm), 0.0)
+
+    matched = np.bincount(docs, weights=(jd_vector[terms] > 0).astype(float), minlength=doc_count)
+    coverage = matched / jd_unique.size
+    return BatchScores(similarity, coverage)
+
+
+def top_k(scores, k):
+    """
+    Return the indices of the k best scores, best first.
+    """
+    scores = np.asarray(scores)
+    if k >= scores.size:
+        return np.argsort(-scores, kind="stable")
+    candidates = np.argpartition(-scores, k)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def keyword_overlap(resume_text, jd_text):
+    """
+    Return the JD keywords found in and missing from a resume.
+    """
+    resume_terms = set(tokenize(resume_text))
+    jd_terms = list(dict.fromkeys(tokenize(jd_text)))
+    matched = [term for term in jd_terms if term in resume_terms]
+    missing = [term for term in jd_terms if term not in resume_terms]
+    return matched, missing
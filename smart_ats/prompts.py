@@ -0,0 +1,300 @@
+"""
+Prompt templates for the Smart ATS features.
+
+Templates are filled with ``str.format`` using ``resume_text_translated`` and
+``jd_translated``. Each template's version is derived from its text, the
+resume sections it receives and its token budget, so editing one prompt
+only invalidates cached responses for that feature.
+"""
+import hashlib
+
+from smart_ats import budget
+from smart_ats.sections import FEATURE_SECTIONS
+
+# Feature 1: Skill Gap Analysis
+input_prompt1 = """
+You are an expert career consultant specializing in skill gap analysis.
+
+**Instructions:**
+
+1. **Extract key skills and qualifications from the job description.**
+2. **Extract skills and qualifications from the resume.**
+3. **Compare the two lists, considering synonyms, related terms, and different expressions of the same skills or qualifications.**
+4. **Identify and list only those skills and qualifications that are truly missing from the resume and are not present in any form.**
+5. **Identify if any skill and qualifications are related in any other form as well like may be the skill is mentioned in Plural form in resume but singular in Job Description.**
+6. **Check their project as well how they worked on that and with which skills and stacks and consider those skills as well while comparing it with Job Description.**
+
+**Important Notes:**
+
+- **When comparing, consider that the same skill may be described differently.**
+- **Do not list a skill as missing if it is present in the resume, even if phrased differently.**
+- **Focus on the meaning and context of the skills, not just the exact wording.**
+- **Do not add any fake information or experiences.**
+
+**Example:**
+
+*Job Description Skills:*
+- Machine Learning
+- Data Visualization (e.g., Tableau)
+- Project Management
+- LLM
+
+*Resume Skills:*
+- Proficient in machine learning algorithms
+- Experienced with Tableau for data visualization
+- Managed multiple data science projects
+- LLMs
+
+*Missing Skills:*
+- None
+
+**Resume:**
+{resume_text_translated}
+
+**Job Description:**
+{jd_translated}
+
+**Provide the missing skills and qualifications in a bullet-point list, ensuring that any skill listed is genuinely absent from the resume.**
+"""
+
+# Feature 2: Actionable Recommendations
+input_prompt2 = """
+You are a professional career advisor.
+
+**Instructions:**
+
+- Review the resume and job description thoroughly.
+- Provide actionable recommendations on how the candidate can improve their resume to better match the job description.
+- **For each recommendation, specify the section or bullet point in the resume where the change should be made.**
+- Focus on:
+
+  - Enhancing existing content.
+  - Rephrasing statements to include relevant keywords from the job description.
+  - Highlighting relevant experiences and achievements already present in the resume.
+  - Addressing any weaknesses or gaps by suggesting how to better present existing information.
+
+- Do not suggest adding any fake experiences or qualifications.
+- Do not recommend removing any relevant content.
+
+**Resume:**
+{resume_text_translated}
+
+**Job Description:**
+{jd_translated}
+
+**Provide your recommendations in a numbered list, clearly indicating where changes should be made.**
+"""
+
+# Feature 3: Keyword Optimization
+input_prompt3 = """
+You are an expert in resume optimization for ATS systems.
+
+**Instructions:**
+
+1. **Extract important keywords and phrases from the job description, including synonyms and related terms.**
+2. **Analyze the resume to identify which of these keywords are missing or not prominently featured, considering different expressions of the same concepts.**
+3. **Suggest where and how the candidate can naturally incorporate the missing or underrepresented keywords into their existing resume content.**
+4. **For each suggestion, specify the exact section or bullet point in the resume for incorporation.**
+
+**Important Notes:**
+
+- **Do not suggest adding any fake experiences or skills.**
+- **Focus on rephrasing or enhancing current content.**
+- **Ensure the suggestions are integrated seamlessly and naturally.**
+
+**Resume:**
+{resume_text_translated}
+
+**Job Description:**
+{jd_translated}
+
+**Provide your suggestions in detail, indicating the resume sections where keywords can be added or emphasized.**
+"""
+
+# Feature 4: ATS Compliance Checker
+input_prompt4 = """
+You are an expert in Applicant Tracking Systems (ATS) compliance.
+
+**Instructions:**
+
+- Analyze the resume's formatting and structure to ensure it is ATS-friendly.
+- Check for:
+
+  - Use of complex layouts, graphics, or images.
+  - Use of tables, columns, headers, footers, or text boxes.
+  - Inappropriate fonts, font sizes, or styles.
+  - Use of special characters or symbols.
+  - Missing or mislabeled section headings.
+  - Incorrect file format (ensure it's in a standard format like .docx or .pdf).
+  - Consistency in formatting throughout the document.
+  - Any embedded objects or links.
+
+- **For each issue identified, provide a clear recommendation on how to fix it.**
+
+**Resume:**
+{resume_text_translated}
+
+**Provide your analysis and recommendations in a clear, concise manner, organized by issue.**
+"""
+
+# Feature 5: Cover Letter Generator
+input_prompt5 = """
+You are a professional cover letter writer.
+
+**Instructions:**
+
+- Based solely on the information provided in the resume, write a personalized cover letter tailored to the job description.
+- **Do not introduce any new skills, experiences, or qualifications not present in the resume.**
+- Highlight the candidate's relevant skills and experiences that align with the job requirements.
+- Explain why the candidate is a good fit for the position.
+- Ensure the tone is professional and engaging.
+
+**Important Notes:**
+
+- **Avoid generic statements; make the cover letter specific to the job description and the candidate's background.**
+- **Do not include any fake or exaggerated information.**
+
+**Resume:**
+{resume_text_translated}
+
+**Job Description:**
+{jd_translated}
+
+**Provide the cover letter below.**
+"""
+
+# Feature 7: Detailed Match Analysis Report
+input_prompt7 = """
+You are an expert in resume analysis.
+
+**Instructions:**
+
+- Analyze the candidate's resume against the job description.
+- **When comparing, consider synonyms, related terms, and different expressions of the same skills or experiences.**
+- **Ensure that skills or experiences present in the resume but phrased differently are correctly identified as matches.**
+- The report should include:
+
+  - **Overall percentage match**, justified by your analysis.
+  - **Scores for the following sections** (out of 100), with brief justifications:
+    - Skills.
+    - Experience.
+    - Education.
+    - Keywords.
+  - **Strengths**: Highlight areas where the candidate strongly aligns with the job requirements.
+  - **Weaknesses**: Identify any genuine gaps or areas lacking in the resume.
+  - **Recommendations for improvement**: Suggest how the candidate can enhance their resume, focusing on rephrasing or emphasizing existing content.
+
+- Do not include any fake information.
+
+**Resume:**
+{resume_text_translated}
+
+**Job Description:**
+{jd_translated}
+
+**Provide the report in a structured format, using headings and bullet points for clarity.**
+"""
+
+# Feature 8: Craft New Resume (New Feature)
+input_prompt8 = """
+You are an expert resume writer.
+
+**Instructions:**
+
+- Review the candidate's resume and the provided job description.
+- **Enhance the resume by incorporating relevant keywords and improving grammatical structure to better align with the job description.**
+- **Do not add any new skills, experiences, or qualifications not present in the original resume.**
+- **Do not remove any existing content.**
+- Ensure that the resume remains truthful and accurately represents the candidate's qualifications.
+- **Focus on rephrasing sentences to include important keywords from the job description and improving overall readability**
+
+**Resume:**
+{resume_text_translated}
+
+**Job Description:**
+{jd_translated}
+
+**Provide the updated resume below with improved keyword integration and grammar.**
+"""
+
+# Revision of an earlier report after the resume was edited; see smart_ats.incremental
+delta_prompt = """
+You previously wrote the report below for an earlier version of the candidate's resume. The candidate has since edited their resume; the edits are listed below, with removed lines marked "-" and added lines marked "+".
+
+**Instructions:**
+
+- **Re-evaluate only the edited sections against the job description.**
+- Update the parts of the previous report that the edits affect and keep everything else exactly as it is.
+- Do not include any fake information.
+- Do not comment on the edits themselves.
+
+**Previous Report ({title}):**
+{previous_response}
+
+**Resume Edits:**
+{changes}
+
+**Job Description:**
+{jd_translated}
+
+**Provide the complete updated report in the same format as the previous report.**
+"""
+
+# Map each feature to its prompt template and result subheader
+feature_prompts = {
+    "Skill Gap Analysis": (input_prompt1, "Skill Gap Analysis"),
+    "Actionable Recommendations": (input_prompt2, "Actionable Recommendations"),
+    "Keyword Optimization": (input_prompt3, "Keyword Optimization Suggestions"),
+    "ATS Compliance Check": (input_prompt4, "ATS Compliance Report"),
+    "Cover Letter Generator": (input_prompt5, "Generated Cover Letter"),
+    "Detailed Match Analysis": (input_prompt7, "Detailed Match Analysis Report"),
+    "Craft New Resume": (input_prompt8, "Crafted Resume")
+}
+
+
+def prompt_version(feature):
+    """
+    Return a short fingerprint of the feature's prompt template.
+    """
+    template, _ = feature_prompts[feature]
+    fingerprint = f"{template}\x1f{FEATURE_SECTIONS.get(feature)}\x1f{budget.fingerprint(feature)}"
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:12]
+
+
+def raw_prompt(feature, resume_text_translated, jd_translated):
+    """
+    Fill in the feature's prompt template with the full, unprocessed texts.
+    """
+    template, _ = feature_prompts[feature]
+    return template.format(resume_text_translated=resume_text_translated, jd_translated=jd_translated)
+
+
+def build_prompt(feature, resume_text_translated, jd_translated, record=True, furniture=frozenset()):
+    """
+    Fill in the feature's prompt template with the resume and job description.
+
+    Only the resume sections the feature needs are included, cleaned and
+    fitted to the feature's token budget; furniture holds the line numbers
+    of the resume's repeated page headers and footers. Pass record=False
+    for prompts that are only measured, not sent.
+    """
+    template, _ = feature_prompts[feature]
+    prompt = template.format(
+        resume_text_translated=budget.fit_resume(feature, resume_text_translated, furniture=furniture),
+        jd_translated=budget.fit_job_description(jd_translated),
+    )
+    if record:
+        budget.record_savings(feature, raw_prompt(feature, resume_text_translated, jd_translated), prompt)
+    return prompt
+
+
+def build_delta_prompt(feature, previous_response, changes, jd_translated):
+    """
+    Ask for a feature's previous report to be revised for the given resume edits.
+    """
+    return delta_prompt.format(
+        title=feature_prompts[feature][1],
+        previous_response=previous_response,
+        changes=changes,
+        jd_translated=budget.fit_job_description(jd_translated),
+    )
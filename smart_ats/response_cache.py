@@ -0,0 +1,202 @@
+"""
+Two-tier cache of model responses.
+
+Responses are keyed on (feature, resume hash, JD hash, model, prompt
+version), plus the resume's page header and footer lines when it has any. The memory tier is shared by every Streamlit session in the
+process; the SQLite tier survives restarts. Both tiers expire entries after
+``TTL_SECONDS`` and evict the least recently used entries when full.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from smart_ats.metrics import metrics
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TTL_SECONDS = float(os.getenv("SMART_ATS_RESPONSE_TTL", str(7 * 24 * 3600)))
+MEMORY_ENTRIES = int(os.getenv("SMART_ATS_RESPONSE_CACHE_SIZE", "256"))
+DISK_MAX_BYTES = int(os.getenv("SMART_ATS_RESPONSE_CACHE_BYTES", str(256 * 1024 * 1024)))
+# Set SMART_ATS_RESPONSE_DB to an empty string to disable the SQLite tier
+DB_PATH = os.getenv("SMART_ATS_RESPONSE_DB", os.path.join(ROOT_DIR, ".cache", "responses.sqlite3"))
+
+
+def text_hash(text):
+    """
+    Return the SHA-256 hex digest of a string.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    In-memory LRU in front of a size-bounded SQLite table.
+    """
+
+    def __init__(self, db_path=DB_PATH, ttl=TTL_SECONDS, max_entries=MEMORY_ENTRIES,
+                 max_bytes=DISK_MAX_BYTES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    feature TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+            self._db.commit()
+
+    @staticmethod
+    def key(feature, resume_text, jd_text, model, prompt_version, furniture=frozenset()):
+        """
+        Build the cache key for one feature run.
+        """
+        parts = [feature, text_hash(resume_text), text_hash(jd_text), model, prompt_version]
+        if furniture:
+            # The same text gets a different prompt once its headers and footers are known
+            parts.append(",".join(map(str, sorted(furniture))))
+        return text_hash("\x1f".join(parts))
+
+    def get(self, key):
+        """
+        Return a cached response, or None if it is missing or expired.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                response, created_at = entry
+                if now - created_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    return response
+                del self._entries[key]
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response, created_at = row
+            if now - created_at >= self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self._remember(key, response, created_at)
+            return response
+
+    def put(self, key, response, feature="", prompt_version=""):
+        """
+        Store a response in both tiers.
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, response, now)
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, feature, prompt_version, response, len(response.encode("utf-8")), now, now),
+            )
+            self._evict_disk(now)
+            self._db.commit()
+
+    def get_or_compute(self, key, compute, feature="", prompt_version=""):
+        """
+        Return the cached response for key, calling compute() on a miss.
+        """
+        response = self.get(key)
+        metrics.cache_result("response", response is not None)
+        if response is None:
+            response = compute()
+            if response:
+                self.put(key, response, feature, prompt_version)
+        return response
+
+    def stream_or_compute(self, key, stream, feature="", prompt_version=""):
+        """
+        Yield the cached response for key, or the chunks of stream() on a miss.
+
+        The streamed chunks are joined and stored once the stream completes.
+        """
+        response = self.get(key)
+        metrics.cache_result("response", response is not None)
+        if response is not None:
+            yield response
+            return
+        chunks = []
+        for chunk in stream():
+            chunks.append(chunk)
+            yield chunk
+        response = "".join(chunks)
+        if response:
+            self.put(key, response, feature, prompt_version)
+
+    def prune_versions(self, current_versions):
+        """
+        Delete stored responses produced by outdated prompt templates.
+        """
+        if self._db is None:
+            return
+        with self._lock:
+            for feature, version in current_versions.items():
+                self._db.execute(
+                    "DELETE FROM responses WHERE feature = ? AND prompt_version != ?",
+                    (feature, version),
+                )
+            self._db.commit()
+
+    def _remember(self, key, response, created_at):
+        self._entries[key] = (response, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _evict_disk(self, now):
+        self._db.execute("DELETE FROM responses WHERE created_at <= ?", (now - self.ttl,))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used rows until the table fits the byte budget
+        rows = self._db.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """
+    Return the process-wide response cache.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
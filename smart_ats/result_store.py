@@ -0,0 +1,380 @@
+"""
+Append-only store of analysis results for auditing and batch screening.
+
+Every finished feature run is appended as one row keyed by the resume and
+job description hashes, the feature, the response language and the time,
+with optional candidate and posting labels. The response and display text
+are stored zlib-compressed. Rows are never updated, which a trigger
+enforces; they are only deleted when they pass the retention period
+(SMART_ATS_RESULT_TTL, 30 days by default) or when a candidate's results
+are purged on request. Lookups by inputs, candidate, posting and feature
+are indexed, and exports stream rows from a cursor into JSONL or ZIP
+files, so exporting many thousands of results never holds them all in
+memory.
+
+    python -m smart_ats.result_store query --candidate alice.pdf
+    python -m smart_ats.result_store export results.zip --feature "Detailed Match Analysis"
+    python -m smart_ats.result_store export results.jsonl.gz --since 2024-06-01
+    python -m smart_ats.result_store purge --candidate alice.pdf
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from datetime import datetime
+
+from smart_ats.metrics import metrics
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.getenv("SMART_ATS_RESULT_DB", os.path.join(ROOT_DIR, ".cache", "results.sqlite3"))
+# Results older than this are deleted; 0 keeps them until purged
+RETENTION_SECONDS = float(os.getenv("SMART_ATS_RESULT_TTL", str(30 * 24 * 3600)))
+# Minimum seconds between retention sweeps in a long-running process
+PURGE_INTERVAL = 3600
+COMPRESSION_LEVEL = 6
+# Rows fetched per round trip while streaming queries and exports
+FETCH_SIZE = 500
+
+COLUMNS = ("id", "created_at", "resume_hash", "jd_hash", "feature", "lang", "candidate", "posting",
+           "model", "prompt_version", "error", "payload")
+
+
+def posting_label(jd_text):
+    """
+    Return a job description's first non-empty line, used as its posting label.
+    """
+    return next((line.strip()[:200] for line in jd_text.splitlines() if line.strip()), None)
+
+
+def _compress(response, display):
+    return zlib.compress(json.dumps({"response": response, "display": display}).encode("utf-8"),
+                         COMPRESSION_LEVEL)
+
+
+def _entry(row):
+    entry = dict(zip(COLUMNS, row))
+    entry.update(json.loads(zlib.decompress(entry.pop("payload"))))
+    return entry
+
+
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9._-]+", "-", text or "").strip("-")[:60] or "unknown"
+
+
+class ResultStore:
+    """
+    SQLite table of compressed results that is only ever appended to.
+    """
+
+    def __init__(self, db_path=DB_PATH, retention=RETENTION_SECONDS):
+        self.db_path = db_path
+        self.retention = retention
+        self._last_expiry = 0.0
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            if db_path != ":memory:":
+                # Lets exports read on their own connection while runs keep appending
+                self._db.execute("PRAGMA journal_mode=WAL")
+            # Purged results are overwritten on disk rather than left in free pages
+            self._db.execute("PRAGMA secure_delete=ON")
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    id INTEGER PRIMARY KEY,
+                    created_at REAL NOT NULL,
+                    resume_hash TEXT NOT NULL,
+                    jd_hash TEXT NOT NULL,
+                    feature TEXT NOT NULL,
+                    lang TEXT NOT NULL,
+                    candidate TEXT,
+                    posting TEXT,
+                    model TEXT,
+                    prompt_version TEXT,
+                    error TEXT,
+                    payload BLOB NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS results_inputs
+                    ON results (resume_hash, jd_hash, feature, lang, created_at);
+                CREATE INDEX IF NOT EXISTS results_candidate ON results (candidate, created_at);
+                CREATE INDEX IF NOT EXISTS results_posting ON results (posting, created_at);
+                CREATE INDEX IF NOT EXISTS results_feature ON results (feature, created_at);
+                CREATE TRIGGER IF NOT EXISTS results_no_update BEFORE UPDATE ON results
+                    BEGIN SELECT RAISE(ABORT, 'results are append-only'); END;
+                DROP TRIGGER IF EXISTS results_no_delete;
+                """
+            )
+        self.expire()
+
+    def append(self, resume_hash, jd_hash, lang, results, candidate=None, posting=None, model=None,
+               versions=None):
+        """
+        Append the finished entries of a {feature: result entry} mapping.
+
+        versions maps each feature to the prompt version that produced it.
+        Partial entries from an interrupted stream are skipped.
+        """
+        now = time.time()
+        rows = []
+        for feature, result in results.items():
+            if result.get("partial"):
+                continue
+            payload = _compress(result.get("response"), result.get("display"))
+            rows.append((now, resume_hash, jd_hash, feature, lang, candidate, posting, model,
+                         (versions or {}).get(feature), result.get("error"), payload))
+            raw = sum(len((result.get(field) or "").encode("utf-8")) for field in ("response", "display"))
+            metrics.increment("result_store_bytes", raw, kind="raw")
+            metrics.increment("result_store_bytes", len(payload), kind="compressed")
+        if not rows:
+            return
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO results (created_at, resume_hash, jd_hash, feature, lang, candidate, posting, model, "
+                "prompt_version, error, payload) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._db.commit()
+        if now - self._last_expiry >= PURGE_INTERVAL:
+            self.expire()
+
+    def expire(self):
+        """
+        Delete results older than the retention period; returns the count.
+        """
+        self._last_expiry = time.time()
+        if not self.retention:
+            return 0
+        return self.purge(until=self._last_expiry - self.retention)
+
+    def purge(self, candidate=None, until=None):
+        """
+        Delete a candidate's results, results created before until, or both; returns the count.
+
+        candidate matches a candidate label or a resume hash, as in query.
+        """
+        clauses, params = [], []
+        if candidate is not None:
+            clauses.append("(candidate = ? OR resume_hash = ?)")
+            params += [candidate, candidate]
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        if not clauses:
+            raise ValueError("purge needs a candidate or a cut-off time")
+        with self._lock:
+            count = self._db.execute("DELETE FROM results WHERE " + " AND ".join(clauses), params).rowcount
+            self._db.commit()
+        if count:
+            metrics.increment("result_store_purged", count, reason="request" if candidate else "retention")
+        return count
+
+    def latest(self, resume_hash, jd_hash, features, lang, versions=None, model=None):
+        """
+        Return the newest successful entry per feature for these inputs, or None.
+
+        Only entries from the given prompt versions and model count, and
+        None is returned unless every feature has one, so callers can
+        show a complete earlier result instead of running again.
+        """
+        found = {}
+        with metrics.span("result_store_lookup", features=len(features)):
+            with self._lock:
+                for feature in features:
+                    sql = ("SELECT " + ", ".join(COLUMNS) + " FROM results WHERE resume_hash = ? AND jd_hash = ? "
+                           "AND feature = ? AND lang = ? AND error IS NULL")
+                    params = [resume_hash, jd_hash, feature, lang]
+                    if versions is not None:
+                        sql += " AND prompt_version = ?"
+                        params.append(versions.get(feature))
+                    if model is not None:
+                        sql += " AND model = ?"
+                        params.append(model)
+                    row = self._db.execute(sql + " ORDER BY created_at DESC LIMIT 1", params).fetchone()
+                    if row is None:
+                        metrics.cache_result("result_store", False)
+                        return None
+                    found[feature] = row
+        metrics.cache_result("result_store", True)
+        results = {}
+        for feature, row in found.items():
+            entry = _entry(row)
+            results[feature] = {"response": entry["response"], "display": entry["display"], "error": None}
+        return results
+
+    def query(self, candidate=None, posting=None, feature=None, since=None, until=None, limit=None,
+              newest_first=True):
+        """
+        Yield stored entries as dicts, streamed from the database.
+
+        candidate matches a candidate label or a resume hash, and posting a
+        posting label or a job description hash; since and until are Unix
+        timestamps.
+        """
+        clauses, params = [], []
+        if candidate is not None:
+            clauses.append("(candidate = ? OR resume_hash = ?)")
+            params += [candidate, candidate]
+        if posting is not None:
+            clauses.append("(posting = ? OR jd_hash = ?)")
+            params += [posting, posting]
+        if feature is not None:
+            clauses.append("feature = ?")
+            params.append(feature)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        sql = "SELECT " + ", ".join(COLUMNS) + " FROM results"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY created_at {'DESC' if newest_first else 'ASC'}, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        for row in self._rows(sql, params):
+            yield _entry(row)
+
+    def _rows(self, sql, params):
+        if self.db_path == ":memory:":
+            with self._lock:
+                cursor = self._db.execute(sql, params)
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(FETCH_SIZE)
+                if not rows:
+                    return
+                yield from rows
+        # A separate read-only connection keeps long exports from blocking appends
+        reader = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        try:
+            cursor = reader.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(FETCH_SIZE)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            reader.close()
+
+    def export(self, path, **filters):
+        """
+        Stream the matching entries to a .jsonl, .jsonl.gz or .zip file; returns the count.
+
+        ZIP files hold one text file per result and a manifest.jsonl with
+        every entry's metadata.
+        """
+        with metrics.span("result_store_export") as span:
+            entries = self.query(newest_first=False, **filters)
+            if path.endswith(".zip"):
+                count = write_zip(path, entries)
+            else:
+                opener = gzip.open if path.endswith(".gz") else open
+                with opener(path, "wt", encoding="utf-8") as f:
+                    count = write_jsonl(f, entries)
+            span["results"] = count
+        return count
+
+
+def write_jsonl(f, entries):
+    """
+    Write entries as JSON lines to a text file; returns the count.
+    """
+    count = 0
+    for entry in entries:
+        f.write(json.dumps(entry) + "\n")
+        count += 1
+    return count
+
+
+def write_zip(path, entries):
+    """
+    Write entries to a ZIP file one member at a time; returns the count.
+    """
+    count = 0
+    # The manifest is spooled to disk so its size does not depend on memory
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive, \
+            tempfile.TemporaryFile("w+", encoding="utf-8") as manifest:
+        for entry in entries:
+            candidate = entry["candidate"] or entry["resume_hash"][:12]
+            name = f"{entry['id']:08d}-{_slug(candidate)}-{_slug(entry['feature'])}.txt"
+            archive.writestr(name, entry["response"] or entry["error"] or "")
+            metadata = {key: value for key, value in entry.items() if key not in ("response", "display")}
+            manifest.write(json.dumps(dict(metadata, file=name)) + "\n")
+            count += 1
+        manifest.seek(0)
+        with archive.open("manifest.jsonl", "w") as member:
+            for line in manifest:
+                member.write(line.encode("utf-8"))
+    return count
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_result_store():
+    """
+    Return the process-wide result store.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ResultStore()
+        return _store
+
+
+def _timestamp(value):
+    return datetime.fromisoformat(value).timestamp()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query and export stored analysis results.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    query = commands.add_parser("query", help="List stored results, newest first")
+    export = commands.add_parser("export", help="Write results to a .jsonl, .jsonl.gz or .zip file")
+    export.add_argument("out")
+    purge = commands.add_parser("purge", help="Delete a candidate's results, or results past the retention period")
+    purge.add_argument("--candidate", help="Candidate label or resume hash")
+    purge.add_argument("--until", type=_timestamp, help="Only results created before this ISO date or time")
+    for command in (query, export):
+        command.add_argument("--candidate", help="Candidate label or resume hash")
+        command.add_argument("--posting", help="Posting label or job description hash")
+        command.add_argument("--feature")
+        command.add_argument("--since", type=_timestamp, help="ISO date or time")
+        command.add_argument("--until", type=_timestamp, help="ISO date or time")
+    query.add_argument("-n", type=int, default=20, help="Results to list")
+    args = parser.parse_args()
+
+    store = get_result_store()
+    if args.command == "purge":
+        if args.candidate is None and args.until is None:
+            count = store.expire()
+        else:
+            count = store.purge(args.candidate, args.until)
+        print(f"Deleted {count} results")
+        return
+    filters = {"candidate": args.candidate, "posting": args.posting, "feature": args.feature,
+               "since": args.since, "until": args.until}
+    if args.command == "export":
+        print(f"Exported {store.export(args.out, **filters)} results to {args.out}")
+        return
+    for entry in store.query(limit=args.n, **filters):
+        when = datetime.fromtimestamp(entry["created_at"]).strftime("%Y-%m-%d %H:%M")
+        status = f"error: {entry['error']}" if entry["error"] else f"{len(entry['response'] or '')} chars"
+        print(f"{entry['id']:>6}  {when}  {entry['candidate'] or entry['resume_hash'][:12]}  "
+              f"{entry['posting'] or entry['jd_hash'][:12]}  {entry['feature']}  {status}")
+
+
+if __name__ == "__main__":
+    main()
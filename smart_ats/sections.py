@@ -0,0 +1,123 @@
+"""
+Section-aware parsing of extracted resume text.
+
+Splits a resume into typed sections so each feature's prompt only carries
+the parts it needs. Parsed results are cached by document hash, so every
+feature run on the same resume reuses one parse.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+CACHE_SIZE = 256
+
+SECTION_ALIASES = {
+    "summary": ["summary", "professional summary", "profile", "professional profile", "objective",
+                "career objective", "about me", "about"],
+    "skills": ["skills", "technical skills", "key skills", "core skills", "core competencies",
+               "competencies", "technologies", "tools", "tech stack", "skills and tools"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history", "internships", "internship"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects", "project experience"],
+    "education": ["education", "academic background", "academics", "education and training",
+                  "qualifications", "academic qualifications"],
+    "other": ["certifications", "certificates", "awards", "achievements", "publications", "languages",
+              "interests", "hobbies", "volunteering", "volunteer experience", "activities", "references"],
+}
+HEADINGS = {alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases}
+# Only a heading alone on its line starts a section; "Languages: Python, Java"
+# is a labelled line within the current section
+HEADING_PATTERN = re.compile(
+    r"^\s*(" + "|".join(sorted(map(re.escape, HEADINGS), key=len, reverse=True)) + r")\s*:?\s*$",
+    re.IGNORECASE,
+)
+TITLES = {
+    "contact": "Contact",
+    "summary": "Summary",
+    "skills": "Skills",
+    "experience": "Experience",
+    "projects": "Projects",
+    "education": "Education",
+    "other": "Other",
+}
+
+ALL_SECTIONS = tuple(TITLES)
+# Sections sent to each feature's prompt; None means the full resume text
+FEATURE_SECTIONS = {
+    "Skill Gap Analysis": ("skills", "experience", "projects", "education"),
+    "Actionable Recommendations": ("summary", "skills", "experience", "projects", "education", "other"),
+    "Keyword Optimization": ("summary", "skills", "experience", "projects", "education", "other"),
+    "ATS Compliance Check": None,
+    "Cover Letter Generator": ("contact", "summary", "skills", "experience", "projects"),
+    "Detailed Match Analysis": ("summary", "skills", "experience", "projects", "education", "other"),
+    "Craft New Resume": None,
+}
+
+
+class ResumeSections(NamedTuple):
+    """
+    Resume text split by section; missing sections are empty strings.
+    """
+    contact: str = ""
+    summary: str = ""
+    skills: str = ""
+    experience: str = ""
+    projects: str = ""
+    education: str = ""
+    other: str = ""
+
+    @property
+    def found(self):
+        """
+        Whether any section heading was recognised.
+        """
+        return any(getattr(self, name) for name in ALL_SECTIONS if name != "contact")
+
+
+def parse_sections(text):
+    """
+    Split resume text into sections by recognising common headings.
+    """
+    parts = {name: [] for name in ALL_SECTIONS}
+    current = "contact"
+    for line in text.splitlines():
+        match = HEADING_PATTERN.match(line)
+        if match:
+            current = HEADINGS[match.group(1).lower()]
+            continue
+        if line.strip():
+            parts[current].append(line.strip())
+    return ResumeSections(**{name: "\n".join(lines) for name, lines in parts.items()})
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_sections(text):
+    """
+    Return the parsed sections of a resume, cached by document hash.
+    """
+    key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    with _cache_lock:
+        sections = _cache.get(key)
+        if sections is not None:
+            _cache.move_to_end(key)
+            return sections
+    sections = parse_sections(text)
+    with _cache_lock:
+        _cache[key] = sections
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return sections
+
+
+def render_sections(sections, names):
+    """
+    Join the named sections back into prompt text under canonical headings.
+    """
+    blocks = [f"{TITLES[name]}:\n{getattr(sections, name)}" for name in names if getattr(sections, name)]
+    return "\n\n".join(blocks)
+
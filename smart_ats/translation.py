@@ -0,0 +1,301 @@
+"""
+Google Translate client and the document translation pipeline.
+
+Short UI strings go through ``translate``. Whole documents go through
+``translate_document``, which skips text already in the target language,
+splits the rest into chunks under the service's size limit, translates
+the chunks concurrently and reassembles them in order. Translated chunks
+are cached, so editing one paragraph only re-translates its chunk.
+``translate_keeping_lines`` also reports where given lines, such as page
+headers, ended up in the translation.
+"""
+import hashlib
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from smart_ats.metrics import metrics
+
+MAX_CHUNK_CHARS = int(os.getenv("SMART_ATS_TRANSLATE_CHUNK_CHARS", "4500"))
+MIN_CHUNK_CHARS = 500
+# On average one line in this many ends a chunk early; see chunk_text
+BOUNDARY_MODULUS = 8
+MAX_WORKERS = int(os.getenv("SMART_ATS_TRANSLATE_WORKERS", "4"))
+CHUNK_CACHE_SIZE = int(os.getenv("SMART_ATS_TRANSLATE_CACHE_SIZE", "4096"))
+
+SENTENCE_END = re.compile(r"(?<=[.!?。！？।])\s+")
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+# Frequent function words per supported Latin-script language
+LANGUAGE_STOPWORDS = {
+    "en": set("the and of to in is for with on as that this are be by or an from at was have has "
+              "will your you we our it which".split()),
+    "es": set("de la que el en y los del se las por un para con una su al es lo como más pero "
+              "sus le ya o este sí porque esta entre cuando muy sin sobre también".split()),
+    "fr": set("le la les de des et en du un une est que pour dans qui sur au avec ce pas par "
+              "plus sont ou son se aux cette mais nous vous leur".split()),
+    "de": set("der die und in den von zu das mit sich des auf für ist im dem nicht ein eine als "
+              "auch es an werden aus er hat dass sie nach bei um wir".split()),
+}
+# Unicode ranges for the supported non-Latin scripts
+SCRIPT_RANGES = {
+    "hi": (0x0900, 0x097F),
+    "zh-cn": (0x4E00, 0x9FFF),
+}
+
+
+def new_translator():
+    """
+    Return a Google Translate client, or the local fake when SMART_ATS_FAKE_TRANSLATOR is set.
+    """
+    if os.getenv("SMART_ATS_FAKE_TRANSLATOR"):
+        from smart_ats.fakes import FakeTranslator
+        return FakeTranslator.from_env()
+    # googletrans pulls in an HTTP client stack, so import it on first use
+    from googletrans import Translator
+    return Translator()
+
+
+_translator = None
+_translator_lock = threading.Lock()
+_thread_translators = threading.local()
+
+
+def get_translator():
+    """
+    Return the process-wide translator for short strings, creating it on first use.
+    """
+    global _translator
+    with _translator_lock:
+        if _translator is None:
+            _translator = new_translator()
+        return _translator
+
+
+def translate(text, dest_language):
+    """
+    Translate text with Google Translate, raising on failure.
+    """
+    if not text.strip():
+        return text
+    with metrics.span("translate", kind="ui", dest=dest_language) as span:
+        span["chars"] = len(text)
+        return get_translator().translate(text, dest=dest_language).text
+
+
+def _thread_translator():
+    # googletrans clients hold an HTTP session, so give each worker its own
+    if not hasattr(_thread_translators, "client"):
+        _thread_translators.client = new_translator()
+    return _thread_translators.client
+
+
+def detect_language(text, sample_chars=5000):
+    """
+    Guess the language of a text locally, returning None when unsure.
+
+    Only distinguishes the languages offered in the UI.
+    """
+    sample = text[:sample_chars]
+    letters = [char for char in sample if char.isalpha()]
+    if not letters:
+        return None
+    for code, (low, high) in SCRIPT_RANGES.items():
+        in_script = sum(1 for char in letters if low <= ord(char) <= high)
+        if in_script / len(letters) > 0.3:
+            return code
+
+    words = WORD_PATTERN.findall(sample.lower())
+    hits = {code: sum(1 for word in words if word in stopwords)
+            for code, stopwords in LANGUAGE_STOPWORDS.items()}
+    best = max(hits, key=hits.get)
+    runner_up = max(count for code, count in hits.items() if code != best)
+    # Resumes are keyword-heavy, so require a clear lead rather than a high rate
+    if hits[best] >= 3 and hits[best] >= 1.5 * runner_up:
+        return best
+    return None
+
+
+def _same_language(detected, dest_language):
+    return detected is not None and detected.split("-")[0] == dest_language.split("-")[0]
+
+
+def _split_long(line, max_chars):
+    """
+    Split a line longer than max_chars at sentence ends, then hard limits.
+    """
+    pieces = []
+    current = ""
+    for sentence in SENTENCE_END.split(line):
+        while len(sentence) > max_chars:
+            pieces.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_text(text, max_chars=MAX_CHUNK_CHARS, isolate=frozenset()):
+    """
+    Split text into chunks of whole lines, each at most max_chars long.
+
+    Besides the size limit, a chunk also ends after any line whose hash is
+    divisible by BOUNDARY_MODULUS. Boundaries therefore depend on content
+    rather than position, so an edit to one line changes only the chunk
+    containing it and later chunks keep their cache entries. Lines whose
+    numbers are in isolate, which should be short, are chunks of their own.
+    """
+    chunks = []
+    current = []
+    size = 0
+    for index, line in enumerate(text.splitlines(keepends=True)):
+        if index in isolate:
+            if current:
+                chunks.append("".join(current))
+                current, size = [], 0
+            chunks.append(line)
+            continue
+        pieces = [line]
+        if len(line) > max_chars:
+            pieces = _split_long(line.rstrip("\n"), max_chars)
+            pieces[-1] += line[len(line.rstrip("\n")):]
+        for piece in pieces:
+            if current and size + len(piece) > max_chars:
+                chunks.append("".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece)
+            if size >= MIN_CHUNK_CHARS and zlib.crc32(piece.encode("utf-8")) % BOUNDARY_MODULUS == 0:
+                chunks.append("".join(current))
+                current, size = [], 0
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+class ChunkCache:
+    """
+    Thread-safe LRU of translated chunks keyed by content hash and language.
+    """
+
+    def __init__(self, max_entries=CHUNK_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(chunk, dest_language):
+        return dest_language + ":" + hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            translated = self._entries.get(key)
+            if translated is not None:
+                self._entries.move_to_end(key)
+            return translated
+
+    def put(self, key, translated):
+        with self._lock:
+            self._entries[key] = translated
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+chunk_cache = ChunkCache()
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="translate")
+
+
+def _translate_chunk(chunk, dest_language):
+    """
+    Translate one chunk, keeping its surrounding whitespace intact.
+    """
+    body = chunk.strip()
+    if not body:
+        return chunk
+    key = chunk_cache.key(body, dest_language)
+    translated = chunk_cache.get(key)
+    metrics.cache_result("translation_chunk", translated is not None)
+    if translated is None:
+        with metrics.span("translate_chunk", dest=dest_language) as span:
+            span["chars"] = len(body)
+            translated = _thread_translator().translate(body, dest=dest_language).text
+        metrics.increment("translated_chars", len(body), dest=dest_language)
+        chunk_cache.put(key, translated)
+    start = chunk.index(body[0])
+    return chunk[:start] + translated + chunk[start + len(body):]
+
+
+def translate_document(text, dest_language):
+    """
+    Translate a document chunk by chunk, raising if any chunk fails.
+
+    Text already in the destination language is returned unchanged.
+    """
+    if not text.strip() or _same_language(detect_language(text), dest_language):
+        metrics.increment("translate_skipped", dest=dest_language)
+        return text
+    with metrics.span("translate", kind="document", dest=dest_language) as span:
+        chunks = chunk_text(text)
+        span.update(chars=len(text), chunks=len(chunks))
+        return "".join(_translate_chunks(chunks, dest_language))
+
+
+def translate_keeping_lines(text, dest_language, lines):
+    """
+    Translate a document like translate_document, tracking some of its lines.
+
+    Each line numbered in lines is translated on its own and kept on a
+    single line. Returns the translation and those lines' numbers in it.
+    """
+    if not lines:
+        return translate_document(text, dest_language), frozenset()
+    if not text.strip() or _same_language(detect_language(text), dest_language):
+        metrics.increment("translate_skipped", dest=dest_language)
+        return text, frozenset(lines)
+    with metrics.span("translate", kind="document", dest=dest_language) as span:
+        chunks = chunk_text(text, isolate=lines)
+        span.update(chars=len(text), chunks=len(chunks))
+        translated = _translate_chunks(chunks, dest_language)
+    moved = set()
+    line, translated_line = 0, 0
+    for i, (chunk, result) in enumerate(zip(chunks, translated)):
+        if line in lines:
+            body = result.rstrip("\n")
+            translated[i] = result = " ".join(body.split()) + result[len(body):]
+            moved.add(translated_line)
+        line += chunk.count("\n")
+        translated_line += result.count("\n")
+    return "".join(translated), frozenset(moved)
+
+
+def _translate_chunks(chunks, dest_language):
+    if len(chunks) == 1:
+        return [_translate_chunk(chunks[0], dest_language)]
+    futures = [_executor.submit(_translate_chunk, chunk, dest_language) for chunk in chunks]
+    return [future.result() for future in futures]
+
+
+def cached_chunks(text, dest_language, isolate=frozenset()):
+    """
+    Return the cached translations of a text's chunks, keyed like chunk_cache.
+
+    Pass the isolate lines the text was translated with, if any.
+    """
+    entries = {}
+    for chunk in chunk_text(text, isolate=isolate):
+        body = chunk.strip()
+        if body:
+            key = chunk_cache.key(body, dest_language)
+            translated = chunk_cache.get(key)
+            if translated is not None:
+                entries[key] = translated
+    return entries
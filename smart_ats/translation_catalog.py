@@ -0,0 +1,237 @@
+"""
+On-disk catalog of translated UI strings.
+
+UI labels are translated once per language and stored as JSON files in
+``CATALOG_DIR``, a writable cache directory outside the package. The app
+serves them from memory and only calls Google Translate on a miss,
+writing the new translation back to the catalog.
+
+Build or refresh the catalogs ahead of deployment with:
+
+    python -m smart_ats.translation_catalog es hi
+"""
+import argparse
+import ast
+import json
+import logging
+import os
+import tempfile
+import threading
+
+from smart_ats.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATALOG_DIR = os.getenv("SMART_ATS_CATALOG_DIR", os.path.join(ROOT_DIR, ".cache", "locales"))
+UI_SOURCE = os.path.join(ROOT_DIR, "main.py")
+UI_FUNCTION = "ui_text"
+
+
+class TranslationCatalog:
+    """
+    Thread-safe, per-language lookup table backed by JSON files.
+    """
+
+    def __init__(self, catalog_dir=CATALOG_DIR, translate=None):
+        self.catalog_dir = catalog_dir
+        self.translate = translate
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def path(self, lang):
+        return os.path.join(self.catalog_dir, f"{lang}.json")
+
+    def load(self, lang):
+        """
+        Return the entries for a language, reading its file on first use.
+        """
+        entries = self._entries.get(lang)
+        if entries is not None:
+            return entries
+        with self._lock:
+            entries = self._entries.get(lang)
+            if entries is None:
+                try:
+                    with open(self.path(lang), encoding="utf-8") as f:
+                        entries = json.load(f)
+                except FileNotFoundError:
+                    entries = {}
+                except (OSError, ValueError) as e:
+                    logger.warning("Could not read catalog %s: %s", self.path(lang), e)
+                    entries = {}
+                self._entries[lang] = entries
+        return entries
+
+    def preload(self, languages):
+        """
+        Load the catalogs for the given languages into memory.
+        """
+        for lang in languages:
+            if lang != 'en':
+                self.load(lang)
+
+    def get(self, text, lang):
+        """
+        Look up a UI string, translating and storing it on a miss.
+        """
+        if lang == 'en' or not text.strip():
+            return text
+        translated = self.load(lang).get(text)
+        metrics.cache_result("ui_catalog", translated is not None)
+        if translated is not None:
+            return translated
+        if self.translate is None:
+            return text
+        try:
+            translated = self.translate(text, lang)
+        except Exception as e:
+            # Serve the source text without caching so the next rerun retries
+            logger.warning("Translation to %s failed: %s", lang, e)
+            return text
+        self.add(lang, {text: translated})
+        return translated
+
+    def add(self, lang, translations):
+        """
+        Merge translations into a language's catalog and persist it.
+        """
+        entries = self.load(lang)
+        with self._lock:
+            entries.update(translations)
+            self._save(lang, dict(entries))
+
+    def prune(self, lang, keep):
+        """
+        Drop entries whose source string is no longer used by the UI.
+        """
+        entries = self.load(lang)
+        with self._lock:
+            for text in [text for text in entries if text not in keep]:
+                del entries[text]
+            self._save(lang, dict(entries))
+
+    def _save(self, lang, entries):
+        tmp_path = None
+        try:
+            os.makedirs(self.catalog_dir, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial catalog
+            fd, tmp_path = tempfile.mkstemp(dir=self.catalog_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path(lang))
+        except OSError as e:
+            # Keep serving from memory when the catalog directory is not writable
+            logger.warning("Could not write catalog %s: %s", self.path(lang), e)
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def _literal_strings(node, names):
+    """
+    Resolve an AST node to the list of string literals it stands for.
+    """
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [node.value]
+    if isinstance(node, ast.JoinedStr) and all(isinstance(v, ast.Constant) for v in node.values):
+        return ["".join(v.value for v in node.values)]
+    if isinstance(node, (ast.List, ast.Tuple)):
+        strings = []
+        for element in node.elts:
+            strings.extend(_literal_strings(element, names))
+        return strings
+    if isinstance(node, ast.Name):
+        return names.get(node.id, [])
+    return []
+
+
+def extract_ui_strings(source_path=UI_SOURCE, function=UI_FUNCTION):
+    """
+    Collect the literal strings passed to the UI translation function.
+    """
+    with open(source_path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=source_path)
+
+    # Map variable names to the literals assigned to them, including loop
+    # variables of comprehensions such as `for option in feature_options`
+    names = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    names[target.id] = _literal_strings(node.value, names)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.comprehension) and isinstance(node.target, ast.Name):
+            names[node.target.id] = _literal_strings(node.iter, names)
+    # Widget callbacks like format_func=lambda name: ui_text(name, ...) receive
+    # the widget's options, which follow its label
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            for keyword in node.keywords:
+                if isinstance(keyword.value, ast.Lambda):
+                    options = [text for arg in node.args[1:] for text in _literal_strings(arg, names)]
+                    for arg in keyword.value.args.args:
+                        names[arg.arg] = options
+
+    strings = []
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id == function and node.args):
+            for text in _literal_strings(node.args[0], names):
+                if text not in strings:
+                    strings.append(text)
+    return strings
+
+
+def ui_strings(source_path=UI_SOURCE):
+    """
+    Return every string the UI translates.
+
+    Besides the literals in the script, this registers the labels it
+    looks up from other modules: stage labels and feature subheaders.
+    """
+    from smart_ats.pipeline import STAGE_LABELS
+    from smart_ats.prompts import feature_prompts
+
+    registered = list(STAGE_LABELS.values()) + [subheader for _, subheader in feature_prompts.values()]
+    return list(dict.fromkeys(extract_ui_strings(source_path) + registered))
+
+
+def build(languages, catalog_dir=CATALOG_DIR, source_path=UI_SOURCE, prune=False):
+    """
+    Translate every UI string that is missing from the given catalogs.
+    """
+    from smart_ats.translation import translate
+
+    strings = ui_strings(source_path)
+    catalog = TranslationCatalog(catalog_dir)
+    for lang in languages:
+        entries = catalog.load(lang)
+        missing = [text for text in strings if text not in entries]
+        translations = {}
+        for text in missing:
+            try:
+                translations[text] = translate(text, lang)
+            except Exception as e:
+                logger.warning("Skipping %r for %s: %s", text[:40], lang, e)
+        if translations:
+            catalog.add(lang, translations)
+        if prune:
+            catalog.prune(lang, set(strings))
+        print(f"{lang}: {len(strings)} strings, {len(translations)} translated, "
+              f"{len(missing) - len(translations)} failed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the UI translation catalogs.")
+    parser.add_argument("languages", nargs="+", help="Language codes, e.g. es hi")
+    parser.add_argument("--catalog-dir", default=CATALOG_DIR)
+    parser.add_argument("--source", default=UI_SOURCE, help="Script to extract UI strings from")
+    parser.add_argument("--prune", action="store_true", help="Remove strings no longer in the UI")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    build(args.languages, args.catalog_dir, args.source, args.prune)
+
+
+if __name__ == "__main__":
+    main()
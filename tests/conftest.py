@@ -0,0 +1,20 @@
+import json
+import os
+import tempfile
+
+# Modules read their settings at import time, so every service is pointed
+# at its fake and every cache at a scratch directory before smart_ats loads
+_work_dir = tempfile.mkdtemp(prefix="smart-ats-tests-")
+os.environ.update({
+    "SMART_ATS_FAKE_MODEL": "1",
+    "SMART_ATS_FAKE_TRANSLATOR": "1",
+    "SMART_ATS_FAKE_ASSETS": "1",
+    "SMART_ATS_RESPONSE_DB": "",
+    "SMART_ATS_JOB_DB": ":memory:",
+    "SMART_ATS_RESULT_DB": ":memory:",
+    "SMART_ATS_JD_INDEX_DB": ":memory:",
+    "SMART_ATS_CATALOG_DIR": os.path.join(_work_dir, "locales"),
+    "SMART_ATS_ASSET_CACHE_DIR": os.path.join(_work_dir, "lottie"),
+    "SMART_ATS_RATE_LIMITS": json.dumps({"gemini-pro": [1000, 1000]}),
+})
+os.environ.pop("SMART_ATS_PDF_CACHE_DIR", None)
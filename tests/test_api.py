@@ -0,0 +1,110 @@
+import base64
+import http.client
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from smart_ats import api, model_client
+from smart_ats.fakes import FakeModel
+from smart_ats.model_client import GEMINI_MODEL, ModelClient
+from smart_ats.pdf import ExtractedText
+
+
+@pytest.fixture
+def server():
+    server = api.AnalysisServer(("127.0.0.1", 0), max_in_flight=1, queue_timeout=0.05)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(server, path, payload):
+    url = f"http://127.0.0.1:{server.server_address[1]}{path}"
+    request = urllib.request.Request(url, json.dumps(payload).encode("utf-8"),
+                                     {"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+def test_pdf_is_not_extracted_before_a_slot_is_free(server, monkeypatch):
+    extracted = []
+    monkeypatch.setattr(api, "extract_document",
+                        lambda data: extracted.append(data) or ExtractedText("Skills\nPython"))
+    resume, jd, lang, _ = api.parse_request(json.dumps({
+        "resume_pdf": base64.b64encode(b"%PDF-1.4").decode("ascii"), "job_description": "Python developer",
+    }))
+    assert resume == b"%PDF-1.4" and not extracted
+    server._slots.acquire()
+    try:
+        with pytest.raises(api.ApiError) as error:
+            server.analyse(resume, jd, ["Skill Gap Analysis"], lang)
+        assert error.value.status == 503
+        assert not extracted
+    finally:
+        server._slots.release()
+    server.analyse(resume, jd, ["Skill Gap Analysis"], lang)
+    assert extracted == [b"%PDF-1.4"]
+
+
+@pytest.mark.parametrize("features", [[["Skill Gap Analysis"]], [{"name": "x"}], "Skill Gap Analysis", [1]])
+def test_malformed_features_are_rejected(server, features):
+    status, body = post(server, "/analyze", {"resume_text": "Python", "job_description": "Python developer",
+                                             "features": features})
+    assert status == 400
+    assert body["error"] == "features must be a list of feature names"
+
+
+def test_unknown_features_are_listed(server):
+    status, body = post(server, "/analyze", {"resume_text": "Python", "job_description": "Python developer",
+                                             "features": ["Skill Gap Analysis", "Horoscope"]})
+    assert (status, body["error"]) == (400, "Unknown features: Horoscope")
+
+
+def test_unreadable_pdf_is_a_client_error(server):
+    status, body = post(server, "/features/skill-gap-analysis", {
+        "resume_pdf": base64.b64encode(b"not a pdf").decode("ascii"), "job_description": "Python developer",
+    })
+    assert status == 400
+    assert body["error"].startswith("Could not read resume_pdf")
+
+
+def test_model_failure_on_a_feature_endpoint_is_a_bad_gateway(server, monkeypatch):
+    failing = ModelClient(GEMINI_MODEL, lambda name: FakeModel(name, error_rate=1.0), rate=0, max_retries=0)
+    monkeypatch.setitem(model_client._clients, GEMINI_MODEL, failing)
+    status, body = post(server, "/features/skill-gap-analysis", {
+        "resume_text": "Skills\nPython", "job_description": "Python developer for the bad gateway test",
+    })
+    assert status == 502
+    assert body["response"] is None
+    assert body["error"].startswith("Processing failed:")
+
+
+def post_raw(server, content_length):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+    try:
+        connection.putrequest("POST", "/analyze")
+        if content_length is not None:
+            connection.putheader("Content-Length", content_length)
+        connection.endheaders()
+        response = connection.getresponse()
+        return response.status, json.load(response)
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize("content_length", ["-1", "ten", "+5", "1_0"])
+def test_invalid_content_length_is_rejected(server, content_length):
+    status, body = post_raw(server, content_length)
+    assert (status, body["error"]) == (400, "Content-Length must be a non-negative integer")
+
+
+def test_missing_content_length_is_rejected(server):
+    assert post_raw(server, None)[0] == 411
@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+from smart_ats import assets
+
+URL = "https://assets.example.com/animation.json"
+ANIMATION = {"v": "5.5.2", "layers": []}
+
+
+@pytest.fixture
+def refreshes(monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(assets, "_memory", {})
+    monkeypatch.setattr(assets, "_schedule_refresh", scheduled.append)
+    return scheduled
+
+
+def test_stale_memory_entry_is_revalidated(refreshes):
+    assets._memory[URL] = (ANIMATION, time.time() - assets.REVALIDATE_SECONDS - 1)
+    assert assets.load_lottieurl(URL) == ANIMATION
+    assert refreshes == [URL]
+
+
+def test_fresh_memory_entry_is_served_without_a_fetch(refreshes):
+    assets._memory[URL] = (ANIMATION, time.time())
+    assert assets.load_lottieurl(URL) == ANIMATION
+    assert refreshes == []
+
+
+def test_successful_refresh_resets_the_check_time(monkeypatch):
+    monkeypatch.setattr(assets, "_memory", {URL: (ANIMATION, 0.0)})
+    monkeypatch.setattr(assets, "fetch", lambda url: {"v": "5.7.0", "layers": []})
+    assets._refresh(URL)
+    data, checked_at = assets._memory[URL]
+    assert data["v"] == "5.7.0"
+    assert time.time() - checked_at < 5
+
+
+def test_prefetched_asset_is_served_on_a_cold_start(refreshes, monkeypatch, tmp_path):
+    monkeypatch.setattr(assets, "CACHE_DIR", str(tmp_path))
+    name = assets.asset_name(URL)
+    assets._write_json(str(tmp_path / name), ANIMATION)
+    assets._write_json(assets._meta_path(name, str(tmp_path)), {"checked_at": time.time()})
+    assert assets.load_lottieurl(URL) == ANIMATION
+    assert refreshes == []
+
+
+def test_missing_asset_is_fetched_in_the_background(refreshes, monkeypatch, tmp_path):
+    monkeypatch.setattr(assets, "CACHE_DIR", str(tmp_path))
+    assert assets.load_lottieurl(URL) is None
+    assert refreshes == [URL]
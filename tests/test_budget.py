@@ -0,0 +1,61 @@
+from smart_ats import budget
+from smart_ats.budget import clean_text, fit_resume, page_furniture
+from smart_ats.pdf import ExtractedText, TextCache, join_pages
+from smart_ats.pipeline import translate_resume
+
+PAGES = [
+    "Jane Doe - Resume\nExperience\nSoftware Engineer\nAcme\n1",
+    "Jane Doe - Resume\nSoftware Engineer\nBeta Corp\n2",
+    "Jane Doe - Resume\nSoftware Engineer\nGamma\nPage 3 of 3",
+]
+SPANISH_PAGES = [
+    "Juana Pérez - Currículum\nExperiencia de la empresa y los clientes\nIngeniera\n1",
+    "Juana Pérez - Currículum\nIngeniera para el equipo de datos\n2",
+    "Juana Pérez - Currículum\nIngeniera con una base de datos\n3",
+]
+
+
+def test_running_header_kept_once():
+    cleaned = clean_text(join_pages(PAGES), page_furniture(PAGES))
+    assert cleaned.count("Jane Doe - Resume") == 1
+    assert "Page 3" not in cleaned
+
+
+def test_repeated_body_lines_are_kept():
+    assert clean_text(join_pages(PAGES), page_furniture(PAGES)).count("Software Engineer") == 3
+
+
+def test_text_without_furniture_keeps_repeated_lines():
+    assert clean_text(join_pages(PAGES)).count("Jane Doe - Resume") == 3
+
+
+def test_single_page_has_no_furniture():
+    assert page_furniture(["Jane Doe\nSoftware Engineer\nJane Doe"]) == frozenset()
+
+
+def test_ats_check_sees_headers_footers_and_page_numbers():
+    fitted = fit_resume("ATS Compliance Check", join_pages(PAGES), furniture=page_furniture(PAGES))
+    assert fitted.count("Jane Doe - Resume") == 3
+    assert "Page 3 of 3" in fitted
+
+
+def test_furniture_follows_the_resume_through_translation():
+    text, furniture, error = translate_resume(join_pages(SPANISH_PAGES), page_furniture(SPANISH_PAGES))
+    assert error is None
+    cleaned = clean_text(text, furniture)
+    assert cleaned.count("Juana Pérez - Currículum") == 1
+    assert cleaned.count("Ingeniera") == 3
+
+
+def test_furniture_is_cached_with_the_text(tmp_path):
+    entry = ExtractedText(join_pages(PAGES), page_furniture(PAGES))
+    TextCache(cache_dir=str(tmp_path)).put("key", entry)
+    assert TextCache(cache_dir=str(tmp_path)).get("key") == entry
+
+
+def test_fingerprint_tracks_repeated_line_settings(monkeypatch):
+    before = budget.fingerprint("Skill Gap Analysis")
+    monkeypatch.setattr(budget, "REPEATED_LINE_MIN", 4)
+    assert budget.fingerprint("Skill Gap Analysis") != before
+    monkeypatch.setattr(budget, "REPEATED_LINE_MAX_CHARS", 80)
+    assert budget.fingerprint("Skill Gap Analysis") != before
@@ -0,0 +1,84 @@
+import threading
+
+import numpy as np
+import pytest
+
+from smart_ats import dedup
+from smart_ats.dedup import MinHashIndex
+
+WORDS = [f"skill{i}" for i in range(5000)]
+
+
+def resume(i, words=120):
+    rng = np.random.default_rng(i)
+    return " ".join(rng.choice(WORDS, size=words))
+
+
+@pytest.fixture
+def small_tail(monkeypatch):
+    # Exercises the sorted keys without adding thousands of resumes
+    monkeypatch.setattr(dedup, "TAIL_SIZE", 8)
+
+
+@pytest.mark.parametrize("count", [5, 50])
+def test_finds_near_duplicates_in_sorted_keys_and_tail(small_tail, count):
+    index = MinHashIndex()
+    for i in range(count):
+        assert index.find_or_add(resume(i), f"r{i}") is None
+    for i in (0, count // 2, count - 1):
+        ref, similarity = index.find_or_add(resume(i) + " extra", f"copy{i}")
+        assert ref == f"r{i}"
+        assert similarity >= index.threshold
+    assert len(index) == count
+
+
+def test_candidates_come_only_from_matching_buckets(small_tail):
+    index = MinHashIndex()
+    for i in range(40):
+        index.add(index.signature(resume(i)), f"r{i}")
+    assert index._sorted_count == 40
+    assert index.query(index.signature(resume(1000))) == []
+    # A signature sharing a single band with a stored one is a candidate but below the threshold
+    signature = index.signature(resume(1000))
+    signature[:index.num_perm // index.bands] = index._signatures[3, :index.num_perm // index.bands]
+    assert index.query(signature) == []
+
+
+def test_save_and_load_keep_matches(small_tail, tmp_path):
+    index = MinHashIndex()
+    for i in range(20):
+        index.find_or_add(resume(i), f"r{i}")
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    loaded = MinHashIndex.load(path)
+    assert len(loaded) == 20
+    assert loaded.find_or_add(resume(7), "again")[0] == "r7"
+
+
+def test_resubmitted_resume_is_not_its_own_duplicate(small_tail, tmp_path):
+    index = MinHashIndex()
+    for i in range(20):
+        index.find_or_add(resume(i), f"r{i}")
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    loaded = MinHashIndex.load(path)
+    assert loaded.find_or_add(resume(7), "r7") is None
+    assert len(loaded) == 20
+
+
+def test_concurrent_near_duplicates_store_one_original():
+    index = MinHashIndex()
+    barrier = threading.Barrier(8)
+    results = [None] * 8
+
+    def submit(i):
+        barrier.wait()
+        results[i] = index.find_or_add(resume(1) + f" copy{i}", f"copy{i}")
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(result is None for result in results) == 1
+    assert len(index) == 1
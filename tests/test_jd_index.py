@@ -0,0 +1,31 @@
+from smart_ats.jd_index import JDIndex
+
+POSTING = "Data Engineer\nPython, Spark and Airflow pipelines on AWS."
+RESUME = "Built Spark and Airflow pipelines in Python on AWS."
+
+
+def test_postings_added_by_another_process_are_matched(tmp_path):
+    db_path = str(tmp_path / "jd_index.sqlite3")
+    app = JDIndex(db_path)
+    assert len(app) == 0
+    JDIndex(db_path).add("data-engineer", POSTING)
+    assert len(app) == 1
+    assert [match.posting_id for match in app.search(RESUME)] == ["data-engineer"]
+
+
+def test_postings_removed_by_another_process_are_dropped(tmp_path):
+    db_path = str(tmp_path / "jd_index.sqlite3")
+    app = JDIndex(db_path)
+    app.add("data-engineer", POSTING)
+    assert JDIndex(db_path).remove("data-engineer")
+    assert app.search(RESUME) == []
+    assert "data-engineer" not in app
+
+
+def test_own_changes_do_not_reload(tmp_path):
+    app = JDIndex(str(tmp_path / "jd_index.sqlite3"))
+    app.add("data-engineer", POSTING)
+    generation = app._generation
+    app.add("ml-engineer", "ML Engineer\nPyTorch models.")
+    assert app._generation == generation + 1
+    assert len(app) == 2
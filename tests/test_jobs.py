@@ -0,0 +1,48 @@
+import time
+
+from smart_ats.jobs import DONE, FAILED, JobQueue
+
+
+def wait(queue, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in (DONE, FAILED):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_match_jobs_run_on_the_workers():
+    calls = []
+
+    def match_runner(resume_bytes, n, analyse, lang, report, session=None):
+        calls.append((resume_bytes, n, analyse, lang, session))
+        results = [{"id": "p1", "title": "Data Engineer", "keyword_score": 60.0}]
+        report("model", results)
+        return results
+
+    queue = JobQueue(":memory:", match_runner=match_runner)
+    job_id = queue.submit_matches(b"%PDF", 5, 2, "en", session="s1")
+    job = wait(queue, job_id)
+    assert job["status"] == DONE
+    assert job["results"] == [{"id": "p1", "title": "Data Engineer", "keyword_score": 60.0}]
+    assert calls == [(b"%PDF", 5, 2, "en", "s1")]
+
+
+def test_failed_match_job_reports_the_error():
+    def match_runner(*args, **kwargs):
+        raise ValueError("PDF is too large")
+
+    queue = JobQueue(":memory:", match_runner=match_runner)
+    job = wait(queue, queue.submit_matches(b"%PDF", 5, 2, "en"))
+    assert (job["status"], job["error"], job["results"]) == (FAILED, "PDF is too large", [])
+
+
+def test_analysis_jobs_still_use_the_analysis_runner():
+    def runner(resume_bytes, jd, features, lang, report, session=None):
+        return {feature: {"response": "ok", "display": "ok", "error": None} for feature in features}
+
+    queue = JobQueue(":memory:", runner=runner)
+    job = wait(queue, queue.submit(b"%PDF", "Python developer", ["Skill Gap Analysis"], "en"))
+    assert job["results"]["Skill Gap Analysis"]["response"] == "ok"
@@ -0,0 +1,29 @@
+from smart_ats.metrics import Metrics, SessionMemory, serve_metrics
+
+
+def test_session_memory_gauges_are_not_labelled_by_session():
+    registry = Metrics()
+    memory = SessionMemory(registry)
+    for i in range(50):
+        memory.set(f"session-{i}", "history", 100 + i)
+    with memory.hold("session-0", "pdf_upload", 1000):
+        text = registry.prometheus_text()
+        assert 'smart_ats_session_memory_bytes{kind="pdf_upload"} 1000' in text
+        assert "smart_ats_session_memory_max_session_bytes 1100" in text
+    assert "session-" not in registry.prometheus_text()
+    assert 'smart_ats_session_memory_bytes{kind="history"} 6225' in registry.prometheus_text()
+    for i in range(50):
+        memory.set(f"session-{i}", "history", 0)
+    text = registry.prometheus_text()
+    assert "smart_ats_session_memory_sessions 0" in text
+    assert 'smart_ats_session_memory_bytes{kind="history"} 0' in text
+    assert memory.snapshot() == {}
+
+
+def test_metrics_are_served_locally_by_default():
+    server = serve_metrics(0)
+    try:
+        assert server.server_address[0] == "127.0.0.1"
+    finally:
+        server.shutdown()
+        server.server_close()
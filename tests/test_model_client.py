@@ -0,0 +1,125 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from smart_ats import model_client
+from smart_ats.fakes import FakeModel
+from smart_ats.metrics import metrics
+from smart_ats.model_client import ModelClient, TokenBucket
+
+
+class FlakyModel(FakeModel):
+    """
+    Fails the first `failures` calls, then answers normally.
+    """
+
+    def __init__(self, failures, error=TimeoutError):
+        super().__init__("flaky")
+        self.failures = failures
+        self.fail_with = error
+
+    def generate_content(self, prompt, stream=False, request_options=None):
+        if self.calls < self.failures:
+            self.calls += 1
+            raise self.fail_with("fake model error")
+        return super().generate_content(prompt, stream, request_options)
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    # Record backoff delays instead of sleeping through them
+    slept = []
+    monkeypatch.setattr(model_client, "time", SimpleNamespace(sleep=slept.append, monotonic=time.monotonic))
+    return slept
+
+
+def client(model, **kwargs):
+    kwargs.setdefault("rate", 0)
+    return ModelClient(model.model_name, lambda name: model, **kwargs)
+
+
+def test_token_bucket_allows_a_burst_then_paces_calls():
+    bucket = TokenBucket(rate=20, capacity=2)
+    assert bucket.acquire() < 0.01
+    assert bucket.acquire() < 0.01
+    assert 0.03 < bucket.acquire() < 0.2
+
+
+def test_token_bucket_without_a_rate_never_waits():
+    bucket = TokenBucket(rate=0, capacity=1)
+    assert [bucket.acquire() for _ in range(100)] == [0.0] * 100
+
+
+def test_token_bucket_counts_waiting_callers():
+    bucket = TokenBucket(rate=5, capacity=1)
+    bucket.acquire()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    assert bucket.waiting == 2
+    for thread in threads:
+        thread.join()
+    assert bucket.waiting == 0
+
+
+def test_transient_errors_are_retried_with_capped_jittered_backoff(delays):
+    model = FlakyModel(failures=3)
+    model_client_ = client(model, max_retries=4, backoff_base=1.0, backoff_max=2.5)
+    assert model_client_.generate("prompt").startswith("Overall percentage match")
+    assert len(delays) == 3
+    for attempt, delay in enumerate(delays):
+        assert 0 <= delay <= min(2.5, 2 ** attempt)
+    stats = model_client_.stats()
+    assert (stats["calls"], stats["retries"], stats["failures"], stats["in_flight"]) == (4, 3, 0, 0)
+
+
+def test_retries_give_up_after_max_retries(delays):
+    model_client_ = client(FakeModel("down", error_rate=1.0), max_retries=2)
+    with pytest.raises(TimeoutError):
+        model_client_.generate("prompt")
+    stats = model_client_.stats()
+    assert (stats["calls"], stats["retries"], stats["failures"]) == (3, 2, 1)
+
+
+def test_other_errors_fail_without_retrying(delays):
+    model_client_ = client(FlakyModel(failures=1, error=ValueError))
+    with pytest.raises(ValueError):
+        model_client_.generate("prompt")
+    assert delays == []
+    assert model_client_.stats()["failures"] == 1
+
+
+def test_streams_retry_before_the_first_chunk(delays):
+    model_client_ = client(FlakyModel(failures=1))
+    text = "".join(model_client_.stream("prompt"))
+    assert text.startswith("Overall percentage match")
+    assert model_client_.stats()["retries"] == 1
+
+
+def test_streams_stay_in_flight_until_finished():
+    model_client_ = client(FakeModel("streaming", chunk_size=5))
+    stream = model_client_.stream("prompt")
+    next(stream)
+    assert model_client_.stats()["in_flight"] == 1
+    list(stream)
+    assert model_client_.stats()["in_flight"] == 0
+    stream = model_client_.stream("prompt")
+    next(stream)
+    stream.close()
+    assert model_client_.stats()["in_flight"] == 0
+
+
+def test_capacity_figures_reach_the_metrics_exporter(delays):
+    model = FakeModel("exported", error_rate=1.0)
+    with pytest.raises(TimeoutError):
+        client(model, max_retries=1).generate("prompt")
+    text = metrics.prometheus_text()
+    assert 'smart_ats_model_calls_total{model="exported"} 2' in text
+    assert 'smart_ats_model_retries_total{model="exported"} 1' in text
+    assert 'smart_ats_model_failures_total{model="exported"} 1' in text
+    assert 'smart_ats_model_queue_depth{model="exported"} 0' in text
+    assert 'smart_ats_model_in_flight{model="exported"} 0' in text
+    assert 'smart_ats_model_limiter_wait_seconds_count{model="exported"} 2' in text
@@ -0,0 +1,30 @@
+import io
+import json
+
+from benchmarks.corpus import make_pdf
+from smart_ats.pdf import PdfLimits, guarded_pages
+from smart_ats.pdf_worker import extract
+
+LINES = [f"Built data pipeline number {i} in Python and SQL" for i in range(30)]
+
+
+def events(data, max_pages=50, max_chars=100_000):
+    out = io.StringIO()
+    extract(data, max_pages, max_chars, 0, out)
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_cutting_the_last_page_is_reported():
+    found = events(make_pdf([LINES]), max_chars=200)
+    assert len(found[1]["page"]) == 200
+    assert {"truncated": "chars"} in found
+
+
+def test_pages_within_the_budget_are_not_truncated():
+    assert not any("truncated" in event for event in events(make_pdf([LINES[:2], LINES[2:4]])))
+
+
+def test_guarded_extraction_reports_char_truncation():
+    pages, info = guarded_pages(make_pdf([LINES]), PdfLimits(max_chars=200))
+    assert info["truncated"] == "chars"
+    assert len("".join(pages)) == 200
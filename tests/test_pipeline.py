@@ -0,0 +1,53 @@
+import pytest
+
+from smart_ats import model_client, pipeline
+from smart_ats.fakes import FakeModel
+from smart_ats.model_client import GEMINI_MODEL, ModelClient
+
+RESUME = "Jane Doe\n\nSkills\nPython, SQL\n\nExperience\nData Engineer, Acme"
+JD = "Data engineer with Python and Airflow."
+
+
+def test_failed_input_translation_analyses_original_text(monkeypatch):
+    def fail(text, dest_language, *lines):
+        raise ConnectionError("service unavailable")
+
+    monkeypatch.setattr(pipeline, "translate_document", fail)
+    monkeypatch.setattr(pipeline, "translate_keeping_lines", fail)
+    results = pipeline.analyse_text(RESUME, JD, ["Skill Gap Analysis", "Keyword Optimization"], "fr")
+    for result in results.values():
+        assert result["response"]
+        assert result["error"].startswith("Translation failed: service unavailable")
+
+
+def test_english_results_have_no_error():
+    results = pipeline.analyse_text(RESUME, JD, ["Skill Gap Analysis"], "en")
+    assert results["Skill Gap Analysis"]["error"] is None
+    assert results["Skill Gap Analysis"]["response"]
+
+
+@pytest.fixture
+def failing_model(monkeypatch):
+    failing = ModelClient(GEMINI_MODEL, lambda name: FakeModel(name, error_rate=1.0), rate=0, max_retries=0)
+    monkeypatch.setitem(model_client._clients, GEMINI_MODEL, failing)
+
+
+def test_streamed_feature_failure_is_reported_per_feature(failing_model):
+    results = pipeline.analyse_text(RESUME, f"{JD}\nStreamed failure", ["Skill Gap Analysis"], "en")
+    result = results["Skill Gap Analysis"]
+    assert result["response"] is None
+    assert result["error"].startswith("Processing failed:")
+
+
+def test_reused_results_survive_a_failed_stream(monkeypatch):
+    jd = f"{JD}\nReused results"
+    first = pipeline.analyse_text(RESUME, jd, ["Skill Gap Analysis"], "en", session="reuse-failure")
+    failing = ModelClient(GEMINI_MODEL, lambda name: FakeModel(name, error_rate=1.0), rate=0, max_retries=0)
+    monkeypatch.setitem(model_client._clients, GEMINI_MODEL, failing)
+    reports = []
+    results = pipeline.analyse_text(RESUME, jd, ["Skill Gap Analysis", "Keyword Optimization"], "en",
+                                    report=lambda stage, partial: reports.append(stage), session="reuse-failure")
+    assert results["Skill Gap Analysis"] == first["Skill Gap Analysis"]
+    assert results["Keyword Optimization"]["response"] is None
+    assert results["Keyword Optimization"]["error"].startswith("Processing failed:")
+    assert reports[-1] == "model"
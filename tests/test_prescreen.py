@@ -0,0 +1,33 @@
+import numpy as np
+
+from smart_ats.prescreen import keyword_overlap, normalize_token, score_batch, tokenize, top_k
+
+
+def test_synonyms_and_their_targets_share_one_token():
+    assert normalize_token("k8s") == normalize_token("kubernetes") == "kubernetes"
+    assert normalize_token("postgres") == "postgresql"
+    assert tokenize("Pandas and Jenkins") == ["pandas", "jenkins"]
+
+
+def test_plurals_of_plain_words_are_folded():
+    assert tokenize("databases libraries llms") == ["database", "library", "llm"]
+
+
+def test_phrases_match_their_abbreviations():
+    assert tokenize("Machine Learning") == tokenize("ML") == ["ml"]
+
+
+def test_keyword_overlap_lists_jd_keywords_in_order():
+    matched, missing = keyword_overlap("Python, K8s and SQL", "Python, Kubernetes, Terraform")
+    assert matched == ["python", "kubernetes"]
+    assert missing == ["terraform"]
+
+
+def test_score_batch_ranks_the_closer_resume_first():
+    scores = score_batch(["Python SQL Kubernetes", "Java Spring"], "Python engineer with Kubernetes")
+    assert scores.score[0] > scores.score[1]
+    assert list(top_k(scores.score, 1)) == [0]
+
+
+def test_top_k_is_stable_for_ties():
+    assert list(top_k(np.array([1.0, 3.0, 3.0, 2.0]), 3)) == [1, 2, 3]
@@ -0,0 +1,40 @@
+import time
+
+import pytest
+
+from smart_ats.result_store import ResultStore
+
+RESULT = {"Skill Gap Analysis": {"response": "Missing: Go", "display": "Missing: Go", "error": None}}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultStore(str(tmp_path / "results.sqlite3"), retention=60)
+
+
+def test_purge_by_candidate(store):
+    store.append("h1", "j1", "en", RESULT, candidate="alice.pdf")
+    store.append("h2", "j1", "en", RESULT, candidate="bob.pdf")
+    assert store.purge(candidate="alice.pdf") == 1
+    assert [entry["candidate"] for entry in store.query()] == ["bob.pdf"]
+    assert store.purge(candidate="h2") == 1
+
+
+def test_expire_removes_results_past_retention(store):
+    store.append("h1", "j1", "en", RESULT)
+    assert store.expire() == 0
+    store.retention = 1e-6
+    time.sleep(0.01)
+    assert store.expire() == 1
+    assert list(store.query()) == []
+
+
+def test_results_cannot_be_updated(store):
+    store.append("h1", "j1", "en", RESULT)
+    with pytest.raises(Exception, match="append-only"):
+        store._db.execute("UPDATE results SET lang = 'de'")
+
+
+def test_purge_needs_a_filter(store):
+    with pytest.raises(ValueError):
+        store.purge()
@@ -0,0 +1,47 @@
+from smart_ats.sections import parse_sections, render_sections
+
+TECH_RESUME = """Jane Doe
+jane@example.com
+
+Summary
+Backend engineer.
+
+Technical Skills
+Languages: Python, Java, C++
+Frameworks: Django, React
+Tools: Git, Docker
+
+Experience:
+Software Engineer, Acme
+Built services.
+
+Languages
+English, French
+"""
+
+
+def test_labelled_lines_stay_in_their_section():
+    sections = parse_sections(TECH_RESUME)
+    assert sections.skills == "Languages: Python, Java, C++\nFrameworks: Django, React\nTools: Git, Docker"
+    assert sections.experience == "Software Engineer, Acme\nBuilt services."
+    assert sections.other == "English, French"
+
+
+def test_headings_switch_sections():
+    sections = parse_sections(TECH_RESUME)
+    assert sections.contact == "Jane Doe\njane@example.com"
+    assert sections.summary == "Backend engineer."
+    assert sections.found
+
+
+def test_no_headings_leaves_everything_in_contact():
+    sections = parse_sections("Jane Doe\nLanguages: Python\nBuilt things.")
+    assert not sections.found
+    assert sections.contact == "Jane Doe\nLanguages: Python\nBuilt things."
+
+
+def test_render_sections_skips_empty_sections():
+    sections = parse_sections(TECH_RESUME)
+    rendered = render_sections(sections, ("skills", "projects"))
+    assert rendered.startswith("Skills:\nLanguages: Python, Java, C++")
+    assert "Projects" not in rendered
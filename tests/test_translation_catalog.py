@@ -0,0 +1,38 @@
+import os
+
+from smart_ats import translation_catalog
+from smart_ats.translation_catalog import TranslationCatalog, ui_strings
+
+
+def test_catalogs_live_outside_the_package():
+    package_dir = os.path.dirname(os.path.abspath(translation_catalog.__file__))
+    default = os.path.join(translation_catalog.ROOT_DIR, ".cache", "locales")
+    assert not default.startswith(package_dir + os.sep)
+
+
+def test_ui_strings_include_widget_options_and_registered_labels():
+    strings = ui_strings()
+    for text in ("Home", "Features", "About", "Run", "All Features", "Skill Gap Analysis",
+                 "Translating documents...", "Crafted Resume", "Detailed Match Analysis Report"):
+        assert text in strings
+    assert "Navigation" not in strings
+
+
+def test_prebuilt_catalog_is_served_without_translating(tmp_path):
+    calls = []
+    built = TranslationCatalog(str(tmp_path), translate=lambda text, lang: calls.append(text) or f"[{lang}] {text}")
+    for text in ui_strings():
+        built.get(text, "es")
+    calls.clear()
+    catalog = TranslationCatalog(str(tmp_path), translate=lambda text, lang: calls.append(text) or text)
+    for text in ui_strings():
+        assert catalog.get(text, "es") == f"[es] {text}"
+    assert calls == []
+
+
+def test_unwritable_catalog_still_serves_translations(tmp_path):
+    blocked = tmp_path / "file"
+    blocked.write_text("")
+    catalog = TranslationCatalog(str(blocked / "locales"), translate=lambda text, lang: f"[{lang}] {text}")
+    assert catalog.get("Run", "de") == "[de] Run"
+    assert catalog.get("Run", "de") == "[de] Run"